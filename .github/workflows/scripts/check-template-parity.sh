@@ -0,0 +1,99 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# check-template-parity.sh
+# 1. Content parity: build the release packages with create-release-packages.sh and with
+#    `specify build-templates`, and fail unless every archive has the same entries, file
+#    contents and modes, and the manifests describe the same assets, variants and layers.
+#    The zip bytes themselves differ (Info-ZIP and Python's zipfile order, stamp and
+#    compress entries differently), so archive digests are not compared across builders.
+# 2. Reproducibility: build with `specify build-templates` a second time under the same
+#    SOURCE_DATE_EPOCH and fail unless every archive, the checksums and the manifest are
+#    byte-for-byte identical.
+# Usage: .github/workflows/scripts/check-template-parity.sh [version]
+#   Version defaults to v0.0.0. Run from the repository root.
+
+VERSION="${1:-v0.0.0}"
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+if [[ -e .genreleases ]]; then
+  echo "Error: .genreleases already exists; move it aside first" >&2
+  exit 1
+fi
+
+WORK_DIR="$(mktemp -d)"
+trap 'rm -rf "$WORK_DIR" .genreleases' EXIT
+
+"$SCRIPT_DIR/create-release-packages.sh" "$VERSION" > "$WORK_DIR/shell.log"
+mv .genreleases "$WORK_DIR/shell"
+
+export PYTHONPATH="src${PYTHONPATH:+:$PYTHONPATH}"
+export SOURCE_DATE_EPOCH="${SOURCE_DATE_EPOCH:-$(git log -1 --format=%ct 2>/dev/null || echo 315532800)}"
+for build in python python-again; do
+  python -c "import sys; from specify_cli import main; sys.argv[0] = 'specify'; main()" \
+    build-templates "$VERSION" --source . --output "$WORK_DIR/$build" > "$WORK_DIR/$build.log"
+done
+
+python - "$WORK_DIR/python" "$WORK_DIR/python-again" <<'PY'
+import hashlib, sys
+from pathlib import Path
+
+first, second = Path(sys.argv[1]), Path(sys.argv[2])
+digests = [{path.name: hashlib.sha256(path.read_bytes()).hexdigest() for path in directory.iterdir()} for directory in (first, second)]
+differing = sorted(name for name in digests[0].keys() | digests[1].keys() if digests[0].get(name) != digests[1].get(name))
+for name in differing:
+    print(f"Error: {name} is not reproducible", file=sys.stderr)
+if differing:
+    sys.exit(1)
+print(f"Reproducible: {len(digests[0])} files byte-for-byte identical across builds")
+PY
+
+python - "$WORK_DIR/shell" "$WORK_DIR/python" "$VERSION" <<'PY'
+import json, sys, zipfile
+from pathlib import Path
+
+shell_dir, python_dir, version = Path(sys.argv[1]), Path(sys.argv[2]), sys.argv[3]
+errors = []
+
+def archive(path):
+    with zipfile.ZipFile(path) as zf:
+        return {
+            info.filename: (info.external_attr >> 16, None if info.is_dir() else zf.read(info))
+            for info in zf.infolist()
+        }
+
+shell_zips = sorted(p.name for p in shell_dir.glob(f"spec-kit-*-{version}.zip"))
+python_zips = sorted(p.name for p in python_dir.glob(f"spec-kit-*-{version}.zip"))
+if shell_zips != python_zips:
+    errors.append(f"archive sets differ: only shell {sorted(set(shell_zips) - set(python_zips))}, "
+                  f"only python {sorted(set(python_zips) - set(shell_zips))}")
+
+for name in sorted(set(shell_zips) & set(python_zips)):
+    expected, actual = archive(shell_dir / name), archive(python_dir / name)
+    for entry in sorted(set(expected) | set(actual)):
+        if entry not in actual:
+            errors.append(f"{name}: missing {entry}")
+        elif entry not in expected:
+            errors.append(f"{name}: unexpected {entry}")
+        elif expected[entry][1] != actual[entry][1]:
+            errors.append(f"{name}: {entry} content differs")
+        elif expected[entry][0] != actual[entry][0]:
+            errors.append(f"{name}: {entry} mode {actual[entry][0]:o}, expected {expected[entry][0]:o}")
+
+def manifest(directory):
+    data = json.loads((directory / f"spec-kit-template-manifest-{version}.json").read_text(encoding="utf-8"))
+    for asset in data.get("assets", {}).values():
+        asset.pop("size", None)
+        asset.pop("sha256", None)
+        asset["entries"] = sorted(asset.get("entries", []), key=lambda entry: entry["path"])
+    return data
+
+if manifest(shell_dir) != manifest(python_dir):
+    errors.append("manifests differ (ignoring archive sizes and checksums)")
+
+for error in errors:
+    print(f"Error: {error}", file=sys.stderr)
+if errors:
+    sys.exit(1)
+print(f"Template parity OK: {len(shell_zips)} archives match for {version}")
+PY
@@ -2,7 +2,7 @@
 set -euo pipefail
 
 # create-github-release.sh
-# Create a GitHub release with all template zip files
+# Create a GitHub release with all template zip files (full templates plus base/overlay layers)
 # Usage: create-github-release.sh <version>
 
 if [[ $# -ne 1 ]]; then
@@ -52,5 +52,9 @@ gh release create "$VERSION" \
   .genreleases/spec-kit-template-bob-ps-"$VERSION".zip \
   .genreleases/spec-kit-template-catpaw-sh-"$VERSION".zip \
   .genreleases/spec-kit-template-catpaw-ps-"$VERSION".zip \
+  .genreleases/spec-kit-base-*-"$VERSION".zip \
+  .genreleases/spec-kit-overlay-*-"$VERSION".zip \
+  .genreleases/spec-kit-template-checksums-"$VERSION".txt \
+  .genreleases/spec-kit-template-manifest-"$VERSION".json \
   --title "Spec Kit Templates - $VERSION_NO_V" \
   --notes-file release_notes.md
@@ -0,0 +1,59 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# create-local-mirror.sh
+# Lay out the packages built by create-release-packages.sh as a static release mirror.
+# Any static HTTP server can then serve it to the CLI through SPEC_KIT_MIRRORS:
+#   python3 -m http.server 8000 --directory <mirror-dir>
+#   SPEC_KIT_MIRRORS=http://localhost:8000 specify init demo --ai claude
+# Usage: create-local-mirror.sh <version> [mirror-dir]
+#   mirror-dir defaults to .genreleases/mirror. SPEC_KIT_REPO_OWNER/SPEC_KIT_REPO_NAME
+#   select the repository path, as they do for the CLI.
+
+if [[ $# -lt 1 || $# -gt 2 ]]; then
+  echo "Usage: $0 <version> [mirror-dir]" >&2
+  exit 1
+fi
+
+VERSION="$1"
+MIRROR_DIR="${2:-.genreleases/mirror}"
+REPO_OWNER="${SPEC_KIT_REPO_OWNER:-github}"
+REPO_NAME="${SPEC_KIT_REPO_NAME:-spec-kit}"
+
+shopt -s nullglob
+assets=(.genreleases/spec-kit-*-"$VERSION".zip .genreleases/spec-kit-template-*-"$VERSION".txt .genreleases/spec-kit-template-*-"$VERSION".json)
+if [[ ${#assets[@]} -eq 0 ]]; then
+  echo "No packages for $VERSION in .genreleases (run create-release-packages.sh first)" >&2
+  exit 1
+fi
+
+# Same paths as GitHub: <api base>/repos/<owner>/<repo>/releases/latest and
+# <download base>/<owner>/<repo>/releases/download/<tag>/<asset>
+DOWNLOAD_DIR="$MIRROR_DIR/$REPO_OWNER/$REPO_NAME/releases/download/$VERSION"
+API_DIR="$MIRROR_DIR/repos/$REPO_OWNER/$REPO_NAME/releases"
+mkdir -p "$DOWNLOAD_DIR" "$API_DIR"
+cp "${assets[@]}" "$DOWNLOAD_DIR/"
+
+python3 - "$DOWNLOAD_DIR" "$VERSION" "$REPO_OWNER/$REPO_NAME" "$API_DIR/latest" <<'PY'
+import json, sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+download_dir, version, repo, out = Path(sys.argv[1]), sys.argv[2], sys.argv[3], Path(sys.argv[4])
+assets = [
+    {
+        "name": path.name,
+        "size": path.stat().st_size,
+        "browser_download_url": f"https://github.com/{repo}/releases/download/{version}/{path.name}",
+    }
+    for path in sorted(download_dir.iterdir())
+]
+release = {
+    "tag_name": version,
+    "published_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    "assets": assets,
+}
+out.write_text(json.dumps(release, indent=2) + "\n", encoding="utf-8")
+PY
+
+echo "Mirror for $VERSION in $MIRROR_DIR (${#assets[@]} assets)"
@@ -150,6 +150,9 @@ build_variant() {
     esac
   fi
   
+  # Store execute bits in the archive so the CLI can apply them while extracting
+  [[ -d "$SPEC_DIR/scripts" ]] && find "$SPEC_DIR/scripts" -type f -name '*.sh' -exec chmod 755 {} +
+
   [[ -d templates ]] && { mkdir -p "$SPEC_DIR/templates"; find templates -type f -not -path "templates/commands/*" -not -name "vscode-settings.json" -exec cp --parents {} "$SPEC_DIR"/ \; ; echo "Copied templates -> .specify/templates"; }
   
   # NOTE: We substitute {ARGS} internally. Outward tokens differ intentionally:
@@ -223,6 +226,15 @@ build_variant() {
   esac
   ( cd "$base_dir" && zip -r "../spec-kit-template-${agent}-${script}-${NEW_VERSION}.zip" . )
   echo "Created $GENRELEASES_DIR/spec-kit-template-${agent}-${script}-${NEW_VERSION}.zip"
+
+  # Layered distribution: .specify is identical for every agent, so the overlay carries only
+  # the agent files and the CLI composes it with the shared base layer for the script type
+  ( cd "$base_dir" && zip -r "../spec-kit-overlay-${agent}-${script}-${NEW_VERSION}.zip" . -x '.specify/*' )
+  echo "Created $GENRELEASES_DIR/spec-kit-overlay-${agent}-${script}-${NEW_VERSION}.zip"
+  if [[ ! -f "$GENRELEASES_DIR/spec-kit-base-${script}-${NEW_VERSION}.zip" ]]; then
+    ( cd "$base_dir" && zip -r "../spec-kit-base-${script}-${NEW_VERSION}.zip" .specify )
+    echo "Created $GENRELEASES_DIR/spec-kit-base-${script}-${NEW_VERSION}.zip"
+  fi
 }
 
 # Determine agent list
@@ -271,5 +283,27 @@ for agent in "${AGENT_LIST[@]}"; do
   done
 done
 
+# Checksum manifest (sha256sum format) so the CLI can verify downloads as it streams them
+CHECKSUMS_FILE="spec-kit-template-checksums-${NEW_VERSION}.txt"
+if command -v sha256sum >/dev/null 2>&1; then
+  SHA256_CMD=(sha256sum)
+else
+  SHA256_CMD=(shasum -a 256)
+fi
+( cd "$GENRELEASES_DIR" && "${SHA256_CMD[@]}" spec-kit-template-*-"${NEW_VERSION}".zip spec-kit-base-*-"${NEW_VERSION}".zip spec-kit-overlay-*-"${NEW_VERSION}".zip > "$CHECKSUMS_FILE" )
+echo "Created $GENRELEASES_DIR/$CHECKSUMS_FILE"
+
+# Asset manifest: per-variant asset size/hash plus path, size, hash and mode of every entry,
+# so the CLI can select assets and plan upgrades without downloading the zips. "layers" maps
+# each variant to the base + overlay archives that compose it. Written by the CLI's own
+# write_release_manifest (the same code `specify build-templates` uses), so the package
+# and its dependencies must be importable.
+MANIFEST_FILE="spec-kit-template-manifest-${NEW_VERSION}.json"
+REPO_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/../../.." && pwd)"
+PYTHONPATH="$REPO_ROOT/src${PYTHONPATH:+:$PYTHONPATH}" python3 -c \
+  'import sys; from pathlib import Path; from specify_cli import write_release_manifest; write_release_manifest(Path(sys.argv[1]), sys.argv[2])' \
+  "$GENRELEASES_DIR" "$NEW_VERSION"
+echo "Created $GENRELEASES_DIR/$MANIFEST_FILE"
+
 echo "Archives in $GENRELEASES_DIR:"
-ls -1 "$GENRELEASES_DIR"/spec-kit-template-*-"${NEW_VERSION}".zip
+ls -1 "$GENRELEASES_DIR"/spec-kit-*-"${NEW_VERSION}".zip
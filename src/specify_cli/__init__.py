@@ -24,45 +24,173 @@ Or install globally:
     specify init --here
 """
 
+# Heavy or network-only modules (httpx, truststore, readchar, zipfile and the
+# rich Live/Progress/Table/Tree renderables) are imported inside the functions
+# that use them, so `specify --help`, `specify check` and shell completion stay
+# fast. Keep it that way: .github/workflows/scripts/check-import-time.sh fails
+# CI if any of them is imported by `import specify_cli`.
+from __future__ import annotations
+
+import bisect
+import contextlib
+import io
 import os
+import re
 import subprocess
 import sys
-import zipfile
-import tempfile
 import shutil
 import shlex
 import json
+import hashlib
+import time
+import threading
+import functools
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import TYPE_CHECKING, BinaryIO, Optional, Tuple
 
 import typer
-import httpx
 from rich.console import Console
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.text import Text
-from rich.live import Live
 from rich.align import Align
-from rich.table import Table
-from rich.tree import Tree
 from typer.core import TyperGroup
 
-# For cross-platform keyboard input
-import readchar
-import ssl
-import truststore
 from datetime import datetime, timezone
 
-ssl_context = truststore.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-client = httpx.Client(verify=ssl_context)
+if TYPE_CHECKING:
+    import httpx
+    import zipfile
+
+DEFAULT_HTTP_MAX_CONNECTIONS = 20
+DEFAULT_HTTP_MAX_PER_HOST = 6
+
+@functools.cache
+def _host_limited_client_class() -> type:
+    """Build the per-host limited httpx.Client subclass on first use, keeping httpx out of import time."""
+    import httpx
+
+    class HostLimitedClient(httpx.Client):
+        """httpx.Client that caps concurrent requests per host (httpx only limits the pool as a whole)."""
+
+        def __init__(self, *args, max_per_host: int = DEFAULT_HTTP_MAX_PER_HOST, **kwargs):
+            super().__init__(*args, **kwargs)
+            self._max_per_host = max_per_host
+            self._host_slots: dict[str, threading.BoundedSemaphore] = {}
+            self._host_slots_lock = threading.Lock()
+
+        def _slot(self, host: str) -> threading.BoundedSemaphore:
+            with self._host_slots_lock:
+                slot = self._host_slots.get(host)
+                if slot is None:
+                    slot = self._host_slots[host] = threading.BoundedSemaphore(self._max_per_host)
+                return slot
+
+        def send(self, request: httpx.Request, *, stream: bool = False, **kwargs) -> httpx.Response:
+            slot = self._slot(request.url.host)
+            slot.acquire()
+            try:
+                response = super().send(request, stream=stream, **kwargs)
+            except BaseException:
+                slot.release()
+                raise
+            if not stream:
+                slot.release()
+                return response
+
+            # Hold the slot until the streamed body is closed
+            inner_close = response.close
+            released = False
+
+            def close() -> None:
+                nonlocal released
+                try:
+                    inner_close()
+                finally:
+                    if not released:
+                        released = True
+                        slot.release()
+
+            response.close = close
+            return response
+
+    return HostLimitedClient
+
+class HttpSession:
+    """Lazily constructed, process-wide HTTP client shared by every network command.
+
+    Nothing (not even the truststore SSL context) is built until the first request, so
+    commands like ``specify --help`` never pay for TLS setup. Clients keep connections
+    alive, so release metadata and asset downloads reuse one TLS connection. Tuning:
+
+    * ``SPECIFY_HTTP2=1`` enables HTTP/2 when the ``h2`` package is installed
+    * ``SPECIFY_PROXY`` sets an explicit proxy URL (standard ``HTTPS_PROXY``/``NO_PROXY``
+      environment variables are honoured otherwise)
+    * ``SPECIFY_HTTP_MAX_CONNECTIONS`` / ``SPECIFY_HTTP_MAX_PER_HOST`` cap the pool size
+    """
+
+    def __init__(self):
+        self._clients: dict[bool, httpx.Client] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _env_int(name: str, default: int) -> int:
+        try:
+            return max(1, int(os.getenv(name, "").strip() or default))
+        except ValueError:
+            return default
+
+    def client(self, *, verify_tls: bool = True) -> httpx.Client:
+        """Return the shared client for the given TLS verification mode, creating it on first use."""
+        with self._lock:
+            existing = self._clients.get(verify_tls)
+            if existing is not None and not existing.is_closed:
+                return existing
+
+            import ssl
+            import httpx
+            import truststore
+
+            http2 = os.getenv("SPECIFY_HTTP2", "").strip().lower() in ("1", "true", "yes")
+            if http2:
+                import importlib.util
+                http2 = importlib.util.find_spec("h2") is not None
+
+            max_connections = self._env_int("SPECIFY_HTTP_MAX_CONNECTIONS", DEFAULT_HTTP_MAX_CONNECTIONS)
+            new_client = _host_limited_client_class()(
+                verify=truststore.SSLContext(ssl.PROTOCOL_TLS_CLIENT) if verify_tls else False,
+                http2=http2,
+                proxy=os.getenv("SPECIFY_PROXY", "").strip() or None,
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                    keepalive_expiry=30.0,
+                ),
+                max_per_host=self._env_int("SPECIFY_HTTP_MAX_PER_HOST", DEFAULT_HTTP_MAX_PER_HOST),
+            )
+            self._clients[verify_tls] = new_client
+            return new_client
+
+    def close(self) -> None:
+        """Close every client created so far; a later client() call starts a fresh one."""
+        with self._lock:
+            clients, self._clients = list(self._clients.values()), {}
+        for c in clients:
+            c.close()
+
+http_session = HttpSession()
 
 def _github_token(cli_token: str | None = None) -> str | None:
     """Return sanitized GitHub token (cli arg takes precedence) or None."""
     return ((cli_token or os.getenv("GH_TOKEN") or os.getenv("GITHUB_TOKEN") or "").strip()) or None
 
-def _github_auth_headers(cli_token: str | None = None) -> dict:
-    """Return Authorization header dict only when a non-empty token exists."""
+def _github_auth_headers(cli_token: str | None = None, url: str | None = None) -> dict:
+    """Return Authorization header dict only when a non-empty token exists.
+
+    With ``url``, the token is only sent to GitHub or the configured release hosts, never to a mirror.
+    """
     token = _github_token(cli_token)
+    if token and url is not None and not _token_host(url):
+        return {}
     return {"Authorization": f"Bearer {token}"} if token else {}
 
 def _parse_rate_limit_headers(headers: httpx.Headers) -> dict:
@@ -250,21 +378,42 @@ BANNER = """
 TAGLINE = "GitHub Spec Kit - Spec-Driven Development Toolkit"
 class StepTracker:
     """Track and render hierarchical steps without emojis, similar to Claude Code tree output.
-    Supports live auto-refresh via an attached refresh callback.
+
+    Steps are indexed by key and every method is thread-safe, so worker threads can
+    update their own rows. The tracker is itself a rich renderable: pass it to ``Live``
+    and changes are picked up at the Live refresh rate, with the tree rebuilt only when
+    something changed since the last frame. An attached refresh callback is likewise
+    throttled to at most one call per ``refresh_interval`` seconds.
+
+    Each step also records monotonic start/end times and the bytes it processed; see
+    ``timings()`` and ``chrome_trace()``.
     """
-    def __init__(self, title: str):
+    def __init__(self, title: str, refresh_interval: float = 1 / 8):
         self.title = title
-        self.steps = []  # list of dicts: {key, label, status, detail}
+        self.steps = []  # list of dicts: {key, label, status, detail}, in display order
+        self._index = {}  # key -> step dict
         self.status_order = {"pending": 0, "running": 1, "done": 2, "error": 3, "skipped": 4}
         self._refresh_cb = None  # callable to trigger UI refresh
+        self.refresh_interval = refresh_interval
+        self._last_refresh = 0.0
+        self._lock = threading.RLock()
+        self._dirty = True
+        self._rendered = None
+        self.created_at = time.time()
+        self._t0 = time.monotonic()
 
     def attach_refresh(self, cb):
         self._refresh_cb = cb
 
-    def add(self, key: str, label: str):
-        if key not in [s["key"] for s in self.steps]:
-            self.steps.append({"key": key, "label": label, "status": "pending", "detail": ""})
-            self._maybe_refresh()
+    def add(self, key: str, label: str, before: str | None = None):
+        """Add a pending step at the end, or just above the step ``before`` if it exists."""
+        with self._lock:
+            if key not in self._index:
+                self._append(key, label, "pending", "")
+                anchor = self._index.get(before)
+                if anchor is not None:
+                    self.steps.insert(self.steps.index(anchor), self.steps.pop())
+                    self._dirty = True
 
     def start(self, key: str, detail: str = ""):
         self._update(key, status="running", detail=detail)
@@ -278,26 +427,119 @@ class StepTracker:
     def skip(self, key: str, detail: str = ""):
         self._update(key, status="skipped", detail=detail)
 
+    def add_bytes(self, key: str, count: int):
+        """Add ``count`` bytes to the amount of data a step transferred or wrote."""
+        with self._lock:
+            step = self._index.get(key)
+            if step is not None:
+                step["bytes"] = step.get("bytes", 0) + count
+
+    def _append(self, key: str, label: str, status: str, detail: str):
+        step = {"key": key, "label": label, "status": status, "detail": detail}
+        self.steps.append(step)
+        self._index[key] = step
+        self._stamp(step, status)
+        self._maybe_refresh()
+
     def _update(self, key: str, status: str, detail: str):
-        for s in self.steps:
-            if s["key"] == key:
-                s["status"] = status
-                if detail:
-                    s["detail"] = detail
-                self._maybe_refresh()
+        with self._lock:
+            step = self._index.get(key)
+            if step is None:
+                self._append(key, key, status, detail)
                 return
+            step["status"] = status
+            if detail:
+                step["detail"] = detail
+            self._stamp(step, status)
+            self._maybe_refresh()
 
-        self.steps.append({"key": key, "label": key, "status": status, "detail": detail})
-        self._maybe_refresh()
+    @staticmethod
+    def _stamp(step: dict, status: str):
+        now = time.monotonic()
+        if status == "running":
+            step.setdefault("start", now)
+        elif status in ("done", "error", "skipped"):
+            step.setdefault("start", now)
+            step["end"] = now
+
+    def timings(self) -> list[dict]:
+        """Return key, label, status, start/duration (seconds from tracker creation), bytes and throughput per finished step."""
+        with self._lock:
+            rows = []
+            for step in self.steps:
+                if "end" not in step:
+                    continue
+                duration = step["end"] - step["start"]
+                byte_count = step.get("bytes", 0)
+                rows.append({
+                    "key": step["key"],
+                    "label": step["label"],
+                    "status": step["status"],
+                    "start": step["start"] - self._t0,
+                    "duration": duration,
+                    "bytes": byte_count,
+                    "throughput": byte_count / duration if byte_count and duration > 0 else None,
+                })
+            return rows
+
+    def chrome_trace(self, metadata: dict | None = None) -> dict:
+        """Return the step timings as Chrome trace-event JSON (chrome://tracing, Perfetto).
+
+        Overlapping steps, such as concurrent downloads, are placed on separate lanes (tids).
+        """
+        events = []
+        lanes: list[float] = []
+        for row in sorted(self.timings(), key=lambda r: r["start"]):
+            end = row["start"] + row["duration"]
+            lane = next((i for i, lane_end in enumerate(lanes) if lane_end <= row["start"]), len(lanes))
+            if lane == len(lanes):
+                lanes.append(end)
+            else:
+                lanes[lane] = end
+            args = {"key": row["key"], "status": row["status"], "bytes": row["bytes"]}
+            if row["throughput"]:
+                args["bytes_per_second"] = round(row["throughput"])
+            events.append({
+                "name": row["label"],
+                "cat": "specify",
+                "ph": "X",
+                "ts": round(row["start"] * 1_000_000),
+                "dur": round(row["duration"] * 1_000_000),
+                "pid": os.getpid(),
+                "tid": lane + 1,
+                "args": args,
+            })
+        other = {"title": self.title, "started_at": datetime.fromtimestamp(self.created_at, timezone.utc).isoformat()}
+        other.update(metadata or {})
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": other}
 
     def _maybe_refresh(self):
-        if self._refresh_cb:
-            try:
-                self._refresh_cb()
-            except Exception:
-                pass
+        self._dirty = True
+        if not self._refresh_cb:
+            return
+        now = time.monotonic()
+        if now - self._last_refresh < self.refresh_interval:
+            return
+        self._last_refresh = now
+        try:
+            self._refresh_cb()
+        except Exception:
+            pass
+
+    def __rich__(self):
+        return self.render()
 
     def render(self):
+        """Return the rich Tree for the current steps, reusing the last one if nothing changed."""
+        with self._lock:
+            if self._dirty or self._rendered is None:
+                self._rendered = self._build_tree()
+                self._dirty = False
+            return self._rendered
+
+    def _build_tree(self):
+        from rich.tree import Tree
+
         tree = Tree(f"[cyan]{self.title}[/cyan]", guide_style="grey50")
         for step in self.steps:
             label = step["label"]
@@ -333,8 +575,39 @@ class StepTracker:
             tree.add(line)
         return tree
 
+def write_step_trace(tracker: StepTracker, path: Path, metadata: dict | None = None) -> None:
+    """Write the tracker's step timings to ``path`` as Chrome trace-event JSON."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(tracker.chrome_trace(metadata), f, indent=2)
+
+def print_step_timings(tracker: StepTracker) -> None:
+    """Print a table of per-step durations, bytes and throughput."""
+    from rich.table import Table
+
+    table = Table(title="Step Timings", show_header=True, header_style="cyan")
+    table.add_column("Step")
+    table.add_column("Status")
+    table.add_column("Duration", justify="right")
+    table.add_column("Bytes", justify="right")
+    table.add_column("Throughput", justify="right")
+    rows = tracker.timings()
+    for row in rows:
+        table.add_row(
+            row["label"],
+            row["status"],
+            f"{row['duration'] * 1000:.1f} ms",
+            _format_size(row["bytes"]) if row["bytes"] else "",
+            f"{_format_size(round(row['throughput']))}/s" if row["throughput"] else "",
+        )
+    total = max((row["start"] + row["duration"] for row in rows), default=0.0)
+    table.caption = f"Total: {total * 1000:.1f} ms"
+    console.print(table)
+
 def get_key():
     """Get a single keypress in a cross-platform way using readchar."""
+    import readchar
+
     key = readchar.readkey()
 
     if key == readchar.key.UP or key == readchar.key.CTRL_P:
@@ -365,6 +638,9 @@ def select_with_arrows(options: dict, prompt_text: str = "Select an option", def
     Returns:
         Selected option key
     """
+    from rich.live import Live
+    from rich.table import Table
+
     option_keys = list(options.keys())
     if default_key and default_key in option_keys:
         selected_index = option_keys.index(default_key)
@@ -462,13 +738,121 @@ def show_banner():
     console.print()
 
 @app.callback()
-def callback(ctx: typer.Context):
+def callback(
+    ctx: typer.Context,
+    profile: bool = typer.Option(False, "--profile", help="Profile the command with cProfile, save the stats (default: specify-profile-<timestamp>.pstats) and print hotspots and an import-time breakdown to stderr"),
+    profile_output: Optional[Path] = typer.Option(None, "--profile-output", metavar="PATH", help="Save the --profile stats to PATH (implies --profile)"),
+):
     """Show banner when no subcommand is provided."""
+    if profile or profile_output is not None:
+        _start_profiling(ctx, profile_output)
     if ctx.invoked_subcommand is None and "--help" not in sys.argv and "-h" not in sys.argv:
         show_banner()
         console.print(Align.center("[dim]Run 'specify --help' for usage information[/dim]"))
         console.print()
 
+PROFILE_TOP_N = 20
+
+def _start_profiling(ctx: typer.Context, path: Path | None = None) -> None:
+    """Profile the rest of the command; the report is written when the context closes (also on errors).
+
+    cProfile only sees the main thread, so work done in download or probe worker
+    threads shows up as time spent waiting on their futures.
+    """
+    import cProfile
+
+    path = path or Path(f"specify-profile-{datetime.now():%Y%m%d-%H%M%S}.pstats")
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+
+    def finish():
+        profiler.disable()
+        _report_profile(profiler, path, time.perf_counter() - started)
+
+    ctx.call_on_close(finish)
+    profiler.enable()
+
+def _import_time_breakdown() -> Tuple[Optional[float], list[Tuple[str, float, float]]]:
+    """Measure ``import specify_cli`` in a fresh interpreter with ``-X importtime``.
+
+    Returns (total_ms, [(module, cumulative_ms, self_ms)]) for the modules imported
+    directly by specify_cli, or (None, []) if the measurement fails.
+    """
+    module_parent = str(Path(__file__).resolve().parent.parent)
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [module_parent, env.get("PYTHONPATH")]))
+    try:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import specify_cli"],
+            capture_output=True,
+            text=True,
+            env=env,
+            timeout=60,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None, []
+
+    block: list[Tuple[str, float, float]] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        raw_name = parts[2]
+        level = (len(raw_name) - len(raw_name.lstrip()) - 1) // 2
+        name = raw_name.strip()
+        self_ms, cumulative_ms = int(parts[0]) / 1000, int(parts[1]) / 1000
+        if level == 0:
+            if name == "specify_cli":
+                return cumulative_ms, sorted(block, key=lambda item: item[1], reverse=True)
+            block = []
+        elif level == 1:
+            block.append((name, cumulative_ms, self_ms))
+    return None, []
+
+def _report_profile(profiler, path: Path, elapsed: float) -> None:
+    """Save the profile to ``path`` and print the top hotspots and import-time breakdown to stderr."""
+    import pstats
+    from rich.table import Table
+
+    err_console = Console(stderr=True)
+    try:
+        profiler.dump_stats(path)
+    except OSError as e:
+        err_console.print(f"[yellow]Warning:[/yellow] could not write profile {path}: {e}")
+
+    stats = pstats.Stats(profiler)
+    hotspots = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:PROFILE_TOP_N]
+    table = Table(title=f"Top {len(hotspots)} Hotspots (self time)", show_header=True, header_style="cyan")
+    table.add_column("Calls", justify="right")
+    table.add_column("Self", justify="right")
+    table.add_column("Cumulative", justify="right")
+    table.add_column("Function")
+    for (filename, line, function), (primitive_calls, calls, self_time, cumulative_time, _) in hotspots:
+        location = f"{Path(filename).name}:{line}" if line else filename
+        table.add_row(
+            str(calls) if calls == primitive_calls else f"{calls}/{primitive_calls}",
+            f"{self_time * 1000:.1f} ms",
+            f"{cumulative_time * 1000:.1f} ms",
+            f"{function} [bright_black]({location})[/bright_black]",
+        )
+    err_console.print()
+    err_console.print(table)
+
+    total_ms, modules = _import_time_breakdown()
+    if total_ms is not None:
+        imports = Table(title="Import Time (fresh interpreter)", show_header=True, header_style="cyan")
+        imports.add_column("Module")
+        imports.add_column("Cumulative", justify="right")
+        imports.add_column("Self", justify="right")
+        for name, cumulative_ms, self_ms in modules[:PROFILE_TOP_N]:
+            imports.add_row(name, f"{cumulative_ms:.1f} ms", f"{self_ms:.1f} ms")
+        imports.caption = f"Total: {total_ms:.1f} ms"
+        err_console.print(imports)
+
+    err_console.print(f"[cyan]Command time:[/cyan] {elapsed * 1000:.1f} ms  [cyan]Profile:[/cyan] {path} [dim](python -m pstats {path})[/dim]")
+
 def run_command(cmd: list[str], check_return: bool = True, capture: bool = False, shell: bool = False) -> Optional[str]:
     """Run a shell command and optionally capture output."""
     try:
@@ -487,6 +871,120 @@ def run_command(cmd: list[str], check_return: bool = True, capture: bool = False
             raise
         return None
 
+def _path_dirs(path_value: str) -> list[str]:
+    """Split a PATH value into its unique, non-empty directories, preserving order."""
+    return list(dict.fromkeys(entry for entry in path_value.split(os.pathsep) if entry))
+
+def _list_directory(directory: str) -> Tuple[Optional[int], list[str]]:
+    """Return (mtime_ns, entry names) for one PATH directory, or (None, []) if it cannot be read."""
+    try:
+        mtime = os.stat(directory).st_mtime_ns
+        with os.scandir(directory) as it:
+            return mtime, [entry.name for entry in it]
+    except OSError:
+        return None, []
+
+class PathIndex:
+    """Lookup table from executable name to the PATH directories that contain it.
+
+    Built from a single listing of each PATH directory (listed concurrently, since tool
+    directories may sit on slow network mounts) instead of one stat per directory per
+    lookup. The index can be persisted under the cache directory, keyed by the PATH
+    value and each directory's mtime. Candidates are checked for execute permission
+    at lookup time, so a stale index never produces a false hit.
+    """
+
+    def __init__(self, path_value: str, pathext: str = "", *, use_disk_cache: bool = True):
+        self.path_value = path_value
+        self.dirs = _path_dirs(path_value)
+        self.case_insensitive = os.name == "nt"
+        self.pathext = [ext.lower() for ext in pathext.split(os.pathsep) if ext] if self.case_insensitive else []
+        self.source = "scan"
+        self.entries: dict[str, list[str]] | None = self._load_disk_cache() if use_disk_cache else None
+        if self.entries is None:
+            mtimes = self._scan()
+            if use_disk_cache:
+                self._save_disk_cache(mtimes)
+
+    @staticmethod
+    def cache_path() -> Path:
+        return _cache_root() / "path-index.json"
+
+    def _scan(self) -> dict[str, Optional[int]]:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=max(1, min(len(self.dirs), 16))) as pool:
+            listings = list(pool.map(_list_directory, self.dirs))
+        entries: dict[str, list[str]] = {}
+        for directory, (_, names) in zip(self.dirs, listings):
+            for name in names:
+                entries.setdefault(name.lower() if self.case_insensitive else name, []).append(directory)
+        self.entries = entries
+        self.source = "scan"
+        return {directory: mtime for directory, (mtime, _) in zip(self.dirs, listings)}
+
+    def _load_disk_cache(self) -> Optional[dict[str, list[str]]]:
+        try:
+            with open(self.cache_path(), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("path") != self.path_value:
+                return None
+            for directory in self.dirs:
+                try:
+                    mtime = os.stat(directory).st_mtime_ns
+                except OSError:
+                    mtime = None
+                if data["mtimes"].get(directory) != mtime:
+                    return None
+            self.source = "cache"
+            return data["entries"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            return None
+
+    def _save_disk_cache(self, mtimes: dict[str, Optional[int]]) -> None:
+        path = self.cache_path()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"path": self.path_value, "mtimes": mtimes, "entries": self.entries}, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass  # The on-disk index is only an accelerator
+
+    def which(self, name: str) -> Optional[str]:
+        """Return the full path of executable ``name`` on PATH, like shutil.which, or None."""
+        if os.path.dirname(name):
+            return shutil.which(name)
+        candidates = [name]
+        if self.pathext and not any(name.lower().endswith(ext) for ext in self.pathext):
+            candidates = [name + ext for ext in self.pathext]
+        for candidate in candidates:
+            key = candidate.lower() if self.case_insensitive else candidate
+            for directory in self.entries.get(key, ()):
+                full_path = os.path.join(directory, candidate)
+                if os.path.isfile(full_path) and os.access(full_path, os.X_OK):
+                    return full_path
+        return None
+
+@functools.lru_cache(maxsize=4)
+def _path_index(path_value: str, pathext: str) -> PathIndex:
+    use_disk_cache = os.getenv("SPECIFY_PATH_CACHE", "1").strip().lower() not in ("0", "false", "no", "off")
+    return PathIndex(path_value, pathext, use_disk_cache=use_disk_cache)
+
+def find_tool(tool: str) -> Optional[str]:
+    """Return the full path of an installed tool, or None. Uses the per-process PATH index."""
+    # Special handling for Claude CLI after `claude migrate-installer`
+    # See: https://github.com/github/spec-kit/issues/123
+    # The migrate-installer command REMOVES the original executable from PATH
+    # and creates an alias at ~/.claude/local/claude instead
+    # This path should be prioritized over other claude executables in PATH
+    if tool == "claude":
+        if CLAUDE_LOCAL_PATH.exists() and CLAUDE_LOCAL_PATH.is_file():
+            return str(CLAUDE_LOCAL_PATH)
+
+    return _path_index(os.environ.get("PATH", os.defpath), os.environ.get("PATHEXT", "")).which(tool)
+
 def check_tool(tool: str, tracker: StepTracker = None) -> bool:
     """Check if a tool is installed. Optionally update tracker.
     
@@ -497,18 +995,7 @@ def check_tool(tool: str, tracker: StepTracker = None) -> bool:
     Returns:
         True if tool is found, False otherwise
     """
-    # Special handling for Claude CLI after `claude migrate-installer`
-    # See: https://github.com/github/spec-kit/issues/123
-    # The migrate-installer command REMOVES the original executable from PATH
-    # and creates an alias at ~/.claude/local/claude instead
-    # This path should be prioritized over other claude executables in PATH
-    if tool == "claude":
-        if CLAUDE_LOCAL_PATH.exists() and CLAUDE_LOCAL_PATH.is_file():
-            if tracker:
-                tracker.complete(tool, "available")
-            return True
-    
-    found = shutil.which(tool) is not None
+    found = find_tool(tool) is not None
     
     if tracker:
         if found:
@@ -518,6 +1005,122 @@ def check_tool(tool: str, tracker: StepTracker = None) -> bool:
     
     return found
 
+DEFAULT_VERSION_TIMEOUT = 10.0
+
+def _parse_tool_version(output: str) -> Optional[str]:
+    """Pick a version out of ``<tool> --version`` output, falling back to its first non-empty line."""
+    lines = [line.strip() for line in output.splitlines() if line.strip()]
+    for line in lines:
+        match = re.search(r"\d+(?:\.\d+)+(?:[-+.][0-9A-Za-z.]+)?", line)
+        if match:
+            return match.group(0)
+    return lines[0][:80] if lines else None
+
+def probe_tool_version(path: str, timeout: float = DEFAULT_VERSION_TIMEOUT) -> str:
+    """Run ``<path> --version`` and return the parsed version. Raises on timeout or failure."""
+    try:
+        result = subprocess.run(
+            [path, "--version"],
+            capture_output=True,
+            text=True,
+            errors="replace",
+            stdin=subprocess.DEVNULL,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        raise RuntimeError(f"timed out after {timeout:g}s")
+    except OSError as e:
+        raise RuntimeError(str(e))
+    version = _parse_tool_version(result.stdout) or _parse_tool_version(result.stderr)
+    if result.returncode != 0 and not version:
+        raise RuntimeError(f"exit code {result.returncode}")
+    if not version:
+        raise RuntimeError("no version output")
+    return version
+
+class ToolVersionCache:
+    """On-disk cache of probed tool versions keyed by binary path, size and mtime."""
+
+    def __init__(self, root: Path | None = None):
+        self.path = (root or _cache_root()) / "tool-versions.json"
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+            if not isinstance(self.entries, dict):
+                self.entries = {}
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            self.entries = {}
+
+    @staticmethod
+    def _stamp(path: str) -> Optional[list]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return [st.st_size, st.st_mtime_ns]
+
+    def get(self, path: str) -> Optional[str]:
+        entry = self.entries.get(path)
+        if entry and entry.get("stamp") == self._stamp(path):
+            return entry.get("version")
+        return None
+
+    def put(self, path: str, version: str) -> None:
+        self.entries[path] = {"stamp": self._stamp(path), "version": version}
+
+    def save(self) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass  # Caching is best-effort
+
+def probe_tool_versions(tools: dict[str, str], *, timeout: float = DEFAULT_VERSION_TIMEOUT, use_cache: bool = True, on_result=None) -> dict[str, dict]:
+    """Probe ``{key: binary path}`` concurrently and return ``{key: {version, error, cached}}``.
+
+    Cached versions (same path, size and mtime) are returned without running the tool.
+    ``on_result(key, result)`` is called from the calling thread as each probe finishes,
+    so it can safely update a StepTracker.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    cache = ToolVersionCache() if use_cache else None
+    results: dict[str, dict] = {}
+
+    def finish(key: str, result: dict) -> None:
+        results[key] = result
+        if on_result:
+            on_result(key, result)
+
+    pending = {}
+    for key, path in tools.items():
+        version = cache.get(path) if cache else None
+        if version:
+            finish(key, {"version": version, "error": None, "cached": True})
+        else:
+            pending[key] = path
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=min(len(pending), 8)) as pool:
+            futures = {pool.submit(probe_tool_version, path, timeout): key for key, path in pending.items()}
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    version = future.result()
+                except Exception as e:
+                    finish(key, {"version": None, "error": str(e), "cached": False})
+                    continue
+                if cache:
+                    cache.put(pending[key], version)
+                finish(key, {"version": version, "error": None, "cached": False})
+        if cache:
+            cache.save()
+
+    return results
+
 def is_git_repo(path: Path = None) -> bool:
     """Check if the specified path is inside a git repository."""
     if path is None:
@@ -575,13 +1178,17 @@ def init_git_repo(project_path: Path, quiet: bool = False) -> Tuple[bool, Option
 
 def handle_vscode_settings(sub_item, dest_file, rel_path, verbose=False, tracker=None) -> None:
     """Handle merging or copying of .vscode/settings.json files."""
+    with open(sub_item, 'rb') as f:
+        handle_vscode_settings_bytes(f.read(), dest_file, rel_path, verbose, tracker)
+
+def handle_vscode_settings_bytes(data: bytes, dest_file, rel_path, verbose=False, tracker=None) -> None:
+    """Merge (or write) .vscode/settings.json content that is already in memory, e.g. read from a zip entry."""
     def log(message, color="green"):
         if verbose and not tracker:
             console.print(f"[{color}]{message}[/] {rel_path}")
 
     try:
-        with open(sub_item, 'r', encoding='utf-8') as f:
-            new_settings = json.load(f)
+        new_settings = json.loads(data.decode('utf-8'))
 
         if dest_file.exists():
             merged = merge_json_files(dest_file, new_settings, verbose=verbose and not tracker)
@@ -590,12 +1197,12 @@ def handle_vscode_settings(sub_item, dest_file, rel_path, verbose=False, tracker
                 f.write('\n')
             log("Merged:", "green")
         else:
-            shutil.copy2(sub_item, dest_file)
+            dest_file.write_bytes(data)
             log("Copied (no existing settings.json):", "blue")
 
     except Exception as e:
         log(f"Warning: Could not merge, copying instead: {e}", "yellow")
-        shutil.copy2(sub_item, dest_file)
+        dest_file.write_bytes(data)
 
 def merge_json_files(existing_path: Path, new_content: dict, verbose: bool = False) -> dict:
     """Merge new JSON content into existing JSON file.
@@ -640,281 +1247,2330 @@ def merge_json_files(existing_path: Path, new_content: dict, verbose: bool = Fal
 
     return merged
 
-def download_template_from_github(ai_assistant: str, download_dir: Path, *, script_type: str = "sh", verbose: bool = True, show_progress: bool = True, client: httpx.Client = None, debug: bool = False, github_token: str = None) -> Tuple[Path, dict]:
-    # Support custom repository via environment variables for testing and enterprise use
-    repo_owner = os.getenv("SPEC_KIT_REPO_OWNER", "github")
-    repo_name = os.getenv("SPEC_KIT_REPO_NAME", "spec-kit")
-    if client is None:
-        client = httpx.Client(verify=ssl_context)
+DEFAULT_CACHE_MAX_SIZE = 512 * 1024 * 1024
+# Automatic pruning spares anything used this recently, so a running init keeps the
+# archives and unpacked trees it has just fetched even when they overflow the cap
+CACHE_PRUNE_GRACE = 600.0
+
+def _parse_size(value: str) -> int:
+    """Parse a human-friendly size such as '512M' or '2G' into bytes."""
+    value = value.strip().upper().removesuffix("B")
+    multipliers = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    if value and value[-1] in multipliers:
+        return int(float(value[:-1]) * multipliers[value[-1]])
+    return int(value)
+
+def _format_size(num_bytes: int) -> str:
+    """Format a byte count for display (e.g. '1.5 MiB')."""
+    size = float(num_bytes)
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+def _cache_root() -> Path:
+    """Return the root of the Specify user cache (SPECIFY_CACHE_DIR overrides the platform default)."""
+    override = os.getenv("SPECIFY_CACHE_DIR", "").strip()
+    if override:
+        return Path(override).expanduser()
+    from platformdirs import user_cache_dir
+
+    return Path(user_cache_dir("specify-cli", appauthor=False))
+
+def _cache_max_size() -> int:
+    """Return the template cache size cap in bytes (SPECIFY_CACHE_MAX_SIZE, e.g. '1G')."""
+    raw = os.getenv("SPECIFY_CACHE_MAX_SIZE", "").strip()
+    if raw:
+        try:
+            return _parse_size(raw)
+        except ValueError:
+            pass
+    return DEFAULT_CACHE_MAX_SIZE
 
-    if verbose:
-        console.print("[cyan]Fetching latest release information...[/cyan]")
-    api_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases/latest"
+LOCK_STALE_AFTER = 600.0
+LOCK_POLL_MAX = 0.5
 
-    try:
-        response = client.get(
-            api_url,
-            timeout=30,
-            follow_redirects=True,
-            headers=_github_auth_headers(github_token),
-        )
-        status = response.status_code
-        if status != 200:
-            # Format detailed error message with rate-limit info
-            error_msg = _format_rate_limit_error(status, response.headers, api_url)
-            if debug:
-                error_msg += f"\n\n[dim]Response body (truncated 500):[/dim]\n{response.text[:500]}"
-            raise RuntimeError(error_msg)
-        try:
-            release_data = response.json()
-        except ValueError as je:
-            raise RuntimeError(f"Failed to parse release JSON: {je}\nRaw (truncated 400): {response.text[:400]}")
-    except Exception as e:
-        console.print(f"[red]Error fetching release information[/red]")
-        console.print(Panel(str(e), title="Fetch Error", border_style="red"))
-        raise typer.Exit(1)
+@functools.lru_cache(maxsize=None)
+def _hostname() -> str:
+    import socket
 
-    assets = release_data.get("assets", [])
-    pattern = f"spec-kit-template-{ai_assistant}-{script_type}"
-    matching_assets = [
-        asset for asset in assets
-        if pattern in asset["name"] and asset["name"].endswith(".zip")
-    ]
+    return socket.gethostname()
 
-    asset = matching_assets[0] if matching_assets else None
+def _pid_alive(pid) -> bool:
+    """Whether a process with this pid exists on this host (assumed on Windows, where os.kill would end it)."""
+    if not isinstance(pid, int) or pid <= 0:
+        return False
+    if os.name == "nt":
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # EPERM: alive, owned by another user
+    return True
+
+class FileLock:
+    """Cross-process lock held by exclusively creating a lock file (O_CREAT | O_EXCL).
+
+    The file records the holder's pid, host and thread, and while the lock is held a
+    heartbeat thread touches it every ``stale_after / 4`` seconds. A lock whose holder has
+    exited (on this host) or whose heartbeat stopped ``stale_after`` seconds ago is broken,
+    so a crashed or killed process never wedges later runs while a slow download or unpack
+    keeps its lock however long it takes. Unlike fcntl/msvcrt locks this behaves the same
+    on every platform and on network filesystems. Not re-entrant.
+
+    As a context manager, a lock file that cannot be created at all (read-only cache
+    directory) is skipped: caching problems must never break a command. ``waited`` is
+    how long acquiring took; ``on_wait`` is called once if another holder blocks us.
+    """
 
-    if asset is None:
-        console.print(f"[red]No matching release asset found[/red] for [bold]{ai_assistant}[/bold] (expected pattern: [bold]{pattern}[/bold])")
-        asset_names = [a.get('name', '?') for a in assets]
-        console.print(Panel("\n".join(asset_names) or "(no assets)", title="Available Assets", border_style="yellow"))
-        raise typer.Exit(1)
+    def __init__(self, path: Path, *, stale_after: float = LOCK_STALE_AFTER, on_wait=None):
+        self.path = path
+        self.stale_after = stale_after
+        self.on_wait = on_wait
+        self.held = False
+        self.waited = 0.0
+        self._token = ""
+        self._stop_heartbeat: threading.Event | None = None
 
-    download_url = asset["browser_download_url"]
-    filename = asset["name"]
-    file_size = asset["size"]
+    def _try_create(self) -> bool:
+        try:
+            fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(self._token)
+        return True
 
-    if verbose:
-        console.print(f"[cyan]Found template:[/cyan] {filename}")
-        console.print(f"[cyan]Size:[/cyan] {file_size:,} bytes")
-        console.print(f"[cyan]Release:[/cyan] {release_data['tag_name']}")
+    def _heartbeat(self, stop: threading.Event) -> None:
+        """Refresh the lock file's mtime until released, or until the lock is no longer ours."""
+        while not stop.wait(self.stale_after / 4):
+            try:
+                if self.path.read_text(encoding="utf-8") != self._token:
+                    return
+                os.utime(self.path)
+            except OSError:
+                return
 
-    zip_path = download_dir / filename
-    if verbose:
-        console.print(f"[cyan]Downloading template...[/cyan]")
+    def _stale_content(self) -> Optional[str]:
+        """Return the lock file's content if its holder is gone (heartbeat stopped or process exited), else None."""
+        try:
+            content = self.path.read_text(encoding="utf-8")
+            age = time.time() - self.path.stat().st_mtime
+        except FileNotFoundError:
+            return None  # released meanwhile; just retry
+        if age > self.stale_after:
+            return content
+        try:
+            owner = json.loads(content)
+        except ValueError:
+            return None  # the holder is still writing its record
+        if isinstance(owner, dict) and owner.get("host") == _hostname() and not _pid_alive(owner.get("pid")):
+            return content
+        return None
 
-    try:
-        with client.stream(
-            "GET",
-            download_url,
-            timeout=60,
-            follow_redirects=True,
-            headers=_github_auth_headers(github_token),
-        ) as response:
-            if response.status_code != 200:
-                # Handle rate-limiting on download as well
-                error_msg = _format_rate_limit_error(response.status_code, response.headers, download_url)
-                if debug:
-                    error_msg += f"\n\n[dim]Response body (truncated 400):[/dim]\n{response.text[:400]}"
-                raise RuntimeError(error_msg)
-            total_size = int(response.headers.get('content-length', 0))
-            with open(zip_path, 'wb') as f:
-                if total_size == 0:
-                    for chunk in response.iter_bytes(chunk_size=8192):
-                        f.write(chunk)
-                else:
-                    if show_progress:
-                        with Progress(
-                            SpinnerColumn(),
-                            TextColumn("[progress.description]{task.description}"),
-                            TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-                            console=console,
-                        ) as progress:
-                            task = progress.add_task("Downloading...", total=total_size)
-                            downloaded = 0
-                            for chunk in response.iter_bytes(chunk_size=8192):
-                                f.write(chunk)
-                                downloaded += len(chunk)
-                                progress.update(task, completed=downloaded)
-                    else:
-                        for chunk in response.iter_bytes(chunk_size=8192):
-                            f.write(chunk)
-    except Exception as e:
-        console.print(f"[red]Error downloading template[/red]")
-        detail = str(e)
-        if zip_path.exists():
-            zip_path.unlink()
-        console.print(Panel(detail, title="Download Error", border_style="red"))
-        raise typer.Exit(1)
-    if verbose:
-        console.print(f"Downloaded: {filename}")
-    metadata = {
-        "filename": filename,
-        "size": file_size,
-        "release": release_data["tag_name"],
-        "asset_url": download_url
-    }
-    return zip_path, metadata
+    def _break(self, content: str) -> None:
+        """Remove a stale lock, restoring it if a fresh holder replaced it after the check."""
+        grave = self.path.with_name(f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.stale")
+        try:
+            os.replace(self.path, grave)
+        except FileNotFoundError:
+            return
+        try:
+            if grave.read_text(encoding="utf-8") != content:
+                try:
+                    os.link(grave, self.path)
+                except OSError:
+                    pass
+        finally:
+            grave.unlink(missing_ok=True)
+
+    def acquire(self) -> None:
+        """Block until the lock is held, breaking stale locks on the way."""
+        started = time.monotonic()
+        self._token = json.dumps({"pid": os.getpid(), "host": _hostname(), "thread": threading.get_ident(), "created": time.time()})
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        delay = 0.02
+        notified = False
+        while not self._try_create():
+            stale = self._stale_content()
+            if stale is not None:
+                self._break(stale)
+                continue
+            if not notified and self.on_wait:
+                self.on_wait()
+            notified = True
+            time.sleep(delay)
+            delay = min(delay * 2, LOCK_POLL_MAX)
+        self.held = True
+        self.waited = time.monotonic() - started
+        self._stop_heartbeat = threading.Event()
+        threading.Thread(target=self._heartbeat, args=(self._stop_heartbeat,), name="specify-lock-heartbeat", daemon=True).start()
+
+    def release(self) -> None:
+        """Release the lock, unless it was broken as stale and is now someone else's."""
+        if not self.held:
+            return
+        self.held = False
+        if self._stop_heartbeat is not None:
+            self._stop_heartbeat.set()
+        try:
+            if self.path.read_text(encoding="utf-8") == self._token:
+                self.path.unlink()
+        except OSError:
+            pass
 
-def download_and_extract_template(project_path: Path, ai_assistant: str, script_type: str, is_current_dir: bool = False, *, verbose: bool = True, tracker: StepTracker | None = None, client: httpx.Client = None, debug: bool = False, github_token: str = None) -> Path:
-    """Download the latest release and extract it to create a new project.
-    Returns project_path. Uses tracker if provided (with keys: fetch, download, extract, cleanup)
-    """
-    current_dir = Path.cwd()
+    def __enter__(self) -> "FileLock":
+        try:
+            self.acquire()
+        except OSError:
+            pass
+        return self
 
-    if tracker:
-        tracker.start("fetch", "contacting GitHub API")
-    try:
-        zip_path, meta = download_template_from_github(
-            ai_assistant,
-            current_dir,
-            script_type=script_type,
-            verbose=verbose and tracker is None,
-            show_progress=(tracker is None),
-            client=client,
-            debug=debug,
-            github_token=github_token
-        )
-        if tracker:
-            tracker.complete("fetch", f"release {meta['release']} ({meta['size']:,} bytes)")
-            tracker.add("download", "Download template")
-            tracker.complete("download", meta['filename'])
-    except Exception as e:
-        if tracker:
-            tracker.error("fetch", str(e))
-        else:
-            if verbose:
-                console.print(f"[red]Error downloading template:[/red] {e}")
-        raise
+    def __exit__(self, *exc) -> None:
+        self.release()
 
-    if tracker:
-        tracker.add("extract", "Extract template")
-        tracker.start("extract")
-    elif verbose:
-        console.print("Extracting template...")
+class TemplateCache:
+    """Content-addressed on-disk cache of template archives.
 
-    try:
-        if not is_current_dir:
-            project_path.mkdir(parents=True)
+    Archives are stored once per SHA-256 under ``blobs/`` and indexed by
+    ``<release tag>/<asset name>`` in ``index.json``. Entries are evicted
+    least-recently-used first once the total blob size exceeds the cap.
+    Index updates are serialized across threads and processes (``index.lock``), so
+    concurrent downloads and concurrent ``specify`` runs can share one cache.
+    """
 
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_contents = zip_ref.namelist()
-            if tracker:
-                tracker.start("zip-list")
-                tracker.complete("zip-list", f"{len(zip_contents)} entries")
-            elif verbose:
-                console.print(f"[cyan]ZIP contains {len(zip_contents)} items[/cyan]")
+    _index_lock = threading.RLock()
 
-            if is_current_dir:
-                with tempfile.TemporaryDirectory() as temp_dir:
-                    temp_path = Path(temp_dir)
-                    zip_ref.extractall(temp_path)
+    def __init__(self, root: Path | None = None, max_size: int | None = None):
+        self.root = (root or _cache_root()) / "templates"
+        self.max_size = _cache_max_size() if max_size is None else max_size
+        self.blobs_dir = self.root / "blobs"
+        self.index_path = self.root / "index.json"
 
-                    extracted_items = list(temp_path.iterdir())
-                    if tracker:
-                        tracker.start("extracted-summary")
-                        tracker.complete("extracted-summary", f"temp {len(extracted_items)} items")
-                    elif verbose:
-                        console.print(f"[cyan]Extracted {len(extracted_items)} items to temp location[/cyan]")
+    @staticmethod
+    def key(tag: str, asset_name: str) -> str:
+        return f"{tag}/{asset_name}"
 
-                    source_dir = temp_path
-                    if len(extracted_items) == 1 and extracted_items[0].is_dir():
-                        source_dir = extracted_items[0]
-                        if tracker:
-                            tracker.add("flatten", "Flatten nested directory")
-                            tracker.complete("flatten")
-                        elif verbose:
-                            console.print(f"[cyan]Found nested directory structure[/cyan]")
-
-                    for item in source_dir.iterdir():
-                        dest_path = project_path / item.name
-                        if item.is_dir():
-                            if dest_path.exists():
-                                if verbose and not tracker:
-                                    console.print(f"[yellow]Merging directory:[/yellow] {item.name}")
-                                for sub_item in item.rglob('*'):
-                                    if sub_item.is_file():
-                                        rel_path = sub_item.relative_to(item)
-                                        dest_file = dest_path / rel_path
-                                        dest_file.parent.mkdir(parents=True, exist_ok=True)
-                                        # Special handling for .vscode/settings.json - merge instead of overwrite
-                                        if dest_file.name == "settings.json" and dest_file.parent.name == ".vscode":
-                                            handle_vscode_settings(sub_item, dest_file, rel_path, verbose, tracker)
-                                        else:
-                                            shutil.copy2(sub_item, dest_file)
-                            else:
-                                shutil.copytree(item, dest_path)
-                        else:
-                            if dest_path.exists() and verbose and not tracker:
-                                console.print(f"[yellow]Overwriting file:[/yellow] {item.name}")
-                            shutil.copy2(item, dest_path)
-                    if verbose and not tracker:
-                        console.print(f"[cyan]Template files merged into current directory[/cyan]")
-            else:
-                zip_ref.extractall(project_path)
+    def _index_file_lock(self) -> FileLock:
+        return FileLock(self.root / "index.lock", stale_after=60)
 
-                extracted_items = list(project_path.iterdir())
-                if tracker:
-                    tracker.start("extracted-summary")
-                    tracker.complete("extracted-summary", f"{len(extracted_items)} top-level items")
-                elif verbose:
-                    console.print(f"[cyan]Extracted {len(extracted_items)} items to {project_path}:[/cyan]")
-                    for item in extracted_items:
-                        console.print(f"  - {item.name} ({'dir' if item.is_dir() else 'file'})")
+    def download_lock(self, asset_name: str, on_wait=None) -> FileLock:
+        """Lock that lets one process download an asset while others wait to reuse the cached copy."""
+        return FileLock(self.root / "locks" / f"{asset_name}.lock", on_wait=on_wait)
 
-                if len(extracted_items) == 1 and extracted_items[0].is_dir():
-                    nested_dir = extracted_items[0]
-                    temp_move_dir = project_path.parent / f"{project_path.name}_temp"
+    def _load_index(self) -> dict:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict) and isinstance(data.get("entries"), dict):
+                return data
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            pass
+        return {"version": 1, "entries": {}}
+
+    def _save_index(self, index: dict) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+
+    def blob_path(self, sha256: str) -> Path:
+        return self.blobs_dir / f"{sha256}.zip"
+
+    def entries(self) -> list[dict]:
+        """Return cache entries, most recently used first."""
+        index = self._load_index()
+        entries = [dict(entry, key=key) for key, entry in index["entries"].items()]
+        return sorted(entries, key=lambda e: e.get("last_used", 0), reverse=True)
+
+    def lookup(self, tag: str, asset_name: str, expected_size: int | None = None) -> Optional[Path]:
+        """Return the cached archive for tag/asset (refreshing its LRU stamp), or None on a miss."""
+        with self._index_lock, self._index_file_lock():
+            index = self._load_index()
+            entry = index["entries"].get(self.key(tag, asset_name))
+            if not entry:
+                return None
+            blob = self.blob_path(entry["sha256"])
+            try:
+                actual_size = blob.stat().st_size
+            except OSError:
+                actual_size = None
+            if actual_size is None or (expected_size and actual_size != expected_size):
+                index["entries"].pop(self.key(tag, asset_name), None)
+                self._save_index(index)
+                return None
+            entry["last_used"] = time.time()
+            self._save_index(index)
+            return blob
+
+    def store(self, tag: str, asset_name: str, source: BinaryIO, sha256: str) -> Path:
+        """Write the archive in ``source`` (whose digest is ``sha256``) into the cache and return the blob path.
+
+        The blob is written to a temporary file and renamed into place, so readers never
+        observe a partial archive. Identical content is stored once.
+        """
+        self.blobs_dir.mkdir(parents=True, exist_ok=True)
+        blob = self.blob_path(sha256)
+        if not blob.exists():
+            tmp_path = self.blobs_dir / f".{asset_name}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                source.seek(0)
+                with open(tmp_path, "wb") as dst:
+                    shutil.copyfileobj(source, dst, 1024 * 1024)
+                os.replace(tmp_path, blob)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+                source.seek(0)
+
+        return self.link(tag, asset_name, sha256)
+
+    def lookup_digest(self, sha256: str) -> Optional[Path]:
+        """Return the cached blob with this SHA-256, whichever release it was stored for."""
+        blob = self.blob_path(sha256)
+        return blob if blob.is_file() else None
+
+    def link(self, tag: str, asset_name: str, sha256: str) -> Path:
+        """Index an already cached blob under tag/asset (identical archives across tags share one blob)."""
+        blob = self.blob_path(sha256)
+        now = time.time()
+        with self._index_lock, self._index_file_lock():
+            index = self._load_index()
+            index["entries"][self.key(tag, asset_name)] = {
+                "tag": tag,
+                "asset": asset_name,
+                "sha256": sha256,
+                "size": blob.stat().st_size,
+                "added": now,
+                "last_used": now,
+            }
+            self._save_index(index)
+            self._prune(index, limit=self.max_size, keep=sha256, grace=CACHE_PRUNE_GRACE)
+        return blob
+
+    def prune(self, max_size: int | None = None, keep: str | None = None, grace: float = 0.0) -> list[dict]:
+        """Evict least-recently-used blobs until the cache fits in ``max_size``; return removed entries."""
+        limit = self.max_size if max_size is None else max_size
+        with self._index_lock, self._index_file_lock():
+            return self._prune(index=self._load_index(), limit=limit, keep=keep, grace=grace)
+
+    def _prune(self, index: dict, limit: int, keep: str | None, grace: float = 0.0) -> list[dict]:
+        """Evict blobs, and the unpacked trees made from them, least recently used first.
+
+        The unpacked store counts toward the limit. A tree whose archive is no longer
+        indexed is evicted on its own, by the tree's last use. Nothing used within the
+        last ``grace`` seconds is evicted.
+        """
+        store = TemplateStore(self.root)
+        blobs: dict[str, dict] = {}
+        for key, entry in index["entries"].items():
+            blob = blobs.setdefault(entry["sha256"], {"size": entry.get("size", 0), "last_used": 0, "keys": []})
+            blob["last_used"] = max(blob["last_used"], entry.get("last_used", 0))
+            blob["keys"].append(key)
+        trees = store.tree_times()
+        for sha256, last_used in trees.items():
+            blobs.setdefault(sha256, {"size": 0, "last_used": last_used, "keys": []})
+
+        total = sum(b["size"] for b in blobs.values()) + store.usage()[2]
+        cutoff = time.time() - grace
+        removed: list[dict] = []
+        for sha256, blob in sorted(blobs.items(), key=lambda item: item[1]["last_used"]):
+            if total <= limit or blob["last_used"] > cutoff:
+                break
+            if sha256 == keep:
+                continue
+            for key in blob["keys"]:
+                removed.append(dict(index["entries"].pop(key), key=key))
+            self.blob_path(sha256).unlink(missing_ok=True)
+            total -= blob["size"]
+            if sha256 in trees:
+                freed = store.drop(sha256) + store.collect_garbage()
+                total -= freed
+                if not blob["keys"]:
+                    removed.append({"key": f"unpacked/{sha256[:12]}", "size": freed})
+
+        if removed:
+            self._save_index(index)
+        return removed
+
+    def latest(self, asset_prefix: str) -> Optional[dict]:
+        """Return the most recently added entry whose asset name starts with ``asset_prefix``."""
+        candidates = [
+            entry for entry in self.entries()
+            if entry["asset"].startswith(asset_prefix) and self.blob_path(entry["sha256"]).is_file()
+        ]
+        if not candidates:
+            return None
+        return max(candidates, key=lambda e: e.get("added", 0))
 
-                    shutil.move(str(nested_dir), str(temp_move_dir))
+    def clear(self) -> int:
+        """Remove every cached archive and return how many index entries were dropped."""
+        count = len(self._load_index()["entries"])
+        if self.root.exists():
+            shutil.rmtree(self.root)
+        return count
 
-                    project_path.rmdir()
+DEFAULT_RELEASE_TTL = 300
+DEFAULT_RELEASE_MAX_STALE = 7 * 24 * 3600
+REVALIDATE_DEADLINE = 2.0
 
-                    shutil.move(str(temp_move_dir), str(project_path))
-                    if tracker:
-                        tracker.add("flatten", "Flatten nested directory")
-                        tracker.complete("flatten")
-                    elif verbose:
-                        console.print(f"[cyan]Flattened nested directory structure[/cyan]")
+_background_refreshes: list[threading.Thread] = []
 
-    except Exception as e:
-        if tracker:
-            tracker.error("extract", str(e))
-        else:
-            if verbose:
-                console.print(f"[red]Error extracting template:[/red] {e}")
-                if debug:
-                    console.print(Panel(str(e), title="Extraction Error", border_style="red"))
+def _env_seconds(name: str, default: int) -> int:
+    """Read a non-negative integer number of seconds from the environment."""
+    raw = os.getenv(name, "").strip()
+    try:
+        return max(0, int(raw)) if raw else default
+    except ValueError:
+        return default
 
-        if not is_current_dir and project_path.exists():
-            shutil.rmtree(project_path)
-        raise typer.Exit(1)
-    else:
-        if tracker:
-            tracker.complete("extract")
-    finally:
-        if tracker:
-            tracker.add("cleanup", "Remove temporary archive")
+class ReleaseMetadataCache:
+    """On-disk cache of GitHub release JSON together with its HTTP validators (ETag/Last-Modified)."""
 
-        if zip_path.exists():
-            zip_path.unlink()
-            if tracker:
-                tracker.complete("cleanup")
-            elif verbose:
-                console.print(f"Cleaned up: {zip_path.name}")
+    def __init__(self, root: Path | None = None):
+        self.root = (root or _cache_root()) / "http"
 
-    return project_path
+    def _path(self, url: str) -> Path:
+        return self.root / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]}.json"
 
+    def lock(self, url: str) -> FileLock:
+        """Lock that lets one process fetch ``url`` while concurrent ones wait and reuse its entry."""
+        return FileLock(self._path(url).with_suffix(".lock"))
 
-def ensure_executable_scripts(project_path: Path, tracker: StepTracker | None = None) -> None:
-    """Ensure POSIX .sh scripts under .specify/scripts (recursively) have execute bits (no-op on Windows)."""
-    if os.name == "nt":
-        return  # Windows: skip silently
-    scripts_root = project_path / ".specify" / "scripts"
-    if not scripts_root.is_dir():
-        return
-    failures: list[str] = []
-    updated = 0
-    for script in scripts_root.rglob("*.sh"):
+    def get(self, url: str) -> Optional[dict]:
+        try:
+            with open(self._path(url), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            return None
+        if not isinstance(entry, dict) or entry.get("url") != url or "body" not in entry:
+            return None
+        return entry
+
+    def put(self, url: str, body: dict, headers: httpx.Headers, previous: dict | None = None) -> dict:
+        """Persist ``body`` with the validators from ``headers`` (falling back to ``previous`` ones)."""
+        previous = previous or {}
+        entry = {
+            "url": url,
+            "etag": headers.get("ETag") or previous.get("etag"),
+            "last_modified": headers.get("Last-Modified") or previous.get("last_modified"),
+            "fetched_at": time.time(),
+            "body": body,
+        }
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            path = self._path(url)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass  # Caching is best-effort; the fetched body is still returned
+        return entry
+
+def _revalidate_release_metadata(client: httpx.Client, api_url: str, cache: ReleaseMetadataCache | None, entry: dict | None, *, github_token: str = None, timeout: float = 30, debug: bool = False) -> dict:
+    """Fetch release JSON, sending If-None-Match/If-Modified-Since when a cached entry exists."""
+    headers = _github_auth_headers(github_token, api_url)
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    response = client.get(api_url, timeout=timeout, follow_redirects=True, headers=headers)
+    status = response.status_code
+    if status == 304 and entry:
+        if cache:
+            cache.put(api_url, entry["body"], response.headers, previous=entry)
+        return entry["body"]
+    if status != 200:
+        # Format detailed error message with rate-limit info
+        error_msg = _format_rate_limit_error(status, response.headers, api_url)
+        if debug:
+            error_msg += f"\n\n[dim]Response body (truncated 500):[/dim]\n{response.text[:500]}"
+        raise RuntimeError(error_msg)
+    try:
+        release_data = response.json()
+    except ValueError as je:
+        raise RuntimeError(f"Failed to parse release JSON: {je}\nRaw (truncated 400): {response.text[:400]}")
+    if cache:
+        cache.put(api_url, release_data, response.headers)
+    return release_data
+
+def _refresh_in_background(client: httpx.Client, api_url: str, cache: ReleaseMetadataCache, entry: dict, github_token: str = None) -> None:
+    """Revalidate a stale cache entry on a daemon thread; failures are ignored."""
+    def worker():
+        try:
+            _revalidate_release_metadata(client, api_url, cache, entry, github_token=github_token, timeout=REVALIDATE_DEADLINE)
+        except Exception:
+            pass
+
+    thread = threading.Thread(target=worker, name="specify-release-refresh", daemon=True)
+    thread.start()
+    _background_refreshes.append(thread)
+
+def wait_for_background_refreshes(deadline: float = REVALIDATE_DEADLINE) -> None:
+    """Give pending background revalidations up to ``deadline`` seconds to land on disk."""
+    end = time.monotonic() + deadline
+    while _background_refreshes:
+        thread = _background_refreshes.pop()
+        thread.join(max(0.0, end - time.monotonic()))
+
+def fetch_release_metadata(client: httpx.Client, api_url: str, *, github_token: str = None, timeout: float = 30, debug: bool = False, use_cache: bool = True, stale_while_revalidate: bool = False, revalidate: bool = False) -> Tuple[dict, str]:
+    """Return ``(release_json, source)`` for ``api_url`` using the on-disk metadata cache.
+
+    Entries younger than SPECIFY_RELEASE_TTL seconds are served without touching the
+    network. Older entries are revalidated with a conditional request, which GitHub
+    answers with 304 without counting it against the rate limit. With
+    ``stale_while_revalidate`` a stale entry (up to SPECIFY_RELEASE_MAX_STALE seconds
+    old) is returned immediately and refreshed on a background thread instead, and with
+    ``revalidate`` every entry is revalidated regardless of its age.
+    ``source`` is one of ``cache``, ``stale``, ``revalidated``, ``network`` or ``shared``.
+
+    Concurrent processes are single-flighted through a lock file: one revalidates while
+    the others wait and then reuse the entry it stored (source ``shared``).
+    """
+    cache = ReleaseMetadataCache()
+    entry = cache.get(api_url)
+    if entry and not revalidate:
+        age = time.time() - entry.get("fetched_at", 0)
+        if use_cache and age < _env_seconds("SPECIFY_RELEASE_TTL", DEFAULT_RELEASE_TTL):
+            return entry["body"], "cache"
+        if use_cache and stale_while_revalidate and age < _env_seconds("SPECIFY_RELEASE_MAX_STALE", DEFAULT_RELEASE_MAX_STALE):
+            _refresh_in_background(client, api_url, cache, entry, github_token=github_token)
+            return entry["body"], "stale"
+    if not use_cache:
+        release_data = _revalidate_release_metadata(client, api_url, cache, entry, github_token=github_token, timeout=timeout, debug=debug)
+        return release_data, ("revalidated" if entry and release_data is entry["body"] else "network")
+
+    with cache.lock(api_url):
+        # Whoever held the lock has just stored a newer entry than the one we read
+        shared = cache.get(api_url)
+        if shared and shared.get("fetched_at", 0) > (entry or {}).get("fetched_at", 0):
+            return shared["body"], "shared"
+        release_data = _revalidate_release_metadata(client, api_url, cache, entry, github_token=github_token, timeout=timeout, debug=debug)
+    return release_data, ("revalidated" if entry and release_data is entry["body"] else "network")
+
+SPOOL_MAX_SIZE = 32 * 1024 * 1024
+
+def _spool_dir() -> Optional[str]:
+    """Directory for download buffers that outgrow memory (the cache dir, or the system temp dir)."""
+    spool_dir = _cache_root() / "downloads"
+    try:
+        spool_dir.mkdir(parents=True, exist_ok=True)
+        return str(spool_dir)
+    except OSError:
+        return None
+
+DOWNLOAD_ATTEMPTS = 4
+RETRY_BACKOFF_BASE = 1.0
+RETRY_BACKOFF_MAX = 30.0
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+def _partial_download_paths(asset_name: str) -> Optional[Tuple[Path, Path]]:
+    """Return (data, meta) paths for a persisted partial download, or None if no spool dir is usable."""
+    spool_dir = _spool_dir()
+    if spool_dir is None:
+        return None
+    base = Path(spool_dir) / f"{asset_name}.part"
+    return base, base.with_name(f"{base.name}.json")
+
+def _load_partial_download(asset_name: str, url: str, sink: BinaryIO, digest) -> Tuple[int, Optional[str]]:
+    """Copy a previously persisted partial download into ``sink``; return (bytes restored, validator)."""
+    paths = _partial_download_paths(asset_name)
+    if not paths:
+        return 0, None
+    data_path, meta_path = paths
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("url") != url or not meta.get("validator"):
+            raise ValueError("stale partial download")
+        with open(data_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                sink.write(chunk)
+                digest.update(chunk)
+        return sink.tell(), meta["validator"]
+    except (OSError, ValueError, json.JSONDecodeError):
+        sink.seek(0)
+        sink.truncate()
+        _discard_partial_download(asset_name)
+        return 0, None
+
+def _save_partial_download(asset_name: str, url: str, sink: BinaryIO, validator: Optional[str]) -> None:
+    """Persist the bytes received so far together with their validator so a later run can resume."""
+    paths = _partial_download_paths(asset_name)
+    if not paths or not validator or sink.tell() == 0:
+        return
+    data_path, meta_path = paths
+    try:
+        sink.seek(0)
+        with open(data_path, "wb") as f:
+            shutil.copyfileobj(sink, f, 1024 * 1024)
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump({"url": url, "validator": validator, "size": data_path.stat().st_size}, f)
+    except OSError:
+        _discard_partial_download(asset_name)
+
+def _discard_partial_download(asset_name: str) -> None:
+    paths = _partial_download_paths(asset_name)
+    if paths:
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+def _retry_delay(attempt: int, headers: httpx.Headers | None = None) -> float:
+    """Exponential backoff, overridden by a Retry-After header when the server sends one."""
+    if headers is not None:
+        retry_after = _parse_rate_limit_headers(headers).get("retry_after_seconds")
+        if retry_after is not None:
+            return float(max(0, retry_after))
+    return min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * (2 ** attempt))
+
+def _download_asset(client: httpx.Client, url: str, sink: BinaryIO, *, asset_name: str, github_token: str = None, show_progress: bool = True, debug: bool = False, attempts: int = DOWNLOAD_ATTEMPTS) -> str:
+    """Stream ``url`` into ``sink`` with resume support; return the SHA-256 hex digest of the full body.
+
+    Interrupted transfers are retried up to ``attempts`` times with exponential backoff
+    (honouring Retry-After), resuming with ``Range``/``If-Range`` when the server sent an
+    ETag or Last-Modified validator. If every attempt fails, the received bytes are kept
+    under the cache's downloads directory and the next run resumes from them.
+    """
+    import httpx
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+
+    digest = hashlib.sha256()
+    offset, validator = _load_partial_download(asset_name, url, sink, digest)
+    total_size = 0
+    last_error: Exception | None = None
+
+    progress = None
+    if show_progress:
+        progress = Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+            console=console,
+        )
+
+    try:
+        task = None
+        for attempt in range(attempts):
+            headers = _github_auth_headers(github_token, url)
+            if offset and validator:
+                headers["Range"] = f"bytes={offset}-"
+                headers["If-Range"] = validator
+            try:
+                with client.stream("GET", url, timeout=60, follow_redirects=True, headers=headers) as response:
+                    status = response.status_code
+                    if status in RETRYABLE_STATUS or (status == 403 and "Retry-After" in response.headers):
+                        last_error = RuntimeError(_format_rate_limit_error(status, response.headers, url))
+                        if attempt + 1 < attempts:
+                            time.sleep(_retry_delay(attempt, response.headers))
+                        continue
+                    if status == 416:
+                        # Persisted bytes no longer line up with the asset; start over
+                        sink.seek(0)
+                        sink.truncate()
+                        digest = hashlib.sha256()
+                        offset, validator = 0, None
+                        continue
+                    if status not in (200, 206):
+                        # Handle rate-limiting on download as well
+                        error_msg = _format_rate_limit_error(status, response.headers, url)
+                        if debug:
+                            error_msg += f"\n\n[dim]Response body (truncated 400):[/dim]\n{response.read()[:400].decode('utf-8', 'replace')}"
+                        raise RuntimeError(error_msg)
+
+                    content_range = response.headers.get("Content-Range", "")
+                    if status == 206 and content_range.startswith(f"bytes {offset}-"):
+                        total_size = int(content_range.rsplit("/", 1)[-1]) if not content_range.endswith("/*") else 0
+                    else:
+                        # Full body: the server ignored the range or the validator changed
+                        sink.seek(0)
+                        sink.truncate()
+                        digest = hashlib.sha256()
+                        offset = 0
+                        total_size = int(response.headers.get("content-length", 0))
+                    validator = response.headers.get("ETag") or response.headers.get("Last-Modified") or validator
+
+                    if progress is not None and total_size:
+                        if task is None:
+                            progress.start()
+                            task = progress.add_task("Downloading...", total=total_size)
+                        progress.update(task, total=total_size, completed=offset)
+                    for chunk in response.iter_bytes(chunk_size=8192):
+                        sink.write(chunk)
+                        digest.update(chunk)
+                        offset += len(chunk)
+                        if task is not None:
+                            progress.update(task, completed=offset)
+                _discard_partial_download(asset_name)
+                return digest.hexdigest()
+            except httpx.TransportError as e:
+                last_error = e
+                offset = sink.tell()
+                if attempt + 1 < attempts:
+                    time.sleep(_retry_delay(attempt))
+    finally:
+        if progress is not None:
+            progress.stop()
+
+    _save_partial_download(asset_name, url, sink, validator)
+    raise RuntimeError(f"Download failed after {attempts} attempts: {last_error}")
+
+REMOTE_ZIP_TAIL = 64 * 1024
+REMOTE_ZIP_READAHEAD = 64 * 1024
+REMOTE_ZIP_GAP = 16 * 1024
+
+class RemoteZipReader(io.RawIOBase):
+    """Seekable, read-only view of a remote zip archive backed by HTTP Range requests.
+
+    Opened by open_remote_archive with the archive tail (end-of-central-directory record
+    and, for template-sized archives, the whole central directory) already in memory, so
+    zipfile.ZipFile can list the archive without another request. Entry data is fetched
+    on demand, or in coalesced batches via prefetch. Each range request carries the
+    validator of the first response, so a changed asset fails instead of mixing bytes.
+    """
+
+    def __init__(self, client: httpx.Client, url: str, size: int, tail: bytes, *, headers: dict, validator: str | None = None):
+        super().__init__()
+        self._client = client
+        self._url = url
+        self._size = size
+        self._headers = headers
+        self._validator = validator
+        self._segments: list[Tuple[int, bytes]] = [(size - len(tail), tail)]
+        self._pos = 0
+        self.requests = 1
+        self.fetched = len(tail)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: self._size}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def readinto(self, buffer) -> int:
+        n = min(len(buffer), self._size - self._pos)
+        if n <= 0:
+            return 0
+        data = self._read_at(self._pos, n)
+        buffer[:len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+    def _cached(self, start: int, end: int) -> Optional[bytes]:
+        """Bytes [start, end) stitched from fetched segments, or None if any of them is missing."""
+        out = bytearray()
+        pos = start
+        for seg_start, data in self._segments:
+            if seg_start <= pos < seg_start + len(data):
+                piece = data[pos - seg_start:end - seg_start]
+                out += piece
+                pos += len(piece)
+                if pos >= end:
+                    return bytes(out)
+        return None
+
+    def _gaps(self, start: int, end: int) -> list[Tuple[int, int]]:
+        """Sub-ranges of [start, end) not covered by fetched segments."""
+        gaps = []
+        pos = start
+        for seg_start, data in self._segments:
+            seg_end = seg_start + len(data)
+            if seg_end <= pos:
+                continue
+            if seg_start >= end:
+                break
+            if seg_start > pos:
+                gaps.append((pos, seg_start))
+            pos = max(pos, seg_end)
+        if pos < end:
+            gaps.append((pos, end))
+        return gaps
+
+    def _read_at(self, start: int, n: int) -> bytes:
+        data = self._cached(start, start + n)
+        if data is None:
+            for gap_start, gap_end in self._gaps(start, min(self._size, start + max(n, REMOTE_ZIP_READAHEAD))):
+                self._fetch(gap_start, gap_end)
+            data = self._cached(start, start + n)
+        return data
+
+    def _fetch(self, start: int, end: int) -> None:
+        headers = dict(self._headers, Range=f"bytes={start}-{end - 1}")
+        if self._validator:
+            headers["If-Range"] = self._validator
+        response = self._client.get(self._url, timeout=60, follow_redirects=True, headers=headers)
+        if response.status_code != 206 or not response.headers.get("Content-Range", "").startswith(f"bytes {start}-"):
+            raise RuntimeError(f"Range request for bytes {start}-{end - 1} failed (HTTP {response.status_code}); the asset may have changed")
+        data = response.content
+        if len(data) != end - start:
+            raise RuntimeError(f"Range request for bytes {start}-{end - 1} returned {len(data)} bytes")
+        bisect.insort(self._segments, (start, data))
+        self.requests += 1
+        self.fetched += len(data)
+
+    def prefetch(self, zip_ref: zipfile.ZipFile, infos: list[zipfile.ZipInfo]) -> None:
+        """Fetch the local headers and data of ``infos`` in as few range requests as possible.
+
+        Each entry spans from its local header to the next entry (or the central
+        directory); spans closer than REMOTE_ZIP_GAP are merged into one request.
+        """
+        offsets = sorted({info.header_offset for info in zip_ref.infolist()} | {zip_ref.start_dir})
+        ends = dict(zip(offsets, offsets[1:]))
+        spans = sorted((info.header_offset, ends[info.header_offset]) for info in infos)
+        merged: list[list[int]] = []
+        for start, end in spans:
+            if merged and start - merged[-1][1] <= REMOTE_ZIP_GAP:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        for start, end in merged:
+            for gap_start, gap_end in self._gaps(start, end):
+                self._fetch(gap_start, gap_end)
+
+def open_remote_archive(client: httpx.Client, asset: dict, *, github_token: str = None) -> Optional[RemoteZipReader]:
+    """Open a release asset as a RemoteZipReader, or return None if the server cannot serve byte ranges.
+
+    One request fetches the last REMOTE_ZIP_TAIL bytes. A server that ignores ``Range``
+    is detected from the status line and the response is closed before its body is read,
+    so the caller's fallback full download does not pay for the probe.
+    """
+    import httpx
+
+    size = asset["size"]
+    start = max(0, size - REMOTE_ZIP_TAIL)
+    headers = _github_auth_headers(github_token, asset["browser_download_url"])
+    try:
+        with client.stream("GET", asset["browser_download_url"], timeout=60, follow_redirects=True, headers=dict(headers, Range=f"bytes={start}-")) as response:
+            if response.status_code != 206 or response.headers.get("Content-Range", "") != f"bytes {start}-{size - 1}/{size}":
+                return None
+            tail = response.read()
+            url = response.url
+            validator = response.headers.get("ETag") or response.headers.get("Last-Modified")
+    except httpx.HTTPError:
+        return None
+    if len(tail) != size - start:
+        return None
+    if url.host != httpx.URL(asset["browser_download_url"]).host:
+        headers = {}  # Signed redirect target (e.g. release storage); it must not receive the token
+    return RemoteZipReader(client, str(url), size, tail, headers=headers, validator=validator)
+
+DEFAULT_API_BASE = "https://api.github.com"
+DEFAULT_DOWNLOAD_BASE = "https://github.com"
+MIRROR_ATTEMPT_DELAY = 0.25
+
+_selected_source: Optional[Tuple[str, Optional[str]]] = None
+
+def _release_sources() -> list[Tuple[str, Optional[str]]]:
+    """Ordered (API base, download base) pairs that can serve the template releases.
+
+    Mirrors from SPEC_KIT_MIRRORS (comma- or space-separated base URLs) come first, in
+    order; each serves the API path and the release download path under one base URL.
+    The primary source (SPEC_KIT_API_BASE and SPEC_KIT_DOWNLOAD_BASE) comes last. A
+    download base of None keeps asset URLs as the release publishes them.
+    """
+    mirrors = [mirror.rstrip("/") for mirror in os.getenv("SPEC_KIT_MIRRORS", "").replace(",", " ").split()]
+    api_base = (os.getenv("SPEC_KIT_API_BASE", "").strip() or DEFAULT_API_BASE).rstrip("/")
+    download_base = os.getenv("SPEC_KIT_DOWNLOAD_BASE", "").strip().rstrip("/") or None
+    return list(dict.fromkeys([(mirror, mirror) for mirror in mirrors] + [(api_base, download_base)]))
+
+def _token_host(url: str) -> bool:
+    """Whether ``url`` is on GitHub or a configured primary release host (which may receive the token)."""
+    from urllib.parse import urlsplit
+
+    hosts = {urlsplit(DEFAULT_API_BASE).netloc, urlsplit(DEFAULT_DOWNLOAD_BASE).netloc}
+    api_base, download_base = _release_sources()[-1]
+    hosts.update(urlsplit(base).netloc for base in (api_base, download_base) if base)
+    return urlsplit(url).netloc in hosts
+
+def _latest_release_api_url(api_base: str | None = None) -> str:
+    """Return the /releases/latest API URL for the configured template repository."""
+    # Support custom repository via environment variables for testing and enterprise use
+    repo_owner = os.getenv("SPEC_KIT_REPO_OWNER", "github")
+    repo_name = os.getenv("SPEC_KIT_REPO_NAME", "spec-kit")
+    return f"{api_base or _release_sources()[-1][0]}/repos/{repo_owner}/{repo_name}/releases/latest"
+
+def _rewrite_asset_urls(release_data: dict, download_base: str | None) -> dict:
+    """Point each asset's download URL at ``download_base``, keeping the <owner>/<repo>/releases/download/... path."""
+    if not download_base:
+        return release_data
+    from urllib.parse import urlsplit
+
+    assets = [
+        dict(asset, browser_download_url=download_base + urlsplit(asset["browser_download_url"]).path)
+        for asset in release_data.get("assets", [])
+    ]
+    return dict(release_data, assets=assets)
+
+def _race_sources(sources: list, attempt, *, delay: float = MIRROR_ATTEMPT_DELAY):
+    """Run ``attempt(source)`` over ``sources`` happy-eyeballs style and return (source, result) of the first success.
+
+    The next source starts when the previous one fails or has not answered within
+    ``delay`` seconds; slower attempts keep running on daemon threads and are ignored.
+    Raises RuntimeError listing every failure if no source succeeds.
+    """
+    import queue
+
+    results: queue.Queue = queue.Queue()
+
+    def run(source) -> None:
+        try:
+            results.put((source, attempt(source), None))
+        except Exception as e:
+            results.put((source, None, e))
+
+    errors: list[str] = []
+    started = pending = 0
+    start_next = True
+    while True:
+        if start_next and started < len(sources):
+            threading.Thread(target=run, args=(sources[started],), name="specify-mirror-race", daemon=True).start()
+            started += 1
+            pending += 1
+        if not pending:
+            break
+        try:
+            source, result, error = results.get(timeout=delay if started < len(sources) else None)
+        except queue.Empty:
+            start_next = True  # too slow: give the next source a head start
+            continue
+        pending -= 1
+        if error is None:
+            return source, result
+        errors.append(f"{source[0]}: {error}")
+        start_next = True
+    raise RuntimeError("No release source answered:\n" + "\n".join(errors))
+
+def fetch_latest_release_data(client: httpx.Client, *, github_token: str = None, timeout: float = 30, debug: bool = False, use_cache: bool = True, stale_while_revalidate: bool = False, revalidate: bool = False) -> Tuple[dict, str]:
+    """Return ``(release_json, source)`` for the latest release from the configured sources (see fetch_release_metadata).
+
+    With mirrors configured, the first lookup races the sources (see _race_sources) and
+    the fastest healthy one is kept for the rest of the session. Asset URLs are rewritten
+    to that source's download base, so the archives come from the same mirror.
+    """
+    global _selected_source
+
+    def attempt(source: Tuple[str, Optional[str]]) -> Tuple[dict, str]:
+        api_base, download_base = source
+        release_data, release_source = fetch_release_metadata(
+            client,
+            _latest_release_api_url(api_base),
+            github_token=github_token,
+            timeout=timeout,
+            debug=debug,
+            use_cache=use_cache,
+            stale_while_revalidate=stale_while_revalidate,
+            revalidate=revalidate,
+        )
+        return _rewrite_asset_urls(release_data, download_base), release_source
+
+    sources = [_selected_source] if _selected_source else _release_sources()
+    if len(sources) == 1:
+        result = attempt(sources[0])
+        _selected_source = sources[0]
+        return result
+    _selected_source, result = _race_sources(sources, attempt)
+    return result
+
+def _release_source_note() -> Optional[str]:
+    """'via <host>' when the release was resolved from somewhere other than api.github.com."""
+    if _selected_source and _selected_source[0] != DEFAULT_API_BASE:
+        from urllib.parse import urlsplit
+
+        return f"via {urlsplit(_selected_source[0]).netloc}"
+    return None
+
+def fetch_latest_release(client: httpx.Client, *, verbose: bool = True, debug: bool = False, github_token: str = None, use_cache: bool = True, revalidate: bool = False) -> Tuple[dict, str]:
+    """Return (release_json, source) for the latest template release, exiting with a panel on failure.
+
+    ``revalidate`` asks the server even when the cached metadata is within its TTL.
+    """
+    if verbose:
+        console.print("[cyan]Fetching latest release information...[/cyan]")
+    try:
+        release_data, release_source = fetch_latest_release_data(
+            client,
+            github_token=github_token,
+            timeout=30,
+            debug=debug,
+            use_cache=use_cache,
+            revalidate=revalidate,
+        )
+        if verbose and release_source != "network":
+            console.print(f"[cyan]Release metadata:[/cyan] {release_source}")
+        if verbose and _release_source_note():
+            console.print(f"[cyan]Release source:[/cyan] {_selected_source[0]}")
+    except Exception as e:
+        console.print(f"[red]Error fetching release information[/red]")
+        console.print(Panel(str(e), title="Fetch Error", border_style="red"))
+        raise typer.Exit(1)
+    return release_data, release_source
+
+def select_template_asset(release_data: dict, ai_assistant: str, script_type: str, manifest: dict | None = None) -> dict:
+    """Return the release asset for an agent/script pair, exiting with the asset list if none matches.
+
+    With an asset manifest (see fetch_release_manifest) the asset is looked up by name;
+    otherwise the release assets are scanned for the template name pattern.
+    """
+    assets = release_data.get("assets", [])
+    pattern = f"spec-kit-template-{ai_assistant}-{script_type}"
+    asset = None
+    if manifest:
+        asset_name = manifest["variants"].get(f"{ai_assistant}-{script_type}")
+        asset = next((a for a in assets if a["name"] == asset_name), None) if asset_name else None
+    else:
+        matching_assets = [
+            asset for asset in assets
+            if pattern in asset["name"] and asset["name"].endswith(".zip")
+        ]
+        asset = matching_assets[0] if matching_assets else None
+
+    if asset is None:
+        console.print(f"[red]No matching release asset found[/red] for [bold]{ai_assistant}[/bold] (expected pattern: [bold]{pattern}[/bold])")
+        asset_names = [a.get('name', '?') for a in assets]
+        console.print(Panel("\n".join(asset_names) or "(no assets)", title="Available Assets", border_style="yellow"))
+        raise typer.Exit(1)
+    return asset
+
+CHECKSUMS_ASSET_PREFIX = "spec-kit-template-checksums-"
+MANIFEST_ASSET_PREFIX = "spec-kit-template-manifest-"
+
+def _parse_checksums(text: str) -> dict[str, str]:
+    """Parse ``sha256sum`` output (``<hex>  <name>`` per line) into {asset name: digest}."""
+    checksums = {}
+    for line in text.splitlines():
+        parts = line.split()
+        if len(parts) >= 2 and len(parts[0]) == 64:
+            checksums[parts[-1].lstrip("*")] = parts[0].lower()
+    return checksums
+
+def _fetch_release_sidecar(client: httpx.Client, release_data: dict, prefix: str, suffix: str, parse, *, title: str, github_token: str = None, use_cache: bool = True):
+    """Fetch and parse a small metadata asset published next to the templates, or return None if the release has none.
+
+    Exits with a panel if the asset is published but cannot be fetched, so templates are
+    never silently accepted unverified. These assets are immutable per release and are
+    cached on disk alongside the release metadata.
+    """
+    sidecar = next(
+        (a for a in release_data.get("assets", []) if a.get("name", "").startswith(prefix) and a["name"].endswith(suffix)),
+        None,
+    )
+    if sidecar is None:
+        return None
+    url = sidecar["browser_download_url"]
+    cache = ReleaseMetadataCache() if use_cache else None
+    entry = cache.get(url) if cache else None
+    if entry:
+        return entry["body"]
+    with cache.lock(url) if cache else contextlib.nullcontext():
+        entry = cache.get(url) if cache else None
+        if entry:
+            return entry["body"]
+        try:
+            response = client.get(url, timeout=30, follow_redirects=True, headers=_github_auth_headers(github_token, url))
+            if response.status_code != 200:
+                raise RuntimeError(_format_rate_limit_error(response.status_code, response.headers, url))
+            body = parse(response.text)
+        except Exception as e:
+            console.print(f"[red]Error fetching {title.lower()}[/red]")
+            console.print(Panel(str(e), title=f"{title} Error", border_style="red"))
+            raise typer.Exit(1)
+        if cache:
+            cache.put(url, body, response.headers)
+    return body
+
+def fetch_release_checksums(client: httpx.Client, release_data: dict, *, github_token: str = None, debug: bool = False, use_cache: bool = True) -> Optional[dict[str, str]]:
+    """Return {asset name: SHA-256} from the release's checksum file, or None if it has none."""
+    return _fetch_release_sidecar(client, release_data, CHECKSUMS_ASSET_PREFIX, ".txt", _parse_checksums, title="Checksum Manifest", github_token=github_token, use_cache=use_cache)
+
+def fetch_release_manifest(client: httpx.Client, release_data: dict, *, github_token: str = None, debug: bool = False, use_cache: bool = True) -> Optional[dict]:
+    """Return the release's asset manifest, or None for releases published without one.
+
+    The manifest maps ``"<agent>-<script>"`` to an asset name under ``variants`` and
+    lists each asset's size, SHA-256 and entries (path, size, sha256, mode) under ``assets``.
+    """
+    def parse(text: str) -> dict:
+        manifest = json.loads(text)
+        if not isinstance(manifest.get("variants"), dict) or not isinstance(manifest.get("assets"), dict):
+            raise ValueError("Malformed asset manifest")
+        return manifest
+
+    return _fetch_release_sidecar(client, release_data, MANIFEST_ASSET_PREFIX, ".json", parse, title="Asset Manifest", github_token=github_token, use_cache=use_cache)
+
+def resolve_release_assets(client: httpx.Client, release_data: dict, variants: list[Tuple[str, str]], *, github_token: str = None, debug: bool = False, use_cache: bool = True) -> Tuple[list[dict], Optional[dict[str, str]], Optional[dict]]:
+    """Pick the asset for each (agent, script) pair and load the digests to verify them against.
+
+    Returns (assets, checksums, manifest). With an asset manifest, assets are looked up by
+    variant directly and its digests are used; otherwise assets are found by name pattern
+    and digests come from the checksum file, if the release has one.
+    """
+    manifest = fetch_release_manifest(client, release_data, github_token=github_token, debug=debug, use_cache=use_cache)
+    assets = [select_template_asset(release_data, agent, script, manifest=manifest) for agent, script in variants]
+    return assets, _release_digests(client, release_data, manifest, github_token=github_token, debug=debug, use_cache=use_cache), manifest
+
+def _release_digests(client: httpx.Client, release_data: dict, manifest: dict | None, *, github_token: str = None, debug: bool = False, use_cache: bool = True) -> Optional[dict[str, str]]:
+    """Asset name -> SHA-256 from the asset manifest, or from the checksum file for releases without one."""
+    if manifest:
+        return {name: info["sha256"] for name, info in manifest["assets"].items() if info.get("sha256")}
+    return fetch_release_checksums(client, release_data, github_token=github_token, debug=debug, use_cache=use_cache)
+
+LAYER_BASE_PREFIX = "spec-kit-base-"
+LAYER_OVERLAY_PREFIX = "spec-kit-overlay-"
+
+def select_template_layers(release_data: dict, ai_assistant: str, script_type: str, manifest: dict | None = None) -> list[dict]:
+    """Return the release assets that compose an agent/script template, in extraction order.
+
+    Layered releases (manifest ``layers``) ship a shared base archive per script type
+    plus a small overlay per agent; older releases ship one full archive per variant.
+    """
+    names = (manifest or {}).get("layers", {}).get(f"{ai_assistant}-{script_type}")
+    if names:
+        by_name = {asset["name"]: asset for asset in release_data.get("assets", [])}
+        if all(name in by_name for name in names):
+            return [by_name[name] for name in names]
+    return [select_template_asset(release_data, ai_assistant, script_type, manifest=manifest)]
+
+def resolve_release_layers(client: httpx.Client, release_data: dict, variants: list[Tuple[str, str]], *, github_token: str = None, debug: bool = False, use_cache: bool = True) -> Tuple[list[list[dict]], Optional[dict[str, str]], Optional[dict]]:
+    """Like resolve_release_assets, but each variant resolves to its layers (see select_template_layers)."""
+    manifest = fetch_release_manifest(client, release_data, github_token=github_token, debug=debug, use_cache=use_cache)
+    layers = [select_template_layers(release_data, agent, script, manifest=manifest) for agent, script in variants]
+    return layers, _release_digests(client, release_data, manifest, github_token=github_token, debug=debug, use_cache=use_cache), manifest
+
+def _layer_label(asset_name: str, tag: str) -> str:
+    """Short label for a shared layer asset, e.g. ``base-sh`` for spec-kit-base-sh-<tag>.zip."""
+    return asset_name.removeprefix("spec-kit-").removesuffix(f"-{tag}.zip")
+
+def fetch_template_asset(client: httpx.Client, release_data: dict, asset: dict, *, release_source: str = "network", verbose: bool = True, show_progress: bool = True, debug: bool = False, github_token: str = None, use_cache: bool = True, checksums: dict[str, str] | None = None, remote: bool = False) -> Tuple[Path | BinaryIO, dict]:
+    """Fetch one release asset from the template cache or the network.
+
+    Returns (archive, metadata). On a cache hit ``archive`` is the cached blob path.
+    Otherwise the response is streamed into an in-memory buffer (spilling to the cache
+    directory above SPOOL_MAX_SIZE) and hashed on the fly; ``archive`` is that buffer,
+    rewound and ready for zipfile.ZipFile. Safe to call from worker threads.
+
+    With ``checksums`` (see fetch_release_checksums) the streamed digest must match the
+    published one or the asset is refused, and a cached blob with that digest is reused
+    even if it was downloaded for another release.
+
+    With ``remote``, an asset that is not cached is not downloaded at all: ``archive`` is
+    a RemoteZipReader (metadata ``remote``) that fetches only the entries a caller reads,
+    for callers that need a few files. Servers without range support fall back to the
+    full download. The archive checksum cannot be verified for a partial read.
+
+    Downloads into the cache are single-flighted across processes: while one process
+    downloads an asset, others requesting it wait on a lock file and then use the
+    cached blob (metadata ``shared``) instead of downloading it again.
+    """
+    download_url = asset["browser_download_url"]
+    filename = asset["name"]
+    file_size = asset["size"]
+    expected_sha256 = checksums.get(filename) if checksums else None
+
+    if verbose:
+        console.print(f"[cyan]Found template:[/cyan] {filename}")
+        console.print(f"[cyan]Size:[/cyan] {file_size:,} bytes")
+        console.print(f"[cyan]Release:[/cyan] {release_data['tag_name']}")
+
+    metadata = {
+        "filename": filename,
+        "size": file_size,
+        "release": release_data["tag_name"],
+        "asset_url": download_url,
+        "release_source": release_source,
+        "cached": False,
+        "cache_hit": False,
+        "verified": False,
+    }
+
+    cache = TemplateCache() if use_cache else None
+
+    def lookup_cached() -> Optional[Path]:
+        cached_path = cache.lookup(release_data["tag_name"], filename, expected_size=file_size)
+        if cached_path and expected_sha256 and cached_path.stem != expected_sha256:
+            cached_path = None  # Indexed under this name but not the published content
+        if not cached_path and expected_sha256:
+            cached_path = cache.lookup_digest(expected_sha256)
+            if cached_path:
+                cache.link(release_data["tag_name"], filename, expected_sha256)
+        if cached_path:
+            if verbose:
+                console.print(f"[cyan]Using cached template:[/cyan] {cached_path}")
+            metadata.update(cached=True, cache_hit=True, sha256=cached_path.stem, verified=bool(expected_sha256))
+        return cached_path
+
+    if cache and (cached_path := lookup_cached()):
+        return cached_path, metadata
+
+    if remote:
+        reader = open_remote_archive(client, asset, github_token=github_token)
+        if reader is not None:
+            if verbose:
+                console.print(f"[cyan]Reading template entries with range requests[/cyan]")
+            metadata.update(remote=True, in_memory=True)
+            return reader, metadata
+
+    with cache.download_lock(filename, on_wait=_announce_wait(filename) if verbose else None) if cache else contextlib.nullcontext() as lock:
+        # Whoever held the lock may have just cached this asset
+        if lock and (cached_path := lookup_cached()):
+            metadata["shared"] = True
+            return cached_path, metadata
+        return _download_template_asset(client, download_url, metadata, cache, expected_sha256=expected_sha256, verbose=verbose, show_progress=show_progress, debug=debug, github_token=github_token)
+
+def _announce_wait(filename: str):
+    return lambda: console.print(f"[cyan]Waiting for another specify process to download {filename}...[/cyan]")
+
+def _download_template_asset(client: httpx.Client, download_url: str, metadata: dict, cache: TemplateCache | None, *, expected_sha256: str | None, verbose: bool, show_progress: bool, debug: bool, github_token: str = None) -> Tuple[BinaryIO, dict]:
+    """Download an asset into a spooled buffer, verify it and publish it into the cache (see fetch_template_asset)."""
+    filename = metadata["filename"]
+    if verbose:
+        console.print(f"[cyan]Downloading template...[/cyan]")
+
+    import tempfile
+
+    buffer = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE, dir=_spool_dir())
+    try:
+        sha256 = _download_asset(
+            client,
+            download_url,
+            buffer,
+            asset_name=filename,
+            github_token=github_token,
+            show_progress=show_progress,
+            debug=debug,
+        )
+        if expected_sha256 and sha256 != expected_sha256:
+            raise RuntimeError(
+                f"Checksum mismatch for {filename}: expected SHA-256 {expected_sha256}, got {sha256}. "
+                "The download was discarded."
+            )
+        buffer.seek(0)
+    except Exception as e:
+        buffer.close()
+        console.print(f"[red]Error downloading template[/red]")
+        console.print(Panel(str(e), title="Download Error", border_style="red"))
+        raise typer.Exit(1)
+    if verbose:
+        console.print(f"Downloaded: {filename}" + (" (SHA-256 verified)" if expected_sha256 else ""))
+    metadata["sha256"] = sha256
+    metadata["verified"] = bool(expected_sha256)
+
+    if cache:
+        try:
+            cache.store(metadata["release"], filename, buffer, sha256)
+        except OSError as e:
+            # A read-only or full cache directory must never break init
+            if verbose:
+                console.print(f"[yellow]Warning:[/yellow] could not cache template: {e}")
+
+    metadata["in_memory"] = True
+    return buffer, metadata
+
+def download_template_from_github(ai_assistant: str, download_dir: Path | None = None, *, script_type: str = "sh", verbose: bool = True, show_progress: bool = True, client: httpx.Client = None, debug: bool = False, github_token: str = None, use_cache: bool = True) -> Tuple[Path | BinaryIO, dict]:
+    """Resolve the latest template asset for an agent/script pair and fetch it.
+
+    Returns (archive, metadata) as described in fetch_template_asset. If ``download_dir``
+    is given, a downloaded archive is also written there and its path returned.
+    """
+    if client is None:
+        client = http_session.client()
+
+    release_data, release_source = fetch_latest_release(client, verbose=verbose, debug=debug, github_token=github_token, use_cache=use_cache)
+    (asset,), checksums, _ = resolve_release_assets(client, release_data, [(ai_assistant, script_type)], github_token=github_token, debug=debug, use_cache=use_cache)
+    archive, metadata = fetch_template_asset(
+        client,
+        release_data,
+        asset,
+        release_source=release_source,
+        verbose=verbose,
+        show_progress=show_progress,
+        debug=debug,
+        github_token=github_token,
+        use_cache=use_cache,
+        checksums=checksums,
+    )
+
+    if download_dir is not None and metadata.get("in_memory"):
+        zip_path = Path(download_dir) / metadata["filename"]
+        with archive, open(zip_path, "wb") as f:
+            shutil.copyfileobj(archive, f, 1024 * 1024)
+        metadata.pop("in_memory")
+        return zip_path, metadata
+    return archive, metadata
+
+def resolve_local_template(ai_assistant: str, script_type: str, *, template_archive: Path | None = None, verbose: bool = True) -> Tuple[Path, dict]:
+    """Resolve a template without the network: a local zip, an unpacked directory, or the template cache.
+
+    Returns (path, metadata) in the same shape as download_template_from_github. Local
+    archives and cached blobs are never deleted by the caller.
+    """
+    import zipfile
+
+    metadata = {
+        "asset_url": None,
+        "release_source": "local",
+        "cached": False,
+        "cache_hit": False,
+        "local": True,
+    }
+
+    if template_archive is not None:
+        archive_path = Path(template_archive).expanduser().resolve()
+        if archive_path.is_dir():
+            size = sum(f.stat().st_size for f in archive_path.rglob("*") if f.is_file())
+        elif archive_path.is_file() and zipfile.is_zipfile(archive_path):
+            size = archive_path.stat().st_size
+        else:
+            console.print("[red]Invalid template archive[/red]")
+            console.print(Panel(f"{archive_path}\n\nExpected a template .zip file or an unpacked template directory.", title="Template Error", border_style="red"))
+            raise typer.Exit(1)
+
+        tag_prefix = f"spec-kit-template-{ai_assistant}-{script_type}-"
+        release = archive_path.stem[len(tag_prefix):] if archive_path.stem.startswith(tag_prefix) else "local"
+        if verbose:
+            console.print(f"[cyan]Using local template:[/cyan] {archive_path}")
+        metadata.update(filename=archive_path.name, size=size, release=release)
+        return archive_path, metadata
+
+    pattern = f"spec-kit-template-{ai_assistant}-{script_type}-"
+    cache = TemplateCache()
+    entry = cache.latest(pattern)
+    # The blob may be pruned or deleted between choosing the entry and looking it up
+    cached_path = cache.lookup(entry["tag"], entry["asset"]) if entry else None
+    if cached_path is None:
+        console.print(f"[red]No cached template found[/red] for [bold]{ai_assistant}[/bold] ({script_type}) in offline mode")
+        console.print(Panel(
+            f"Cache directory: {cache.root}\n\n"
+            "Run [cyan]specify init[/cyan] once with network access to populate the cache,\n"
+            "or pass [cyan]--template-archive PATH[/cyan] with a downloaded template zip or directory.",
+            title="Offline Template Error",
+            border_style="red",
+        ))
+        raise typer.Exit(1)
+
+    if verbose:
+        console.print(f"[cyan]Using cached template:[/cyan] {entry['asset']} ({entry['tag']})")
+    metadata.update(filename=entry["asset"], size=entry["size"], release=entry["tag"], release_source="offline cache", cached=True, cache_hit=True, sha256=entry["sha256"])
+    return cached_path, metadata
+
+def resolve_local_layers(ai_assistant: str, script_type: str, *, verbose: bool = True) -> list[Tuple[str, Tuple[Path, dict]]]:
+    """Offline counterpart of select_template_layers: the archives of the newest cached template.
+
+    A cached base + overlay pair of one release is used when it is at least as recent as
+    the newest cached full template; otherwise resolve_local_template decides. Returns
+    ``(label, (path, metadata))`` per layer, labelled as in fetch_template_archives.
+    """
+    label = f"{ai_assistant}-{script_type}"
+    cache = TemplateCache()
+    overlay = cache.latest(f"{LAYER_OVERLAY_PREFIX}{label}-")
+    full = cache.latest(f"spec-kit-template-{label}-")
+    if overlay and (full is None or overlay.get("added", 0) >= full.get("added", 0)):
+        tag = overlay["tag"]
+        base_name = f"{LAYER_BASE_PREFIX}{script_type}-{tag}.zip"
+        base_path = cache.lookup(tag, base_name)
+        overlay_path = cache.lookup(tag, overlay["asset"])
+        if base_path and overlay_path:
+            layers = []
+            for layer_label, name, path in ((_layer_label(base_name, tag), base_name, base_path), (label, overlay["asset"], overlay_path)):
+                if verbose:
+                    console.print(f"[cyan]Using cached template:[/cyan] {name} ({tag})")
+                layers.append((layer_label, (path, {
+                    "filename": name,
+                    "size": path.stat().st_size,
+                    "release": tag,
+                    "asset_url": None,
+                    "release_source": "offline cache",
+                    "cached": True,
+                    "cache_hit": True,
+                    "local": True,
+                    "sha256": path.stem,
+                })))
+            return layers
+    return [(label, resolve_local_template(ai_assistant, script_type, verbose=verbose))]
+
+def _merge_template_tree(source_dir: Path, project_path: Path, *, verbose: bool = True, tracker: StepTracker | None = None) -> None:
+    """Merge an unpacked template tree into an existing directory (used for --here)."""
+    for item in source_dir.iterdir():
+        dest_path = project_path / item.name
+        if item.is_dir():
+            if dest_path.exists():
+                if verbose and not tracker:
+                    console.print(f"[yellow]Merging directory:[/yellow] {item.name}")
+                for sub_item in item.rglob('*'):
+                    if sub_item.is_file():
+                        rel_path = sub_item.relative_to(item)
+                        dest_file = dest_path / rel_path
+                        dest_file.parent.mkdir(parents=True, exist_ok=True)
+                        # Special handling for .vscode/settings.json - merge instead of overwrite
+                        if dest_file.name == "settings.json" and dest_file.parent.name == ".vscode":
+                            handle_vscode_settings(sub_item, dest_file, rel_path, verbose, tracker)
+                        else:
+                            shutil.copy2(sub_item, dest_file)
+            else:
+                shutil.copytree(item, dest_path)
+        else:
+            if dest_path.exists() and verbose and not tracker:
+                console.print(f"[yellow]Overwriting file:[/yellow] {item.name}")
+            shutil.copy2(item, dest_path)
+
+def _archive_root_prefix(names: list[str]) -> str:
+    """Return the single top-level directory prefix shared by every archive entry ("" if there is none).
+
+    Dot-directories are project content, not a wrapper: a base layer holds only
+    ``.specify/`` and an agent overlay may hold only ``.claude/``.
+    """
+    if not names:
+        return ""
+    top = names[0].split("/", 1)[0]
+    if top.startswith("."):
+        return ""
+    prefix = f"{top}/"
+    if all(name.startswith(prefix) for name in names):
+        return prefix
+    return ""
+
+def extract_template_archive(zip_ref: zipfile.ZipFile, project_path: Path, *, merge: bool = False, verbose: bool = True, tracker: StepTracker | None = None) -> dict:
+    """Stream every archive entry straight to its final path under ``project_path``.
+
+    A common top-level directory is stripped on the fly (flattening), so no temporary
+    directory, second copy or move is needed. With ``merge`` (--here mode) existing
+    files are overwritten, except .vscode/settings.json which is deep-merged.
+    Unix permission bits stored in each entry's ``external_attr`` are applied as the
+    file is written (masked by the umask), so executable scripts need no second pass.
+
+    Returns a summary dict with ``entries``, ``files``, ``bytes`` (uncompressed), ``top_level``, ``flattened``,
+    ``mode_bits`` (whether the archive carried Unix modes), ``chmod`` (files whose
+    mode was set from the archive) and ``hashes`` (SHA-256 of each file as shipped).
+    """
+    return extract_template_archives([zip_ref], project_path, merge=merge, verbose=verbose, tracker=tracker)
+
+def _plan_archive_entries(zip_refs: list[zipfile.ZipFile]) -> Tuple[dict[str, Tuple[zipfile.ZipFile, zipfile.ZipInfo]], int, bool]:
+    """Map each project-relative path to the archive entry that provides it.
+
+    Returns (plan, entry count, flattened). A common top-level directory is stripped from
+    each archive, unsafe entries are rejected, and the earliest archive wins on overlaps.
+    """
+    plan: dict[str, Tuple[zipfile.ZipFile, zipfile.ZipInfo]] = {}
+    entries = 0
+    flattened = False
+    for zip_ref in zip_refs:
+        infos = zip_ref.infolist()
+        entries += len(infos)
+        prefix = _archive_root_prefix([info.filename for info in infos])
+        flattened = flattened or bool(prefix)
+        for info in infos:
+            entry_path = Path(info.filename)
+            if entry_path.is_absolute() or ".." in entry_path.parts:
+                raise RuntimeError(f"Refusing to extract unsafe archive entry: {info.filename}")
+            rel_name = info.filename[len(prefix):].rstrip("/")
+            if rel_name and rel_name not in plan:
+                plan[rel_name] = (zip_ref, info)
+    return plan, entries, flattened
+
+def _prefetch_entries(entries: list[Tuple[zipfile.ZipFile, zipfile.ZipInfo]]) -> None:
+    """Batch the range requests for entries read through a RemoteZipReader (no-op for local archives)."""
+    by_archive: dict[int, Tuple[zipfile.ZipFile, list[zipfile.ZipInfo]]] = {}
+    for zip_ref, info in entries:
+        if isinstance(zip_ref.fp, RemoteZipReader) and not info.is_dir():
+            by_archive.setdefault(id(zip_ref), (zip_ref, []))[1].append(info)
+    for zip_ref, infos in by_archive.values():
+        zip_ref.fp.prefetch(zip_ref, infos)
+
+def _current_umask() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+def _write_archive_entry(zip_ref: zipfile.ZipFile, info: zipfile.ZipInfo, dest: Path) -> str:
+    """Stream one archive entry to ``dest`` and return the SHA-256 of its content.
+
+    A ``dest`` hardlinked from the unpacked store (see TemplateStore) is replaced, not written through.
+    """
+    _unshare_file(dest)
+    digest = hashlib.sha256()
+    with zip_ref.open(info) as src, open(dest, "wb") as dst:
+        while chunk := src.read(1024 * 1024):
+            dst.write(chunk)
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _unshare_file(path: Path) -> None:
+    """Unlink ``path`` if other links share its inode, so rewriting it cannot alter them."""
+    try:
+        if path.stat(follow_symlinks=False).st_nlink > 1:
+            path.unlink()
+    except FileNotFoundError:
+        pass
+
+def _archive_entry_mode(info: zipfile.ZipInfo) -> int:
+    """Unix permission bits stored in an archive entry (0 if it carries none)."""
+    # create_system 3 == Unix; the high 16 bits of external_attr hold st_mode
+    return (info.external_attr >> 16) & 0o777 if info.create_system == 3 else 0
+
+def _apply_archive_mode(info: zipfile.ZipInfo, dest: Path, umask: int) -> Tuple[bool, bool]:
+    """Apply the Unix mode stored in an archive entry to ``dest``; return (entry had a mode, chmod was needed)."""
+    return _apply_file_mode(_archive_entry_mode(info), dest, umask)
+
+def _apply_file_mode(mode: int, dest: Path, umask: int) -> Tuple[bool, bool]:
+    """Apply archive permission bits to ``dest`` (masked by the umask); return (there was a mode, chmod was needed)."""
+    if not mode:
+        return False, False
+    mode &= ~umask
+    if os.name != "nt" and mode != 0o666 & ~umask:
+        os.chmod(dest, mode)
+        return True, True
+    return True, False
+
+def extract_template_archives(zip_refs: list[zipfile.ZipFile], project_path: Path, *, merge: bool = False, verbose: bool = True, tracker: StepTracker | None = None) -> dict:
+    """Extract several template archives into ``project_path`` in one pass (see extract_template_archive).
+
+    Entries are planned up front so every output path is written exactly once; when
+    archives overlap (shared ``.specify`` files), the earliest archive in ``zip_refs`` wins.
+    """
+    root = project_path.resolve()
+    plan, entries, flattened = _plan_archive_entries(zip_refs)
+    _prefetch_entries(list(plan.values()))
+
+    preexisting = {item.name for item in root.iterdir()} if merge and root.is_dir() else set()
+    created_dirs: set[Path] = {root}
+    top_level: set[str] = set()
+    announced: set[str] = set()
+    hashes: dict[str, str] = {}
+    files = 0
+    written = 0
+    chmod_count = 0
+    mode_bits = False
+    umask = _current_umask()
+
+    def ensure_dir(path: Path) -> None:
+        if path not in created_dirs:
+            path.mkdir(parents=True, exist_ok=True)
+            created_dirs.add(path)
+
+    for rel_name, (zip_ref, info) in plan.items():
+        rel_path = Path(rel_name)
+        dest = root / rel_path
+        top_name = rel_path.parts[0]
+        top_level.add(top_name)
+        if verbose and not tracker and top_name in preexisting and top_name not in announced:
+            announced.add(top_name)
+            if len(rel_path.parts) > 1 or info.is_dir():
+                console.print(f"[yellow]Merging directory:[/yellow] {top_name}")
+            else:
+                console.print(f"[yellow]Overwriting file:[/yellow] {top_name}")
+
+        if info.is_dir():
+            ensure_dir(dest)
+            continue
+
+        ensure_dir(dest.parent)
+        if merge and dest.name == "settings.json" and dest.parent.name == ".vscode" and dest.exists():
+            data = zip_ref.read(info)
+            handle_vscode_settings_bytes(data, dest, rel_path, verbose, tracker)
+            hashes[rel_name] = hashlib.sha256(data).hexdigest()
+        else:
+            hashes[rel_name] = _write_archive_entry(zip_ref, info, dest)
+        files += 1
+        written += info.file_size
+
+        has_mode, changed = _apply_archive_mode(info, dest, umask)
+        mode_bits = mode_bits or has_mode
+        chmod_count += changed
+
+    return {
+        "entries": entries,
+        "files": files,
+        "bytes": written,
+        "top_level": sorted(top_level),
+        "flattened": flattened,
+        "mode_bits": mode_bits,
+        "chmod": chmod_count,
+        "hashes": hashes,
+    }
+
+FICLONE = 0x40049409  # _IOW(0x94, 9, int) from linux/fs.h
+LINK_MODES = ("clone", "hardlink", "copy")
+
+def _link_mode() -> str:
+    """Return how project files are created from the unpacked store (SPECIFY_LINK_MODE).
+
+    ``clone`` (default) reflinks where the filesystem supports it and copies otherwise,
+    ``hardlink`` also hardlinks the helper scripts (see _is_hardlinkable_template_file),
+    ``copy`` always copies.
+    """
+    mode = os.getenv("SPECIFY_LINK_MODE", "").strip().lower()
+    return mode if mode in LINK_MODES else "clone"
+
+def _is_hardlinkable_template_file(rel_name: str) -> bool:
+    """Whether a template file may share its inode with the store in ``hardlink`` mode.
+
+    Only the helper scripts under .specify/scripts qualify. Everything else is meant to
+    be edited: the constitution, the spec/plan templates, the agent command files, the
+    agent context files update-agent-context rewrites and the merged .vscode/settings.json.
+    Writing to a hardlinked copy would change the object for every project at once.
+    """
+    return rel_name.startswith(".specify/scripts/")
+
+def _clone_file(src: BinaryIO, dst: BinaryIO) -> bool:
+    """Reflink ``src`` into the empty file ``dst`` (Linux FICLONE); return False where that is unsupported."""
+    try:
+        import fcntl
+
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        return True
+    except (ImportError, OSError):
+        return False
+
+class TemplateStore:
+    """Unpacked, content-addressed store of template files shared by every project on the machine.
+
+    Each distinct file is kept once under ``files/<sha256[:2]>/<sha256>`` (with a ``-x``
+    suffix for executables, since hardlinks share permissions) and ``trees/<archive
+    sha256>.json`` maps an archive's project-relative paths to those objects. An archive
+    is unpacked the first time it is used; later projects are created by cloning, linking
+    or copying objects, without opening the zip. Objects are read-only so a hardlinked
+    project file cannot be edited by accident. The store lives inside the template cache,
+    so ``specify cache clear`` removes it too.
+
+    Trees also record each object's mtime. Writing through a hardlink changes the shared
+    inode's mtime (chmod changes its mode), so a tree whose objects no longer match is
+    rebuilt from the archive, and the rebuild re-hashes every existing object and replaces
+    those whose content changed.
+    """
+
+    TREE_VERSION = 2
+
+    def __init__(self, root: Path | None = None):
+        self.root = (root or TemplateCache().root) / "unpacked"
+        self.files_dir = self.root / "files"
+        self.trees_dir = self.root / "trees"
+
+    def object_path(self, sha256: str, executable: bool = False) -> Path:
+        return self.files_dir / sha256[:2] / (f"{sha256}-x" if executable else sha256)
+
+    def _has_object(self, sha256: str, size: int, mode: int, mtime_ns: int | None = None) -> bool:
+        """Whether the object is intact: its size and read-only mode are unchanged and either
+        its mtime matches the tree's (``mtime_ns``) or, without one, its content hashes to ``sha256``."""
+        path = self.object_path(sha256, bool(mode & 0o111))
+        try:
+            st = path.stat()
+        except OSError:
+            return False
+        if st.st_size != size:
+            return False
+        if os.name != "nt" and st.st_mode & 0o777 != (0o555 if mode & 0o111 else 0o444):
+            return False
+        if mtime_ns is not None:
+            return st.st_mtime_ns == mtime_ns
+        return _sha256_file(path) == sha256
+
+    def tree(self, archive_sha256: str, archive: Path | BinaryIO) -> dict:
+        """Return the unpacked tree of an archive, unpacking it into the store first if needed.
+
+        A tree whose objects are missing or truncated is rebuilt from the archive.
+        """
+        tree = self._load_tree(archive_sha256)
+        if tree is None:
+            # Concurrent projects wait for one process to unpack the archive
+            with FileLock(self.trees_dir / f"{archive_sha256}.lock"):
+                tree = self._load_tree(archive_sha256)
+                added = tree is None
+                if added:
+                    tree = self.add(archive_sha256, archive)
+            if added:
+                # Unpacked files count toward the cache size cap
+                TemplateCache(self.root.parent.parent).prune(keep=archive_sha256, grace=CACHE_PRUNE_GRACE)
+        else:
+            # The tree's mtime is its LRU stamp once the archive itself has been evicted
+            with contextlib.suppress(OSError):
+                os.utime(self.trees_dir / f"{archive_sha256}.json")
+        return tree
+
+    def _load_tree(self, archive_sha256: str) -> Optional[dict]:
+        try:
+            tree = json.loads((self.trees_dir / f"{archive_sha256}.json").read_text(encoding="utf-8"))
+            if tree["version"] == self.TREE_VERSION and all(self._has_object(*entry) for entry in tree["files"].values()):
+                return tree
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return None
+
+    def add(self, archive_sha256: str, archive: Path | BinaryIO) -> dict:
+        """Unpack an archive into the store and record its tree.
+
+        Objects and the tree are written to temporary files and renamed into place, so
+        concurrent processes adding the same archive only duplicate work. A damaged object
+        is replaced by a new file rather than rewritten, leaving projects that hardlink the
+        old inode alone.
+        """
+        import zipfile
+
+        self.files_dir.mkdir(parents=True, exist_ok=True)
+        self.trees_dir.mkdir(parents=True, exist_ok=True)
+        suffix = f"{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp = self.files_dir / f".object.{suffix}"
+        tree = {"version": self.TREE_VERSION, "entries": 0, "flattened": False, "dirs": [], "files": {}}
+        if not isinstance(archive, Path):
+            archive.seek(0)
+        try:
+            with zipfile.ZipFile(archive, 'r') as zip_ref:
+                plan, tree["entries"], tree["flattened"] = _plan_archive_entries([zip_ref])
+                for rel_name, (_, info) in plan.items():
+                    if info.is_dir():
+                        tree["dirs"].append(rel_name)
+                        continue
+                    mode = _archive_entry_mode(info)
+                    sha256 = _write_archive_entry(zip_ref, info, tmp)
+                    obj = self.object_path(sha256, bool(mode & 0o111))
+                    if not self._has_object(sha256, info.file_size, mode):
+                        obj.parent.mkdir(exist_ok=True)
+                        if os.name != "nt":
+                            os.chmod(tmp, 0o555 if mode & 0o111 else 0o444)
+                        os.replace(tmp, obj)
+                    tree["files"][rel_name] = [sha256, info.file_size, mode, obj.stat().st_mtime_ns]
+        finally:
+            tmp.unlink(missing_ok=True)
+
+        path = self.trees_dir / f"{archive_sha256}.json"
+        tmp_tree = path.with_name(f"{path.name}.{suffix}")
+        tmp_tree.write_text(json.dumps(tree), encoding="utf-8")
+        os.replace(tmp_tree, path)
+        return tree
+
+    def tree_times(self) -> dict[str, float]:
+        """Archive SHA-256 -> last use (mtime) of every unpacked tree."""
+        times = {}
+        try:
+            for entry in os.scandir(self.trees_dir):
+                if entry.name.endswith(".json") and not entry.name.startswith("."):
+                    times[entry.name[:-len(".json")]] = entry.stat().st_mtime
+        except OSError:
+            pass
+        return times
+
+    def usage(self) -> Tuple[int, int, int]:
+        """Return (trees, objects, bytes) for the whole store."""
+        trees = objects = total = 0
+        for directory in (self.trees_dir, *(self.files_dir.glob("??") if self.files_dir.is_dir() else ())):
+            try:
+                for entry in os.scandir(directory):
+                    if entry.name.startswith(".") or entry.name.endswith((".lock", ".tmp")) or not entry.is_file():
+                        continue
+                    total += entry.stat().st_size
+                    if directory == self.trees_dir:
+                        trees += 1
+                    else:
+                        objects += 1
+            except OSError:
+                pass
+        return trees, objects, total
+
+    def drop(self, archive_sha256: str) -> int:
+        """Forget an archive's tree (its objects stay until collect_garbage); return the bytes freed."""
+        path = self.trees_dir / f"{archive_sha256}.json"
+        try:
+            size = path.stat().st_size
+            path.unlink()
+            return size
+        except OSError:
+            return 0
+
+    def collect_garbage(self) -> int:
+        """Delete objects no tree references and return the bytes freed.
+
+        While another process holds an unpack lock, objects from the last hour are kept:
+        they may belong to a tree that has not been written yet.
+        """
+        if not self.files_dir.is_dir():
+            return 0
+        referenced: set[str] = set()
+        for archive_sha256 in self.tree_times():
+            try:
+                tree = json.loads((self.trees_dir / f"{archive_sha256}.json").read_text(encoding="utf-8"))
+                referenced.update(self.object_path(sha256, bool(mode & 0o111)).name for sha256, _, mode, *_ in tree["files"].values())
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+        unpacking = any(self.trees_dir.glob("*.lock"))
+        cutoff = time.time() - 3600
+        freed = 0
+        for directory in self.files_dir.glob("??"):
+            for path in directory.iterdir():
+                if path.name in referenced or path.name.startswith("."):
+                    continue
+                try:
+                    st = path.stat()
+                    if unpacking and st.st_mtime > cutoff:
+                        continue
+                    path.unlink()
+                    freed += st.st_size
+                except OSError:
+                    pass
+        return freed
+
+    @staticmethod
+    def _create(source: Path, dest: Path, *, hardlink: bool, clone: bool) -> str:
+        """Create ``dest`` from a store object; return the method used ("hardlink", "clone" or "copy")."""
+        dest.unlink(missing_ok=True)
+        if hardlink:
+            try:
+                os.link(source, dest)
+                return "hardlink"
+            except OSError:
+                pass  # e.g. the store is on another filesystem
+        if clone:
+            with open(source, "rb") as src, open(dest, "wb") as dst:
+                if _clone_file(src, dst):
+                    return "clone"
+        shutil.copyfile(source, dest)
+        return "copy"
+
+    def materialize(self, trees: list[dict], project_path: Path, *, merge: bool = False, verbose: bool = True, tracker: StepTracker | None = None, link_mode: str | None = None) -> dict:
+        """Create the files of one or more unpacked trees under ``project_path``.
+
+        The counterpart of extract_template_archives, returning the same summary plus
+        ``linked`` (files created per method). The earliest tree wins on overlaps, an
+        existing .vscode/settings.json is deep-merged with ``merge``, and file hashes come
+        from the store instead of being recomputed. Only helper scripts are ever hardlinked
+        (see _is_hardlinkable_template_file), and an existing file is replaced rather than
+        written through.
+        """
+        link_mode = link_mode or _link_mode()
+        root = project_path.resolve()
+        plan: dict[str, list] = {}
+        dirs: list[str] = []
+        for tree in trees:
+            dirs.extend(tree["dirs"])
+            for rel_name, entry in tree["files"].items():
+                plan.setdefault(rel_name, entry)
+
+        preexisting = {item.name for item in root.iterdir()} if merge and root.is_dir() else set()
+        top_level = {Path(rel_name).parts[0] for rel_name in [*dirs, *plan]}
+        if verbose and not tracker:
+            for name in sorted(top_level & preexisting):
+                if (root / name).is_dir():
+                    console.print(f"[yellow]Merging directory:[/yellow] {name}")
+                else:
+                    console.print(f"[yellow]Overwriting file:[/yellow] {name}")
+
+        created_dirs: set[Path] = {root}
+        for rel_name in [*dirs, *(str(Path(rel_name).parent) for rel_name in plan)]:
+            path = root / rel_name
+            if path not in created_dirs:
+                path.mkdir(parents=True, exist_ok=True)
+                created_dirs.add(path)
+
+        linked = {"hardlink": 0, "clone": 0, "copy": 0}
+        clone = link_mode != "copy"
+        hashes: dict[str, str] = {}
+        written = 0
+        chmod_count = 0
+        mode_bits = False
+        umask = _current_umask()
+        for rel_name, (sha256, size, mode, _) in plan.items():
+            dest = root / rel_name
+            source = self.object_path(sha256, bool(mode & 0o111))
+            if merge and rel_name == ".vscode/settings.json" and dest.exists():
+                handle_vscode_settings_bytes(source.read_bytes(), dest, Path(rel_name), verbose, tracker)
+                method = "copy"
+            else:
+                hardlink = link_mode == "hardlink" and _is_hardlinkable_template_file(rel_name)
+                method = self._create(source, dest, hardlink=hardlink, clone=clone)
+                # One failed reflink means the filesystem cannot clone; stop trying
+                clone = clone and method != "copy"
+            linked[method] += 1
+            if method != "hardlink":
+                chmod_count += _apply_file_mode(mode, dest, umask)[1]
+            mode_bits = mode_bits or bool(mode)
+            hashes[rel_name] = sha256
+            written += size
+
+        return {
+            "entries": sum(tree["entries"] for tree in trees),
+            "files": len(plan),
+            "bytes": written,
+            "top_level": sorted(top_level),
+            "flattened": any(tree["flattened"] for tree in trees),
+            "mode_bits": mode_bits,
+            "chmod": chmod_count,
+            "hashes": hashes,
+            "linked": linked,
+        }
+
+def extract_fetched_templates(fetched: list[Tuple[Path | BinaryIO, dict]], project_path: Path, *, merge: bool = False, verbose: bool = True, tracker: StepTracker | None = None, use_store: bool = True) -> dict:
+    """Extract fetched template archives into ``project_path``, through the unpacked store when possible.
+
+    Archives whose SHA-256 is known (downloaded or cached ones) are unpacked into the
+    TemplateStore once and materialized from it; others, such as a local
+    --template-archive, are streamed from the zip by extract_template_archives. Returns
+    the extraction summary either way.
+    """
+    import zipfile
+
+    digests = [meta.get("sha256") for _, meta in fetched]
+    if use_store and all(digests):
+        store = TemplateStore()
+        try:
+            trees = [store.tree(digest, archive) for digest, (archive, _) in zip(digests, fetched)]
+        except OSError as e:
+            # A read-only or full cache directory must never break init
+            trees = None
+            if verbose and not tracker:
+                console.print(f"[yellow]Warning:[/yellow] template store unavailable, extracting directly: {e}")
+        if trees is not None:
+            return store.materialize(trees, project_path, merge=merge, verbose=verbose, tracker=tracker)
+
+    zip_refs = []
+    try:
+        for archive, _ in fetched:
+            if not isinstance(archive, Path):
+                archive.seek(0)
+            zip_refs.append(zipfile.ZipFile(archive, 'r'))
+        return extract_template_archives(zip_refs, project_path, merge=merge, verbose=verbose, tracker=tracker)
+    finally:
+        for zip_ref in zip_refs:
+            zip_ref.close()
+
+def _linked_detail(linked: dict[str, int]) -> str:
+    """Describe how materialized files were created, e.g. '40 hardlinked, 6 copied'."""
+    labels = {"hardlink": "hardlinked", "clone": "cloned", "copy": "copied"}
+    return ", ".join(f"{count} {labels[method]}" for method, count in linked.items() if count) or "no files"
+
+def _report_extraction(extracted: dict, project_path: Path, is_current_dir: bool, *, verbose: bool = True, tracker: StepTracker | None = None) -> None:
+    """Report an extraction summary (see extract_template_archive) through the tracker or console."""
+    if tracker:
+        tracker.add_bytes("extract", extracted["bytes"])
+        tracker.start("zip-list")
+        tracker.complete("zip-list", f"{extracted['entries']} entries")
+        tracker.start("extracted-summary")
+        detail = f"{extracted['files']} files, {len(extracted['top_level'])} top-level items"
+        if "linked" in extracted:
+            detail += f", {_linked_detail(extracted['linked'])} from store"
+        tracker.complete("extracted-summary", detail)
+        if extracted["flattened"]:
+            tracker.add("flatten", "Flatten nested directory")
+            tracker.complete("flatten")
+        if extracted["mode_bits"]:
+            tracker.add("chmod", "Set script permissions recursively")
+            tracker.complete("chmod", f"{extracted['chmod']} set from archive modes")
+    elif verbose:
+        console.print(f"[cyan]ZIP contains {extracted['entries']} items[/cyan]")
+        if extracted["flattened"]:
+            console.print(f"[cyan]Flattened nested directory structure[/cyan]")
+        if is_current_dir:
+            console.print(f"[cyan]Template files merged into current directory[/cyan]")
+        else:
+            console.print(f"[cyan]Extracted {extracted['files']} files to {project_path}:[/cyan]")
+            for name in extracted["top_level"]:
+                console.print(f"  - {name}")
+        if extracted["chmod"]:
+            console.print(f"[cyan]Set permissions on {extracted['chmod']} file(s) from archive modes[/cyan]")
+        if "linked" in extracted:
+            console.print(f"[cyan]Created from the template store: {_linked_detail(extracted['linked'])}[/cyan]")
+
+INSTALL_RECORD = Path(".specify") / "install.json"
+
+def _release_label(metas) -> str:
+    """Release tag shared by the given template metadata (distinct tags are comma-joined)."""
+    return ",".join(dict.fromkeys(meta["release"] for meta in metas))
+
+def write_install_record(project_path: Path, release: str, variants: list[Tuple[str, str]], hashes: dict[str, str]) -> None:
+    """Record the installed release and the SHA-256 of every template file as shipped.
+
+    ``specify upgrade`` compares these hashes against the working tree to tell
+    untouched template files from local edits.
+    """
+    record = {
+        "version": 1,
+        "release": release,
+        "installed_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "variants": [list(variant) for variant in variants],
+        "files": dict(sorted(hashes.items())),
+    }
+    path = project_path / INSTALL_RECORD
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(record, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+def load_install_record(project_path: Path) -> Optional[dict]:
+    """Return the install record written by write_install_record, or None if the project has none."""
+    path = project_path / INSTALL_RECORD
+    try:
+        record = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Unreadable install record {path}: {e}")
+    if not isinstance(record, dict) or not isinstance(record.get("files"), dict):
+        raise ValueError(f"Malformed install record {path}: expected a \"files\" mapping")
+    return record
+
+def download_and_extract_template(
+    project_path: Path,
+    ai_assistant: str,
+    script_type: str,
+    is_current_dir: bool = False,
+    *,
+    verbose: bool = True,
+    tracker: StepTracker | None = None,
+    client: httpx.Client = None,
+    debug: bool = False,
+    github_token: str = None,
+    use_cache: bool = True,
+    offline: bool = False,
+    template_archive: Path | None = None,
+    summary: dict | None = None,
+) -> Path:
+    """Download the latest release and extract it to create a new project.
+    Returns project_path. Uses tracker if provided (with keys: fetch, download, extract, chmod, cleanup)
+    When use_cache is set, archives are served from and stored into the local template cache.
+    With offline or template_archive, the template is resolved locally and the GitHub API is never contacted.
+    If summary is given it is updated with the extraction summary (see extract_template_archive).
+    """
+    stage = "fetch"
+    if tracker:
+        tracker.start("fetch", "resolving local template" if (offline or template_archive) else "contacting GitHub API")
+    try:
+        if offline or template_archive:
+            archive, meta = resolve_local_template(
+                ai_assistant,
+                script_type,
+                template_archive=template_archive,
+                verbose=verbose and tracker is None,
+            )
+            if tracker:
+                tracker.complete("fetch", f"{meta['release_source']}, release {meta['release']} ({meta['size']:,} bytes)")
+                tracker.add("download", "Download template")
+                tracker.skip("download", f"{meta['filename']} ({meta['release_source']})")
+        elif tracker:
+            # Drive the steps individually so fetch and download get separate timings
+            release_data, release_source = fetch_latest_release(client, verbose=False, debug=debug, github_token=github_token, use_cache=use_cache)
+            (asset,), checksums, _ = resolve_release_assets(client, release_data, [(ai_assistant, script_type)], github_token=github_token, debug=debug, use_cache=use_cache)
+            release_detail = f"release {release_data['tag_name']} ({asset['size']:,} bytes)"
+            if release_source != "network":
+                release_detail += f", metadata {release_source}"
+            if _release_source_note():
+                release_detail += f", {_release_source_note()}"
+            tracker.complete("fetch", release_detail)
+            stage = "download"
+            tracker.add("download", "Download template")
+            tracker.start("download", asset["name"])
+            archive, meta = fetch_template_asset(
+                client,
+                release_data,
+                asset,
+                release_source=release_source,
+                verbose=False,
+                show_progress=False,
+                debug=debug,
+                github_token=github_token,
+                use_cache=use_cache,
+                checksums=checksums,
+            )
+            if not meta["cache_hit"]:
+                tracker.add_bytes("download", meta["size"])
+            tracker.complete("download", _download_detail(meta))
+        else:
+            archive, meta = download_template_from_github(
+                ai_assistant,
+                script_type=script_type,
+                verbose=verbose,
+                show_progress=True,
+                client=client,
+                debug=debug,
+                github_token=github_token,
+                use_cache=use_cache,
+            )
+    except Exception as e:
+        if tracker:
+            tracker.error(stage, str(e))
+        else:
+            if verbose:
+                console.print(f"[red]Error downloading template:[/red] {e}")
+        raise
+
+    if tracker:
+        tracker.add("extract", "Extract template")
+        tracker.start("extract")
+    elif verbose:
+        console.print("Extracting template...")
+
+    try:
+        if not is_current_dir:
+            project_path.mkdir(parents=True)
+
+        if isinstance(archive, Path) and archive.is_dir():
+            extracted_items = list(archive.iterdir())
+            source_dir = archive
+            if len(extracted_items) == 1 and extracted_items[0].is_dir():
+                source_dir = extracted_items[0]
+                if tracker:
+                    tracker.add("flatten", "Flatten nested directory")
+                    tracker.complete("flatten")
+                elif verbose:
+                    console.print(f"[cyan]Found nested directory structure[/cyan]")
+            if tracker:
+                tracker.skip("zip-list", "unpacked template directory")
+                tracker.start("extracted-summary")
+                tracker.complete("extracted-summary", f"{len(list(source_dir.iterdir()))} top-level items")
+
+            if is_current_dir:
+                _merge_template_tree(source_dir, project_path, verbose=verbose, tracker=tracker)
+                if verbose and not tracker:
+                    console.print(f"[cyan]Template files merged into current directory[/cyan]")
+            else:
+                shutil.copytree(source_dir, project_path, dirs_exist_ok=True)
+            # Hash the template files as shipped, like the zip path, so upgrade has a baseline
+            hashes = {path.relative_to(source_dir).as_posix(): _sha256_file(path) for path in source_dir.rglob("*") if path.is_file()}
+            write_install_record(project_path, meta["release"], [(ai_assistant, script_type)], hashes)
+        else:
+            extracted = extract_fetched_templates([(archive, meta)], project_path, merge=is_current_dir, verbose=verbose, tracker=tracker, use_store=use_cache)
+            write_install_record(project_path, meta["release"], [(ai_assistant, script_type)], extracted["hashes"])
+            if summary is not None:
+                summary.update(extracted)
+            _report_extraction(extracted, project_path, is_current_dir, verbose=verbose, tracker=tracker)
+
+    except Exception as e:
+        if tracker:
+            tracker.error("extract", str(e))
+        else:
+            if verbose:
+                console.print(f"[red]Error extracting template:[/red] {e}")
+                if debug:
+                    console.print(Panel(str(e), title="Extraction Error", border_style="red"))
+
+        if not is_current_dir and project_path.exists():
+            shutil.rmtree(project_path)
+        raise typer.Exit(1)
+    else:
+        if tracker:
+            tracker.complete("extract")
+    finally:
+        if tracker:
+            tracker.add("cleanup", "Remove temporary archive")
+
+        if meta.get("in_memory"):
+            archive.close()
+            if tracker:
+                tracker.complete("cleanup", "released download buffer")
+        elif meta.get("local") and not meta.get("cached"):
+            if tracker:
+                tracker.skip("cleanup", "local template left in place")
+        elif meta.get("cached"):
+            if tracker:
+                tracker.skip("cleanup", "archive kept in template cache")
+
+    return project_path
+
+
+
+def _download_detail(meta: dict) -> str:
+    """Tracker detail for a fetched asset: file name plus cache and verification state."""
+    notes = [note for note, flag in (("cached", meta.get("cache_hit")), ("shared download", meta.get("shared")), ("sha256 verified", meta.get("verified")), ("range reads", meta.get("remote"))) if flag]
+    return f"{meta['filename']} ({', '.join(notes)})" if notes else meta["filename"]
+
+def fetch_template_archives(variants: list[Tuple[str, str]], *, verbose: bool = True, tracker: StepTracker | None = None, client: httpx.Client = None, debug: bool = False, github_token: str = None, use_cache: bool = True, offline: bool = False, remote: bool = False) -> dict[str, Tuple[Path | BinaryIO, dict]]:
+    """Fetch the templates for several (agent, script) pairs concurrently.
+
+    Release metadata is fetched once and every archive is downloaded (or served from the
+    template cache) in parallel, each with its own ``download-<label>`` tracker step.
+    Variants of a layered release (see select_template_layers) share their base layer,
+    so it is fetched once. Returns ``{label: (archive, metadata)}`` with one entry per
+    distinct archive (see fetch_template_asset): ``<agent>-<script>`` for a full template
+    or an overlay and e.g. ``base-sh`` for a base layer. ``metadata["variants"]`` lists the
+    (agent, script) pairs an archive belongs to; extracting every archive of a variant
+    together yields its template. Callers close in-memory archives when done. When the
+    release publishes an asset manifest, each metadata dict carries the asset's
+    ``entries`` list from it. ``remote`` is passed through to fetch_template_asset.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    labels = [f"{agent}-{script}" for agent, script in variants]
+    if tracker:
+        tracker.start("fetch", "resolving local templates" if offline else "contacting GitHub API")
+
+    fetched: dict[str, Tuple[Path | BinaryIO, dict]] = {}
+    try:
+        if offline:
+            for variant, label in zip(variants, labels):
+                for layer_label, (archive, meta) in resolve_local_layers(*variant, verbose=verbose and tracker is None):
+                    if layer_label not in fetched:
+                        fetched[layer_label] = (archive, dict(meta, variants=[]))
+                    fetched[layer_label][1]["variants"].append(variant)
+            if tracker:
+                tracker.complete("fetch", f"{len(fetched)} archives from offline cache")
+                for layer_label, (archive, meta) in fetched.items():
+                    tracker.add(f"download-{layer_label}", f"Download {layer_label} template", before=f"download-{'-'.join(meta['variants'][0])}")
+                    tracker.skip(f"download-{layer_label}", f"{meta['filename']} ({meta['release_source']})")
+        else:
+            release_data, release_source = fetch_latest_release(
+                client,
+                verbose=verbose and tracker is None,
+                debug=debug,
+                github_token=github_token,
+                use_cache=use_cache,
+            )
+            layers, checksums, manifest = resolve_release_layers(client, release_data, variants, github_token=github_token, debug=debug, use_cache=use_cache)
+            assets: dict[str, dict] = {}
+            users: dict[str, list[Tuple[str, str]]] = {}
+            for variant, label, chain in zip(variants, labels, layers):
+                for position, asset in enumerate(chain, 1):
+                    layer_label = label if position == len(chain) else _layer_label(asset["name"], release_data["tag_name"])
+                    assets.setdefault(layer_label, asset)
+                    users.setdefault(layer_label, []).append(variant)
+            if tracker:
+                release_detail = f"release {release_data['tag_name']}, {len(assets)} assets"
+                if release_source != "network":
+                    release_detail += f", metadata {release_source}"
+                if _release_source_note():
+                    release_detail += f", {_release_source_note()}"
+                tracker.complete("fetch", release_detail)
+                for label, asset in assets.items():
+                    tracker.add(f"download-{label}", f"Download {label} template", before=f"download-{'-'.join(users[label][0])}")
+                    tracker.start(f"download-{label}", asset["name"])
+            elif verbose:
+                console.print(f"[cyan]Downloading {len(assets)} templates from release {release_data['tag_name']}...[/cyan]")
+
+            with ThreadPoolExecutor(max_workers=min(len(assets), DEFAULT_HTTP_MAX_PER_HOST)) as pool:
+                futures = {
+                    pool.submit(
+                        fetch_template_asset,
+                        client,
+                        release_data,
+                        asset,
+                        release_source=release_source,
+                        verbose=False,
+                        show_progress=False,
+                        debug=debug,
+                        github_token=github_token,
+                        use_cache=use_cache,
+                        checksums=checksums,
+                        remote=remote,
+                    ): label
+                    for label, asset in assets.items()
+                }
+                failures = []
+                for future in as_completed(futures):
+                    label = futures[future]
+                    try:
+                        fetched[label] = future.result()
+                    except Exception as e:
+                        failures.append(label)
+                        if tracker:
+                            tracker.error(f"download-{label}", str(e) or "download failed")
+                        continue
+                    archive, meta = fetched[label]
+                    meta["variants"] = users[label]
+                    if manifest and manifest.get("assets", {}).get(meta["filename"], {}).get("entries"):
+                        meta["entries"] = manifest["assets"][meta["filename"]]["entries"]
+                    detail = _download_detail(meta)
+                    if tracker:
+                        if not meta["cache_hit"]:
+                            tracker.add_bytes(f"download-{label}", archive.fetched if meta.get("remote") else meta["size"])
+                        tracker.complete(f"download-{label}", detail)
+                    elif verbose:
+                        console.print(f"[cyan]Fetched:[/cyan] {detail}")
+            if failures:
+                raise RuntimeError(f"Failed to download template(s): {', '.join(sorted(failures))}")
+    except Exception as e:
+        for archive, meta in fetched.values():
+            if meta.get("in_memory"):
+                archive.close()
+        if tracker:
+            tracker.error("fetch", str(e) or "template resolution failed")
+        elif verbose and not isinstance(e, typer.Exit):
+            console.print(f"[red]Error downloading templates:[/red] {e}")
+        raise
+
+    return fetched if offline else {label: fetched[label] for label in assets}
+
+def download_and_extract_templates(project_path: Path, variants: list[Tuple[str, str]], is_current_dir: bool = False, *, verbose: bool = True, tracker: StepTracker | None = None, client: httpx.Client = None, debug: bool = False, github_token: str = None, use_cache: bool = True, offline: bool = False, summary: dict | None = None) -> Path:
+    """Fetch the templates for several (agent, script) pairs concurrently and extract them together.
+
+    The archives (see fetch_template_archives) are extracted in a single pass, through the
+    unpacked store when use_cache is set (see extract_fetched_templates); files shared
+    between variants are written once, taking the copy from the first variant listed.
+    """
+    fetched = fetch_template_archives(
+        variants,
+        verbose=verbose,
+        tracker=tracker,
+        client=client,
+        debug=debug,
+        github_token=github_token,
+        use_cache=use_cache,
+        offline=offline,
+    )
+    labels = list(fetched)
+
+    if tracker:
+        tracker.add("extract", "Extract template")
+        tracker.start("extract")
+    elif verbose:
+        console.print("Extracting templates...")
+
+    try:
+        if not is_current_dir:
+            project_path.mkdir(parents=True)
+        extracted = extract_fetched_templates([fetched[label] for label in labels], project_path, merge=is_current_dir, verbose=verbose, tracker=tracker, use_store=use_cache)
+        write_install_record(project_path, _release_label(meta for _, meta in fetched.values()), variants, extracted["hashes"])
+        if summary is not None:
+            summary.update(extracted)
+        _report_extraction(extracted, project_path, is_current_dir, verbose=verbose, tracker=tracker)
+    except Exception as e:
+        if tracker:
+            tracker.error("extract", str(e))
+        elif verbose:
+            console.print(f"[red]Error extracting templates:[/red] {e}")
+        if not is_current_dir and project_path.exists():
+            shutil.rmtree(project_path)
+        raise typer.Exit(1)
+    else:
+        if tracker:
+            tracker.complete("extract")
+    finally:
+        released = 0
+        for archive, meta in fetched.values():
+            if meta.get("in_memory"):
+                archive.close()
+                released += 1
+        if tracker:
+            tracker.add("cleanup", "Remove temporary archive")
+            if released:
+                tracker.complete("cleanup", f"released {released} download buffer(s)")
+            else:
+                tracker.skip("cleanup", "archives kept in template cache")
+
+    return project_path
+
+def ensure_executable_scripts(project_path: Path, tracker: StepTracker | None = None, *, verbose: bool = True) -> None:
+    """Ensure POSIX .sh scripts under .specify/scripts (recursively) have execute bits (no-op on Windows).
+
+    Fallback for templates whose archive carries no Unix mode bits; archives that do
+    have their permissions applied during extraction instead.
+    """
+    if os.name == "nt":
+        return  # Windows: skip silently
+    scripts_root = project_path / ".specify" / "scripts"
+    if not scripts_root.is_dir():
+        return
+    if tracker:
+        tracker.add("chmod", "Set script permissions recursively")
+        tracker.start("chmod")
+    failures: list[str] = []
+    updated = 0
+    for script in scripts_root.rglob("*.sh"):
         try:
             if script.is_symlink() or not script.is_file():
                 continue
@@ -941,7 +3597,7 @@ def ensure_executable_scripts(project_path: Path, tracker: StepTracker | None =
         detail = f"{updated} updated" + (f", {len(failures)} failed" if failures else "")
         tracker.add("chmod", "Set script permissions recursively")
         (tracker.error if failures else tracker.complete)("chmod", detail)
-    else:
+    elif verbose:
         if updated:
             console.print(f"[cyan]Updated execute permissions on {updated} script(s) recursively[/cyan]")
         if failures:
@@ -949,11 +3605,15 @@ def ensure_executable_scripts(project_path: Path, tracker: StepTracker | None =
             for f in failures:
                 console.print(f"  - {f}")
 
+def _split_choices(value: str) -> list[str]:
+    """Split a comma-separated option value into unique, non-empty choices, preserving order."""
+    return list(dict.fromkeys(part.strip() for part in value.split(",") if part.strip()))
+
 @app.command()
 def init(
     project_name: str = typer.Argument(None, help="Name for your new project directory (optional if using --here, or use '.' for current directory)"),
-    ai_assistant: str = typer.Option(None, "--ai", help="AI assistant to use: claude, gemini, copilot, cursor-agent, qwen, opencode, codex, windsurf, kilocode, auggie, codebuddy, amp, shai, q, bob, qoder, or catpaw "),
-    script_type: str = typer.Option(None, "--script", help="Script type to use: sh or ps"),
+    ai_assistant: str = typer.Option(None, "--ai", help="AI assistant to use: claude, gemini, copilot, cursor-agent, qwen, opencode, codex, windsurf, kilocode, auggie, codebuddy, amp, shai, q, bob, qoder, or catpaw (comma-separate to set up several)"),
+    script_type: str = typer.Option(None, "--script", help="Script type to use: sh or ps (or sh,ps for both)"),
     ignore_agent_tools: bool = typer.Option(False, "--ignore-agent-tools", help="Skip checks for AI agent tools like Claude Code"),
     no_git: bool = typer.Option(False, "--no-git", help="Skip git repository initialization"),
     here: bool = typer.Option(False, "--here", help="Initialize project in the current directory instead of creating a new one"),
@@ -961,6 +3621,11 @@ def init(
     skip_tls: bool = typer.Option(False, "--skip-tls", help="Skip SSL/TLS verification (not recommended)"),
     debug: bool = typer.Option(False, "--debug", help="Show verbose diagnostic output for network and extraction failures"),
     github_token: str = typer.Option(None, "--github-token", help="GitHub token to use for API requests (or set GH_TOKEN or GITHUB_TOKEN environment variable)"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Bypass the local template cache and always download the archive"),
+    offline: bool = typer.Option(False, "--offline", help="Do not contact GitHub; use --template-archive or the most recent cached template"),
+    template_archive: Path = typer.Option(None, "--template-archive", help="Use a local template .zip or unpacked template directory instead of downloading (implies --offline)"),
+    trace_file: Path = typer.Option(None, "--trace-file", help="Write per-step timings as Chrome trace-event JSON to this file"),
+    timings: bool = typer.Option(False, "--timings", help="Print a per-step timing summary (duration, bytes, throughput)"),
 ):
     """
     Initialize a new Specify project from the latest template.
@@ -985,6 +3650,12 @@ def init(
         specify init --here --ai codebuddy
         specify init --here
         specify init --here --force  # Skip confirmation when current directory not empty
+        specify init my-project --ai claude --no-cache  # Always download a fresh archive
+        specify init my-project --ai claude --offline  # Use the cached template, no network
+        specify init my-project --ai claude --template-archive ./spec-kit-template-claude-sh-v0.0.22.zip
+        specify init --here --ai claude,gemini,copilot  # Several agents in one pass
+        specify init my-project --ai claude --script sh,ps  # Both script variants
+        specify init my-project --ai claude --timings --trace-file init-trace.json
     """
 
     show_banner()
@@ -1051,10 +3722,12 @@ def init(
             console.print("[yellow]Git not found - will skip repository initialization[/yellow]")
 
     if ai_assistant:
-        if ai_assistant not in AGENT_CONFIG:
-            console.print(f"[red]Error:[/red] Invalid AI assistant '{ai_assistant}'. Choose from: {', '.join(AGENT_CONFIG.keys())}")
-            raise typer.Exit(1)
-        selected_ai = ai_assistant
+        selected_ais = _split_choices(ai_assistant) or [ai_assistant]
+        for ai in selected_ais:
+            if ai not in AGENT_CONFIG:
+                console.print(f"[red]Error:[/red] Invalid AI assistant '{ai}'. Choose from: {', '.join(AGENT_CONFIG.keys())}")
+                raise typer.Exit(1)
+        selected_ai = selected_ais[0]
     else:
         # Create options dict for selection (agent_key: display_name)
         ai_choices = {key: config["name"] for key, config in AGENT_CONFIG.items()}
@@ -1063,30 +3736,34 @@ def init(
             "Choose your AI assistant:", 
             "copilot"
         )
+        selected_ais = [selected_ai]
 
     if not ignore_agent_tools:
-        agent_config = AGENT_CONFIG.get(selected_ai)
-        if agent_config and agent_config["requires_cli"]:
-            install_url = agent_config["install_url"]
-            if not check_tool(selected_ai):
-                error_panel = Panel(
-                    f"[cyan]{selected_ai}[/cyan] not found\n"
-                    f"Install from: [cyan]{install_url}[/cyan]\n"
-                    f"{agent_config['name']} is required to continue with this project type.\n\n"
-                    "Tip: Use [cyan]--ignore-agent-tools[/cyan] to skip this check",
-                    title="[red]Agent Detection Error[/red]",
-                    border_style="red",
-                    padding=(1, 2)
-                )
-                console.print()
-                console.print(error_panel)
-                raise typer.Exit(1)
+        for ai in selected_ais:
+            agent_config = AGENT_CONFIG.get(ai)
+            if agent_config and agent_config["requires_cli"]:
+                install_url = agent_config["install_url"]
+                if not check_tool(ai):
+                    error_panel = Panel(
+                        f"[cyan]{ai}[/cyan] not found\n"
+                        f"Install from: [cyan]{install_url}[/cyan]\n"
+                        f"{agent_config['name']} is required to continue with this project type.\n\n"
+                        "Tip: Use [cyan]--ignore-agent-tools[/cyan] to skip this check",
+                        title="[red]Agent Detection Error[/red]",
+                        border_style="red",
+                        padding=(1, 2)
+                    )
+                    console.print()
+                    console.print(error_panel)
+                    raise typer.Exit(1)
 
     if script_type:
-        if script_type not in SCRIPT_TYPE_CHOICES:
-            console.print(f"[red]Error:[/red] Invalid script type '{script_type}'. Choose from: {', '.join(SCRIPT_TYPE_CHOICES.keys())}")
-            raise typer.Exit(1)
-        selected_script = script_type
+        selected_scripts = _split_choices(script_type) or [script_type]
+        for script in selected_scripts:
+            if script not in SCRIPT_TYPE_CHOICES:
+                console.print(f"[red]Error:[/red] Invalid script type '{script}'. Choose from: {', '.join(SCRIPT_TYPE_CHOICES.keys())}")
+                raise typer.Exit(1)
+        selected_script = selected_scripts[0]
     else:
         default_script = "ps" if os.name == "nt" else "sh"
 
@@ -1094,9 +3771,15 @@ def init(
             selected_script = select_with_arrows(SCRIPT_TYPE_CHOICES, "Choose script type (or press Enter)", default_script)
         else:
             selected_script = default_script
+        selected_scripts = [selected_script]
+
+    variants = [(ai, script) for ai in selected_ais for script in selected_scripts]
+    if template_archive and len(variants) > 1:
+        console.print("[red]Error:[/red] --template-archive supplies a single template; use it with one --ai and one --script value")
+        raise typer.Exit(1)
 
-    console.print(f"[cyan]Selected AI assistant:[/cyan] {selected_ai}")
-    console.print(f"[cyan]Selected script type:[/cyan] {selected_script}")
+    console.print(f"[cyan]Selected AI assistant:[/cyan] {', '.join(selected_ais)}")
+    console.print(f"[cyan]Selected script type:[/cyan] {', '.join(selected_scripts)}")
 
     tracker = StepTracker("Initialize Specify Project")
 
@@ -1105,12 +3788,14 @@ def init(
     tracker.add("precheck", "Check required tools")
     tracker.complete("precheck", "ok")
     tracker.add("ai-select", "Select AI assistant")
-    tracker.complete("ai-select", f"{selected_ai}")
+    tracker.complete("ai-select", ", ".join(selected_ais))
     tracker.add("script-select", "Select script type")
-    tracker.complete("script-select", selected_script)
+    tracker.complete("script-select", ", ".join(selected_scripts))
     for key, label in [
         ("fetch", "Fetch latest release"),
-        ("download", "Download template"),
+        *([("download", "Download template")] if template_archive else [
+            (f"download-{ai}-{script}", f"Download {ai}-{script} template") for ai, script in variants
+        ]),
         ("extract", "Extract template"),
         ("zip-list", "Archive contents"),
         ("extracted-summary", "Extraction summary"),
@@ -1124,16 +3809,20 @@ def init(
     # Track git error message outside Live context so it persists
     git_error_message = None
 
-    with Live(tracker.render(), console=console, refresh_per_second=8, transient=True) as live:
-        tracker.attach_refresh(lambda: live.update(tracker.render()))
+    from rich.live import Live
+
+    with Live(tracker, console=console, refresh_per_second=8, transient=True):
         try:
-            verify = not skip_tls
-            local_ssl_context = ssl_context if verify else False
-            local_client = httpx.Client(verify=local_ssl_context)
+            local_client = http_session.client(verify_tls=not skip_tls)
 
-            download_and_extract_template(project_path, selected_ai, selected_script, here, verbose=False, tracker=tracker, client=local_client, debug=debug, github_token=github_token)
+            extraction_summary = {}
+            if template_archive:
+                download_and_extract_template(project_path, selected_ai, selected_script, here, verbose=False, tracker=tracker, client=local_client, debug=debug, github_token=github_token, use_cache=not no_cache, offline=offline, template_archive=template_archive, summary=extraction_summary)
+            else:
+                download_and_extract_templates(project_path, variants, here, verbose=False, tracker=tracker, client=local_client, debug=debug, github_token=github_token, use_cache=not no_cache, offline=offline, summary=extraction_summary)
 
-            ensure_executable_scripts(project_path, tracker=tracker)
+            if not extraction_summary.get("mode_bits"):
+                ensure_executable_scripts(project_path, tracker=tracker)
 
             if not no_git:
                 tracker.start("git")
@@ -1166,11 +3855,30 @@ def init(
                 console.print(Panel("\n".join(env_lines), title="Debug Environment", border_style="magenta"))
             if not here and project_path.exists():
                 shutil.rmtree(project_path)
+            if timings:
+                print_step_timings(tracker)
             raise typer.Exit(1)
         finally:
-            pass
+            if trace_file:
+                final_status = next((row["status"] for row in tracker.timings() if row["key"] == "final"), "error")
+                try:
+                    write_step_trace(tracker, trace_file, {
+                        "command": "init",
+                        "ai": selected_ais,
+                        "script": selected_scripts,
+                        "offline": bool(offline or template_archive),
+                        "cache": not no_cache,
+                        "status": "ok" if final_status == "done" else "failed",
+                        "python": sys.version.split()[0],
+                        "platform": sys.platform,
+                    })
+                except OSError as e:
+                    console.print(f"[yellow]Warning:[/yellow] could not write trace file {trace_file}: {e}")
 
     console.print(tracker.render())
+    if timings:
+        console.print()
+        print_step_timings(tracker)
     console.print("\n[bold green]Project ready.[/bold green]")
     
     # Show git error details if initialization failed
@@ -1191,12 +3899,12 @@ def init(
         console.print(git_error_panel)
 
     # Agent folder security notice
-    agent_config = AGENT_CONFIG.get(selected_ai)
-    if agent_config:
-        agent_folder = agent_config["folder"]
+    agent_folders = [AGENT_CONFIG[ai]["folder"] for ai in selected_ais if ai in AGENT_CONFIG]
+    if agent_folders:
+        agent_folder = ", ".join(f"[cyan]{folder}[/cyan]" for folder in dict.fromkeys(agent_folders))
         security_notice = Panel(
             f"Some agents may store credentials, auth tokens, or other identifying and private artifacts in the agent folder within your project.\n"
-            f"Consider adding [cyan]{agent_folder}[/cyan] (or parts of it) to [cyan].gitignore[/cyan] to prevent accidental credential leakage.",
+            f"Consider adding {agent_folder} (or parts of it) to [cyan].gitignore[/cyan] to prevent accidental credential leakage.",
             title="[yellow]Agent Folder Security[/yellow]",
             border_style="yellow",
             padding=(1, 2)
@@ -1213,7 +3921,7 @@ def init(
         step_num = 2
 
     # Add Codex-specific setup step if needed
-    if selected_ai == "codex":
+    if "codex" in selected_ais:
         codex_path = project_path / ".codex"
         quoted_path = shlex.quote(str(codex_path))
         if os.name == "nt":  # Windows
@@ -1247,46 +3955,593 @@ def init(
     console.print()
     console.print(enhancements_panel)
 
+def _load_init_manifest(manifest: Path) -> list[dict]:
+    """Parse an init-many manifest into normalized project jobs.
+
+    The manifest is a list of projects, or an object with ``projects`` and optional
+    ``defaults`` applied to every project. Each project has a ``name`` and optionally
+    ``path`` (relative to the manifest), ``ai`` and ``script`` (strings, comma lists or
+    lists), ``git`` (default true) and ``force`` (merge into an existing directory).
+    YAML manifests (.yml/.yaml) require PyYAML. Raises ValueError listing every problem.
+    """
+    text = manifest.read_text(encoding="utf-8")
+    if manifest.suffix.lower() in (".yml", ".yaml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("YAML manifests require PyYAML (pip install pyyaml); use a JSON manifest instead")
+        data = yaml.safe_load(text)
+    else:
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {e}")
+
+    defaults: dict = {}
+    projects = data
+    if isinstance(data, dict):
+        defaults = data.get("defaults") or {}
+        projects = data.get("projects")
+    if not isinstance(projects, list) or not projects:
+        raise ValueError("Manifest must contain a non-empty list of projects")
+
+    default_script = "ps" if os.name == "nt" else "sh"
+    base_dir = manifest.resolve().parent
+    jobs: list[dict] = []
+    problems: list[str] = []
+    seen_names: set[str] = set()
+    seen_paths: set[Path] = set()
+
+    def choices(value) -> list[str]:
+        if isinstance(value, (list, tuple)):
+            return list(dict.fromkeys(str(v).strip() for v in value if str(v).strip()))
+        return _split_choices(str(value))
+
+    for position, entry in enumerate(projects, start=1):
+        if not isinstance(entry, dict) or not entry.get("name"):
+            problems.append(f"project #{position}: missing 'name'")
+            continue
+        entry = {**defaults, **entry}
+        name = str(entry["name"])
+        if name in seen_names:
+            problems.append(f"{name}: duplicate project name")
+        seen_names.add(name)
+        ais = choices(entry.get("ai") or "")
+        scripts = choices(entry.get("script") or default_script)
+        bad_ais = [ai for ai in ais if ai not in AGENT_CONFIG]
+        bad_scripts = [script for script in scripts if script not in SCRIPT_TYPE_CHOICES]
+        if not ais:
+            problems.append(f"{name}: missing 'ai'")
+        if bad_ais:
+            problems.append(f"{name}: invalid AI assistant(s) {', '.join(bad_ais)}")
+        if bad_scripts:
+            problems.append(f"{name}: invalid script type(s) {', '.join(bad_scripts)}")
+        project_path = (base_dir / str(entry.get("path") or name)).resolve()
+        if project_path in seen_paths:
+            problems.append(f"{name}: duplicate project path {project_path}")
+        seen_paths.add(project_path)
+        jobs.append({
+            "name": name,
+            "path": str(project_path),
+            "variants": [(ai, script) for ai in ais for script in scripts],
+            "git": bool(entry.get("git", True)),
+            "force": bool(entry.get("force", False)),
+        })
+
+    if problems:
+        raise ValueError("\n".join(problems))
+    return jobs
+
+def _init_project_worker(job: dict) -> dict:
+    """Extract one init-many project from local archives and initialize git.
+
+    Runs in a worker process, so each project gets its own working directory for
+    init_git_repo. A failed project only removes the directory it created itself.
+    """
+    started = time.monotonic()
+    project_path = Path(job["path"])
+    result = {"name": job["name"], "ok": False, "files": 0, "git": "skipped", "error": None}
+    created = False
+    try:
+        if project_path.exists() and not job["force"]:
+            raise RuntimeError(f"Directory already exists: {project_path} (set \"force\": true to merge)")
+        if not project_path.exists():
+            project_path.mkdir(parents=True)
+            created = True
+        archives = [(Path(archive), meta) for archive, meta in job["archives"]]
+        extracted = extract_fetched_templates(archives, project_path, merge=not created, verbose=False, use_store=job["use_store"])
+        result["files"] = extracted["files"]
+        write_install_record(project_path, job["release"], job["variants"], extracted["hashes"])
+        if not extracted["mode_bits"]:
+            ensure_executable_scripts(project_path, verbose=False)
+
+        if job["git"] and job["git_available"]:
+            if is_git_repo(project_path):
+                result["git"] = "existing repo"
+            else:
+                success, error_msg = init_git_repo(project_path, quiet=True)
+                result["git"] = "initialized" if success else "init failed"
+                if not success:
+                    result["error"] = error_msg
+        elif job["git"]:
+            result["git"] = "git not available"
+        result["ok"] = result["error"] is None
+    except Exception as e:
+        result["error"] = str(e)
+        if created and project_path.exists():
+            shutil.rmtree(project_path, ignore_errors=True)
+    result["seconds"] = time.monotonic() - started
+    return result
+
+@app.command("init-many")
+def init_many(
+    manifest: Path = typer.Argument(..., help="JSON manifest (or YAML, with PyYAML installed) listing the projects to create"),
+    jobs: int = typer.Option(None, "--jobs", "-j", help="Number of worker processes for extraction and git init (default: CPU count)"),
+    skip_tls: bool = typer.Option(False, "--skip-tls", help="Skip SSL/TLS verification (not recommended)"),
+    debug: bool = typer.Option(False, "--debug", help="Show verbose diagnostic output for network failures"),
+    github_token: str = typer.Option(None, "--github-token", help="GitHub token to use for API requests (or set GH_TOKEN or GITHUB_TOKEN environment variable)"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Bypass the local template cache and always download the archives"),
+    offline: bool = typer.Option(False, "--offline", help="Do not contact GitHub; use the most recent cached templates"),
+):
+    """
+    Initialize many Specify projects from a manifest.
+
+    The latest release is resolved once and each distinct template is fetched once;
+    extraction and git initialization then run in parallel worker processes. A project
+    that fails does not affect the others. Agent CLI tools are not checked.
+
+    Example manifest (projects.json):
+        {
+          "defaults": {"ai": "claude", "script": "sh"},
+          "projects": [
+            {"name": "billing-service"},
+            {"name": "search-service", "ai": "claude,gemini", "git": false}
+          ]
+        }
+
+    Examples:
+        specify init-many projects.json
+        specify init-many projects.yaml --jobs 8
+        specify init-many projects.json --offline
+    """
+    import tempfile
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    from rich.table import Table
+
+    show_banner()
+
+    try:
+        project_jobs = _load_init_manifest(manifest)
+    except (OSError, ValueError) as e:
+        console.print(Panel(str(e), title="[red]Invalid Manifest[/red]", border_style="red", padding=(1, 2)))
+        raise typer.Exit(1)
+
+    variants = list(dict.fromkeys(variant for job in project_jobs for variant in job["variants"]))
+    git_available = any(job["git"] for job in project_jobs) and check_tool("git")
+    console.print(f"[cyan]Manifest:[/cyan] {len(project_jobs)} projects, {len(variants)} distinct templates")
+
+    started = time.monotonic()
+    try:
+        fetched = fetch_template_archives(
+            variants,
+            client=http_session.client(verify_tls=not skip_tls),
+            debug=debug,
+            github_token=github_token,
+            use_cache=not no_cache,
+            offline=offline,
+        )
+    except Exception as e:
+        if not isinstance(e, typer.Exit):
+            console.print(Panel(str(e), title="[red]Template Fetch Failed[/red]", border_style="red"))
+        raise typer.Exit(1)
+
+    with tempfile.TemporaryDirectory(prefix="specify-init-many-", dir=_spool_dir()) as staging:
+        # Worker processes need archive paths; cached archives already have one
+        archive_paths: dict[Tuple[str, str], list[Tuple[str, dict]]] = {}
+        for archive, meta in fetched.values():
+            if meta.get("in_memory"):
+                staged = Path(staging) / meta["filename"]
+                with archive, open(staged, "wb") as dst:
+                    shutil.copyfileobj(archive, dst, 1024 * 1024)
+                archive = staged
+            for variant in meta["variants"]:
+                archive_paths.setdefault(variant, []).append((str(archive), meta))
+            if not no_cache and meta.get("sha256"):
+                # Unpack each template into the store once, before the workers materialize from it
+                try:
+                    TemplateStore().tree(meta["sha256"], Path(archive))
+                except OSError:
+                    pass
+        console.print(f"[cyan]Templates ready in {time.monotonic() - started:.2f}s[/cyan]")
+
+        for job in project_jobs:
+            layers = dict(layer for variant in job["variants"] for layer in archive_paths[variant])
+            job["archives"] = list(layers.items())
+            job["release"] = _release_label(layers.values())
+            job["git_available"] = git_available
+            job["use_store"] = not no_cache
+
+        results: dict[str, dict] = {}
+        workers = max(1, min(jobs or os.cpu_count() or 1, len(project_jobs)))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_init_project_worker, job): job for job in project_jobs}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {"name": job["name"], "ok": False, "files": 0, "git": "-", "error": str(e), "seconds": 0.0}
+                results[job["name"]] = result
+                if result["ok"]:
+                    console.print(f"[green]✓[/green] {result['name']} [dim]({result['seconds']:.2f}s)[/dim]")
+                else:
+                    console.print(f"[red]✗[/red] {result['name']}: {result['error']}")
+
+    table = Table(title="Init Summary", show_header=True, header_style="cyan")
+    table.add_column("Project")
+    table.add_column("Agents")
+    table.add_column("Script")
+    table.add_column("Files", justify="right")
+    table.add_column("Git")
+    table.add_column("Time", justify="right")
+    table.add_column("Status")
+    failures = 0
+    for job in project_jobs:
+        result = results[job["name"]]
+        agents = ", ".join(dict.fromkeys(agent for agent, _ in job["variants"]))
+        scripts = ", ".join(dict.fromkeys(script for _, script in job["variants"]))
+        status = "[green]ok[/green]" if result["ok"] else "[red]failed[/red]"
+        failures += not result["ok"]
+        table.add_row(job["name"], agents, scripts, str(result["files"]), result["git"], f"{result['seconds']:.2f}s", status)
+    console.print()
+    console.print(table)
+    console.print(f"\n[bold]{len(project_jobs) - failures} succeeded, {failures} failed[/bold] in {time.monotonic() - started:.2f}s")
+    if failures:
+        raise typer.Exit(1)
+
+def _sha256_file(path: Path) -> Optional[str]:
+    """SHA-256 of a regular file, or None if there is no such file."""
+    if not path.is_file():
+        return None
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _sha256_entry(zip_ref: zipfile.ZipFile, info: zipfile.ZipInfo) -> str:
+    digest = hashlib.sha256()
+    with zip_ref.open(info) as src:
+        while chunk := src.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+UPGRADE_STATUS_STYLES = {
+    "added": "green",
+    "updated": "green",
+    "merged": "cyan",
+    "overwritten": "yellow",
+    "removed": "yellow",
+    "kept": "dim",
+    "missing": "dim",
+    "conflict": "red",
+    "orphaned": "red",
+}
+
+def _manifest_entry_hashes(metas) -> Optional[dict[str, str]]:
+    """Project-relative path -> SHA-256 from the asset manifest entries of each template (first wins), or None if any lacks them."""
+    hashes: dict[str, str] = {}
+    for meta in metas:
+        entries = meta.get("entries")
+        if not entries:
+            return None
+        prefix = _archive_root_prefix([entry["path"] for entry in entries])
+        for entry in entries:
+            hashes.setdefault(entry["path"][len(prefix):], entry["sha256"])
+    return hashes
+
+def upgrade_template_files(zip_refs: list[zipfile.ZipFile], project_path: Path, record: dict | None, *, force: bool = False, dry_run: bool = False, upstream: dict[str, str] | None = None) -> Tuple[list[Tuple[str, str]], dict[str, str]]:
+    """Apply new template archives to an existing project, one file at a time.
+
+    Each file is compared three ways: the hash recorded at install time (``record``, see
+    write_install_record), the file on disk, and the new archive entry. Only files still
+    matching the recorded hash are rewritten; locally modified files are flagged as
+    ``conflict`` (or overwritten with ``force``) and ``.vscode/settings.json`` is merged.
+    Files dropped upstream are removed when untouched and flagged as ``orphaned`` otherwise.
+
+    ``upstream`` supplies the new hashes from the release's asset manifest, so only the
+    entries that are actually written are read from the archives (which matters for a
+    RemoteZipReader); their content is checked against those hashes.
+
+    Returns (changes, hashes): a ``(path, status)`` list for every file that is not
+    unchanged, and the hashes for the next record. A template file gets its new upstream
+    hash once the project has that version (written, merged or already identical); files
+    left alone (conflicts, deliberately deleted files) keep their recorded hash, so the
+    next upgrade still sees them as locally modified.
+    """
+    root = project_path.resolve()
+    plan, _, _ = _plan_archive_entries(zip_refs)
+    recorded: dict[str, str] = record["files"] if record else {}
+    upstream = upstream or {}
+    umask = _current_umask()
+    changes: list[Tuple[str, str]] = []
+    upstream_hashes: dict[str, str] = {}
+    hashes: dict[str, str] = {}
+    writes: list[Tuple[str, str]] = []
+
+    _prefetch_entries([entry for rel_name, entry in plan.items() if rel_name not in upstream])
+    for rel_name, (zip_ref, info) in plan.items():
+        if info.is_dir():
+            continue
+        dest = root / rel_name
+        new = upstream_hashes[rel_name] = upstream.get(rel_name) or _sha256_entry(zip_ref, info)
+        old = recorded.get(rel_name)
+        local = _sha256_file(dest)
+
+        if local is None and dest.exists():
+            status = "conflict"  # Something other than a file is in the way
+        elif local is None:
+            status = "missing" if old and not force else "added"
+        elif local == new:
+            hashes[rel_name] = new
+            continue
+        elif old == new and not force:
+            status = "kept"
+        elif local == old:
+            status = "updated"
+        elif dest.name == "settings.json" and dest.parent.name == ".vscode":
+            status = "merged"
+        else:
+            status = "overwritten" if force else "conflict"
+        changes.append((rel_name, status))
+        if status in ("added", "updated", "overwritten", "merged"):
+            writes.append((rel_name, status))
+            hashes[rel_name] = new
+        elif old:
+            hashes[rel_name] = old
+
+    if writes and not dry_run:
+        _prefetch_entries([plan[rel_name] for rel_name, _ in writes])
+        for rel_name, status in writes:
+            zip_ref, info = plan[rel_name]
+            dest = root / rel_name
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            if status == "merged":
+                handle_vscode_settings_bytes(zip_ref.read(info), dest, Path(rel_name))
+                continue
+            digest = _write_archive_entry(zip_ref, info, dest)
+            if digest != upstream_hashes[rel_name]:
+                raise RuntimeError(f"Checksum mismatch for {rel_name}: expected SHA-256 {upstream_hashes[rel_name]}, got {digest}")
+            _apply_archive_mode(info, dest, umask)
+
+    for rel_name, old in recorded.items():
+        if rel_name in upstream_hashes:
+            continue
+        dest = root / rel_name
+        local = _sha256_file(dest)
+        if local is None:
+            continue
+        if local == old:
+            changes.append((rel_name, "removed"))
+            if not dry_run:
+                dest.unlink()
+        else:
+            changes.append((rel_name, "orphaned"))
+
+    return changes, hashes
+
 @app.command()
-def check():
-    """Check that all required tools are installed."""
+def upgrade(
+    path: Path = typer.Argument(Path("."), help="Project directory to upgrade (default: current directory)"),
+    ai_assistant: str = typer.Option(None, "--ai", help="AI assistant(s) to upgrade (default: those recorded at init; comma-separate for several)"),
+    script_type: str = typer.Option(None, "--script", help="Script type(s) to upgrade: sh, ps or sh,ps (default: those recorded at init)"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Show what would change without writing any files"),
+    force: bool = typer.Option(False, "--force", help="Overwrite locally modified files and restore deleted ones"),
+    skip_tls: bool = typer.Option(False, "--skip-tls", help="Skip SSL/TLS verification (not recommended)"),
+    debug: bool = typer.Option(False, "--debug", help="Show verbose diagnostic output for network failures"),
+    github_token: str = typer.Option(None, "--github-token", help="GitHub token to use for API requests (or set GH_TOKEN or GITHUB_TOKEN environment variable)"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Bypass the local template cache and always download the archive"),
+    offline: bool = typer.Option(False, "--offline", help="Do not contact GitHub; use the most recent cached template"),
+):
+    """
+    Upgrade a Specify project to the latest template, rewriting only what changed.
+
+    `specify init` records the SHA-256 of every template file in .specify/install.json.
+    A file is rewritten only when the new release changes it and the local copy still
+    matches the recorded hash; locally modified files (such as a customized constitution)
+    are flagged instead of overwritten. Files the new release no longer ships are
+    removed if untouched.
+
+    Examples:
+        specify upgrade
+        specify upgrade --dry-run
+        specify upgrade path/to/project --force
+        specify upgrade --ai claude --script sh   # Projects created before install records
+    """
+    import zipfile
+    from rich.table import Table
+
     show_banner()
-    console.print("[bold]Checking for installed tools...[/bold]\n")
 
-    tracker = StepTracker("Check Available Tools")
+    project_path = path.resolve()
+    if not (project_path / ".specify").is_dir():
+        console.print(f"[red]Error:[/red] {project_path} is not a Specify project (no .specify directory)")
+        raise typer.Exit(1)
+
+    try:
+        record = load_install_record(project_path)
+    except ValueError as e:
+        console.print(Panel(str(e), title="[red]Invalid Install Record[/red]", border_style="red", padding=(1, 2)))
+        raise typer.Exit(1)
+
+    recorded_variants = [tuple(variant) for variant in record.get("variants", [])] if record else []
+    if ai_assistant:
+        selected_ais = _split_choices(ai_assistant)
+        for ai in selected_ais:
+            if ai not in AGENT_CONFIG:
+                console.print(f"[red]Error:[/red] Invalid AI assistant '{ai}'. Choose from: {', '.join(AGENT_CONFIG.keys())}")
+                raise typer.Exit(1)
+    elif recorded_variants:
+        selected_ais = list(dict.fromkeys(agent for agent, _ in recorded_variants))
+    else:
+        console.print("[red]Error:[/red] This project has no install record; pass --ai (and --script) to name the templates it was created from")
+        raise typer.Exit(1)
+    if script_type:
+        selected_scripts = _split_choices(script_type)
+        for script in selected_scripts:
+            if script not in SCRIPT_TYPE_CHOICES:
+                console.print(f"[red]Error:[/red] Invalid script type '{script}'. Choose from: {', '.join(SCRIPT_TYPE_CHOICES.keys())}")
+                raise typer.Exit(1)
+    elif recorded_variants:
+        selected_scripts = list(dict.fromkeys(script for _, script in recorded_variants))
+    else:
+        selected_scripts = ["ps" if os.name == "nt" else "sh"]
+    variants = [(agent, script) for agent in selected_ais for script in selected_scripts]
+
+    client = http_session.client(verify_tls=not skip_tls)
+    if not offline:
+        # Finding new releases is the point of upgrade: ask the server even within the
+        # metadata TTL (a conditional request), so the fetch below sees the fresh entry
+        release_data, _ = fetch_latest_release(client, verbose=False, debug=debug, github_token=github_token, use_cache=not no_cache, revalidate=True)
+        if record and not force and set(variants) == set(recorded_variants) and release_data["tag_name"] == record.get("release"):
+            console.print(f"[green]Already up to date[/green] with release {record['release']}")
+            return
+
+    try:
+        fetched = fetch_template_archives(
+            variants,
+            client=client,
+            debug=debug,
+            github_token=github_token,
+            use_cache=not no_cache,
+            offline=offline,
+            remote=True,
+        )
+    except Exception as e:
+        if not isinstance(e, typer.Exit):
+            console.print(Panel(str(e), title="[red]Template Fetch Failed[/red]", border_style="red"))
+        raise typer.Exit(1)
+
+    release = _release_label(meta for _, meta in fetched.values())
+    upstream = _manifest_entry_hashes(meta for _, meta in fetched.values())
+    try:
+        zip_refs = [zipfile.ZipFile(archive, 'r') for archive, _ in fetched.values()]
+        try:
+            changes, hashes = upgrade_template_files(zip_refs, project_path, record, force=force, dry_run=dry_run, upstream=upstream)
+        finally:
+            for zip_ref in zip_refs:
+                zip_ref.close()
+        if not dry_run:
+            write_install_record(project_path, release, variants, hashes)
+    except Exception as e:
+        console.print(Panel(str(e), title="[red]Upgrade Failed[/red]", border_style="red"))
+        raise typer.Exit(1)
+    finally:
+        remote_reads = [archive for archive, meta in fetched.values() if meta.get("remote")]
+        for archive, meta in fetched.values():
+            if meta.get("in_memory"):
+                archive.close()
+
+    if remote_reads:
+        console.print(f"[cyan]Fetched {sum(r.fetched for r in remote_reads):,} bytes in {sum(r.requests for r in remote_reads)} range requests[/cyan]")
+    previous = record.get("release", "unknown") if record else "unknown"
+    console.print(f"\n[cyan]Release:[/cyan] {previous} -> {release}" + (" [dim](dry run, nothing written)[/dim]" if dry_run else ""))
+    if changes:
+        table = Table(show_header=True, header_style="cyan")
+        table.add_column("File")
+        table.add_column("Status")
+        for rel_name, status in sorted(changes):
+            table.add_row(rel_name, f"[{UPGRADE_STATUS_STYLES[status]}]{status}[/{UPGRADE_STATUS_STYLES[status]}]")
+        console.print(table)
+
+    counts: dict[str, int] = {}
+    for _, status in changes:
+        counts[status] = counts.get(status, 0) + 1
+    changed = {rel_name for rel_name, _ in changes}
+    unchanged = sum(1 for rel_name in hashes if rel_name not in changed)
+    summary = ", ".join(f"{count} {status}" for status, count in counts.items())
+    console.print(f"[bold]{summary + ', ' if summary else ''}{unchanged} unchanged[/bold]")
+
+    hints = []
+    if counts.get("conflict"):
+        hints.append("- [red]conflict[/red]: the new release changes the file as well; merge by hand or re-run with [cyan]--force[/cyan] to take the new version")
+    if counts.get("orphaned"):
+        hints.append("- [red]orphaned[/red]: the new release no longer ships the file; delete it once it is no longer needed")
+    if hints:
+        console.print(Panel(
+            "These files were modified locally and left untouched:\n" + "\n".join(hints),
+            title="[yellow]Local Changes Kept[/yellow]",
+            border_style="yellow",
+            padding=(1, 2),
+        ))
 
-    tracker.add("git", "Git version control")
-    git_ok = check_tool("git", tracker=tracker)
+@app.command()
+def check(
+    json_output: bool = typer.Option(False, "--json", help="Print the results as JSON (no banner) for automation"),
+    versions: bool = typer.Option(False, "--versions", help="Also report the version of every detected tool (probed concurrently)"),
+    timeout: float = typer.Option(DEFAULT_VERSION_TIMEOUT, "--timeout", help="Seconds to wait for each '<tool> --version' probe"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Re-probe tool versions instead of using cached results"),
+):
+    """Check that all required tools are installed."""
+    tools = [("git", "Git version control", True)]
+    tools += [(agent_key, agent_config["name"], agent_config["requires_cli"]) for agent_key, agent_config in AGENT_CONFIG.items()]
+    # Check VS Code variants (not in agent config)
+    tools += [("code", "Visual Studio Code", True), ("code-insiders", "Visual Studio Code Insiders", True)]
+
+    if json_output:
+        results = {}
+        for key, name, requires_cli in tools:
+            path = find_tool(key) if requires_cli else None
+            results[key] = {"name": name, "requires_cli": requires_cli, "found": path is not None, "path": path}
+        if versions:
+            found = {key: result["path"] for key, result in results.items() if result["path"]}
+            for key, probe in probe_tool_versions(found, timeout=timeout, use_cache=not no_cache).items():
+                results[key]["version"] = probe["version"]
+                if probe["error"]:
+                    results[key]["version_error"] = probe["error"]
+        typer.echo(json.dumps({"tools": results}, indent=2))
+        return
 
-    agent_results = {}
-    for agent_key, agent_config in AGENT_CONFIG.items():
-        agent_name = agent_config["name"]
-        requires_cli = agent_config["requires_cli"]
+    show_banner()
+    console.print("[bold]Checking for installed tools...[/bold]\n")
 
-        tracker.add(agent_key, agent_name)
+    tracker = StepTracker("Check Available Tools")
 
+    results = {}
+    found = {}
+    for key, name, requires_cli in tools:
+        tracker.add(key, name)
         if requires_cli:
-            agent_results[agent_key] = check_tool(agent_key, tracker=tracker)
+            results[key] = check_tool(key, tracker=tracker)
+            if results[key]:
+                found[key] = find_tool(key)
         else:
             # IDE-based agent - skip CLI check and mark as optional
-            tracker.skip(agent_key, "IDE-based, no CLI check")
-            agent_results[agent_key] = False  # Don't count IDE agents as "found"
+            tracker.skip(key, "IDE-based, no CLI check")
+            results[key] = False  # Don't count IDE agents as "found"
 
-    # Check VS Code variants (not in agent config)
-    tracker.add("code", "Visual Studio Code")
-    code_ok = check_tool("code", tracker=tracker)
+    if versions and found:
+        from rich.live import Live
+
+        def show_version(key: str, probe: dict) -> None:
+            if probe["version"]:
+                tracker.complete(key, f"v{probe['version']}" + (", cached" if probe["cached"] else ""))
+            else:
+                tracker.complete(key, f"available, version unknown: {probe['error']}")
 
-    tracker.add("code-insiders", "Visual Studio Code Insiders")
-    code_insiders_ok = check_tool("code-insiders", tracker=tracker)
+        for key in found:
+            tracker.start(key, "probing version")
+        with Live(tracker, console=console, refresh_per_second=8, transient=True):
+            probe_tool_versions(found, timeout=timeout, use_cache=not no_cache, on_result=show_version)
 
     console.print(tracker.render())
 
     console.print("\n[bold green]Specify CLI is ready to use![/bold green]")
 
-    if not git_ok:
+    if not results["git"]:
         console.print("[dim]Tip: Install git for repository management[/dim]")
 
-    if not any(agent_results.values()):
+    if not any(results[agent_key] for agent_key in AGENT_CONFIG):
         console.print("[dim]Tip: Install an AI assistant for the best experience[/dim]")
 
 @app.command()
@@ -1314,38 +4569,32 @@ def version():
             pass
     
     # Fetch latest template release version
-    # Support custom repository via environment variables for testing and enterprise use
-    repo_owner = os.getenv("SPEC_KIT_REPO_OWNER", "github")
-    repo_name = os.getenv("SPEC_KIT_REPO_NAME", "spec-kit")
-    api_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases/latest"
-    
     template_version = "unknown"
     release_date = "unknown"
     
     try:
-        response = client.get(
-            api_url,
+        release_data, _ = fetch_latest_release_data(
+            http_session.client(),
             timeout=10,
-            follow_redirects=True,
-            headers=_github_auth_headers(),
+            stale_while_revalidate=True,
         )
-        if response.status_code == 200:
-            release_data = response.json()
-            template_version = release_data.get("tag_name", "unknown")
-            # Remove 'v' prefix if present
-            if template_version.startswith("v"):
-                template_version = template_version[1:]
-            release_date = release_data.get("published_at", "unknown")
-            if release_date != "unknown":
-                # Format the date nicely
-                try:
-                    dt = datetime.fromisoformat(release_date.replace('Z', '+00:00'))
-                    release_date = dt.strftime("%Y-%m-%d")
-                except Exception:
-                    pass
+        template_version = release_data.get("tag_name", "unknown")
+        # Remove 'v' prefix if present
+        if template_version.startswith("v"):
+            template_version = template_version[1:]
+        release_date = release_data.get("published_at", "unknown")
+        if release_date != "unknown":
+            # Format the date nicely
+            try:
+                dt = datetime.fromisoformat(release_date.replace('Z', '+00:00'))
+                release_date = dt.strftime("%Y-%m-%d")
+            except Exception:
+                pass
     except Exception:
         pass
 
+    from rich.table import Table
+
     info_table = Table(show_header=False, box=None, padding=(0, 2))
     info_table.add_column("Key", style="cyan", justify="right")
     info_table.add_column("Value", style="white")
@@ -1368,9 +4617,403 @@ def version():
 
     console.print(panel)
     console.print()
+    wait_for_background_refreshes()
+
+# Release packaging: a Python port of .github/workflows/scripts/create-release-packages.sh.
+# Each command template is parsed once and rendered for every agent/script pair in-process;
+# check-template-parity.sh keeps the two builders' archive contents identical.
+
+TEMPLATE_COMMAND_LAYOUT = {
+    "claude": (".claude/commands", "md"),
+    "gemini": (".gemini/commands", "toml"),
+    "copilot": (".github/agents", "agent.md"),
+    "cursor-agent": (".cursor/commands", "md"),
+    "qwen": (".qwen/commands", "toml"),
+    "opencode": (".opencode/command", "md"),
+    "windsurf": (".windsurf/workflows", "md"),
+    "codex": (".codex/prompts", "md"),
+    "kilocode": (".kilocode/workflows", "md"),
+    "auggie": (".augment/commands", "md"),
+    "roo": (".roo/commands", "md"),
+    "codebuddy": (".codebuddy/commands", "md"),
+    "amp": (".agents/commands", "md"),
+    "shai": (".shai/commands", "md"),
+    "q": (".amazonq/prompts", "md"),
+    "bob": (".bob/commands", "md"),
+    "qoder": (".qoder/commands", "md"),
+    "catpaw": (".catpaw/commands", "md"),
+}
+# Agent context files copied to the project root when the source tree has them
+TEMPLATE_ROOT_FILES = {"gemini": "agent_templates/gemini/GEMINI.md", "qwen": "agent_templates/qwen/QWEN.md"}
+
+def _sed_replacement(replacement: str, matched: str) -> str:
+    """Expand a sed s/// replacement the way GNU sed does: & is the match, \\n a newline, \\x is x."""
+    out = []
+    chars = iter(replacement)
+    for char in chars:
+        if char == "&":
+            out.append(matched)
+        elif char == "\\":
+            escaped = next(chars, "")
+            out.append("\n" if escaped == "n" else escaped)
+        else:
+            out.append(char)
+    return "".join(out)
+
+def _frontmatter_value(lines: list[str], key: str, *, section: str | None = None) -> Optional[str]:
+    """First ``key:`` value in ``lines`` (only inside the top-level ``section:`` block if given), matched as the packaging awk does."""
+    prefix = re.compile(rf"^[ \t\v\f]*{re.escape(key)}:[ \t\v\f]*")
+    in_section = section is None
+    for line in lines:
+        if section is not None and line == f"{section}:":
+            in_section = True
+            continue
+        if in_section and (match := prefix.match(line)):
+            return line[match.end():]
+        if section is not None and in_section and re.match(r"[a-zA-Z]", line):
+            in_section = False
+    return None
+
+def parse_command_template(path: Path) -> dict:
+    """Parse a templates/commands/*.md file once: its name, description and per-script-type commands."""
+    content = path.read_bytes().decode("utf-8").replace("\r", "").rstrip("\n")
+    lines = content.split("\n")
+    description = next((re.sub(r"^description:[ \t\v\f]*", "", line) for line in lines if line.startswith("description:")), "")
+    return {
+        "name": path.stem,
+        "description": description,
+        "content": content,
+        "scripts": {script: _frontmatter_value(lines, script) for script in SCRIPT_TYPE_CHOICES},
+        "agent_scripts": {script: _frontmatter_value(lines, script, section="agent_scripts") for script in SCRIPT_TYPE_CHOICES},
+    }
+
+def _strip_script_frontmatter(lines: list[str]) -> list[str]:
+    """Drop the scripts: and agent_scripts: blocks from the YAML frontmatter, keeping everything else."""
+    kept = []
+    dashes = 0
+    in_frontmatter = skipping = False
+    for line in lines:
+        if line == "---":
+            dashes += 1
+            in_frontmatter = dashes == 1
+            kept.append(line)
+            continue
+        if in_frontmatter and line in ("scripts:", "agent_scripts:"):
+            skipping = True
+            continue
+        if in_frontmatter and skipping and re.match(r"[a-zA-Z].*:", line):
+            skipping = False
+        if in_frontmatter and skipping and re.match(r"[ \t\v\f]", line):
+            continue
+        kept.append(line)
+    return kept
+
+def _rewrite_template_paths(text: str) -> str:
+    """Point repository-relative memory/, scripts/ and templates/ paths at their .specify/ location."""
+    for folder in ("memory", "scripts", "templates"):
+        text = re.sub(rf"/?{folder}/", f".specify/{folder}/", text)
+    return text
+
+def render_command_template(template: dict, agent: str, script: str, ext: str) -> str:
+    """Render a parsed command template for one agent and script type (md, agent.md or toml).
+
+    A template without a command for ``script`` gets a placeholder, as the shell packager
+    writes; build_template_packages warns about those.
+    """
+    script_command = template["scripts"][script] or f"(Missing script command for {script})"
+    body = template["content"].replace("{SCRIPT}", _sed_replacement(script_command, "{SCRIPT}"))
+    agent_script_command = template["agent_scripts"][script]
+    if agent_script_command:
+        body = body.replace("{AGENT_SCRIPT}", _sed_replacement(agent_script_command, "{AGENT_SCRIPT}"))
+    body = "\n".join(_strip_script_frontmatter(body.rstrip("\n").split("\n"))).rstrip("\n")
+    body = body.replace("{ARGS}", "{{args}}" if ext == "toml" else "$ARGUMENTS").replace("__AGENT__", agent)
+    body = _rewrite_template_paths(body).rstrip("\n")
+    if ext == "toml":
+        body = body.replace("\\", "\\\\")
+        return f'description = "{template["description"]}"\n\nprompt = """\n{body}\n"""\n'
+    return f"{body}\n"
+
+def _package_file(path: Path, umask: int, mode: int | None = None) -> Tuple[bytes, int]:
+    return path.read_bytes(), (mode if mode is not None else path.stat().st_mode & 0o777 & ~umask)
+
+def _specify_package_files(source: Path, script: str, umask: int) -> dict[str, Tuple[bytes, int]]:
+    """The .specify tree of a template for one script type: memory, scripts and templates."""
+    files: dict[str, Tuple[bytes, int]] = {}
+    memory = source / "memory"
+    if memory.is_dir():
+        for path in sorted(p for p in memory.rglob("*") if p.is_file()):
+            files[f".specify/memory/{path.relative_to(memory).as_posix()}"] = _package_file(path, umask)
+    scripts = source / "scripts"
+    if scripts.is_dir():
+        variant = scripts / ("bash" if script == "sh" else "powershell")
+        candidates = [p for p in variant.rglob("*") if p.is_file()] if variant.is_dir() else []
+        candidates += [p for p in scripts.iterdir() if p.is_file()]
+        for path in sorted(candidates):
+            rel = path.relative_to(scripts).as_posix()
+            # Execute bits are stored in the archive so the CLI can apply them while extracting
+            files[f".specify/scripts/{rel}"] = _package_file(path, umask, 0o755 if path.suffix == ".sh" else None)
+    templates = source / "templates"
+    if templates.is_dir():
+        for path in sorted(p for p in templates.rglob("*") if p.is_file()):
+            rel = path.relative_to(templates).as_posix()
+            if rel.startswith("commands/") or path.name == "vscode-settings.json":
+                continue
+            files[f".specify/templates/{rel}"] = _package_file(path, umask)
+    return files
+
+def _agent_package_files(source: Path, agent: str, script: str, commands: list[dict], umask: int) -> dict[str, Tuple[bytes, int]]:
+    """The agent-specific files of a template: rendered commands plus agent extras."""
+    folder, ext = TEMPLATE_COMMAND_LAYOUT[agent]
+    file_mode = 0o666 & ~umask
+    files = {
+        f"{folder}/speckit.{command['name']}.{ext}": (render_command_template(command, agent, script, ext).encode("utf-8"), file_mode)
+        for command in commands
+    }
+    if agent == "copilot":
+        for command in commands:
+            name = f"speckit.{command['name']}"
+            files[f".github/prompts/{name}.prompt.md"] = (f"---\nagent: {name}\n---\n".encode("utf-8"), file_mode)
+        settings = source / "templates" / "vscode-settings.json"
+        if settings.is_file():
+            files[".vscode/settings.json"] = _package_file(settings, umask)
+    root_file = source / TEMPLATE_ROOT_FILES.get(agent, "")
+    if agent in TEMPLATE_ROOT_FILES and root_file.is_file():
+        files[root_file.name] = _package_file(root_file, umask)
+    return files
+
+def _write_package_zip(path: Path, files: dict[str, Tuple[bytes, int]], date_time: Tuple[int, ...], umask: int) -> None:
+    """Write ``files`` (with a directory entry for every parent) as a deflated zip carrying Unix modes."""
+    import zipfile
+
+    names = set(files)
+    for name in files:
+        parts = name.split("/")[:-1]
+        names.update("/".join(parts[:i]) + "/" for i in range(1, len(parts) + 1))
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name in sorted(names):
+            info = zipfile.ZipInfo(name, date_time=date_time)
+            info.create_system = 3
+            if name.endswith("/"):
+                info.external_attr = ((0o40000 | (0o777 & ~umask)) << 16) | 0x10
+                zf.writestr(info, b"")
+            else:
+                data, mode = files[name]
+                info.external_attr = (0o100000 | mode) << 16
+                info.compress_type = zipfile.ZIP_DEFLATED
+                zf.writestr(info, data)
+    os.replace(tmp, path)
+
+def write_release_checksums(out_dir: Path, version: str) -> Path:
+    """Write the sha256sum-format checksum file for the template, base and overlay archives."""
+    path = out_dir / f"{CHECKSUMS_ASSET_PREFIX}{version}.txt"
+    lines = []
+    for kind in ("template", "base", "overlay"):
+        for archive in sorted(out_dir.glob(f"spec-kit-{kind}-*-{version}.zip")):
+            lines.append(f"{hashlib.sha256(archive.read_bytes()).hexdigest()}  {archive.name}\n")
+    path.write_text("".join(lines), encoding="utf-8")
+    return path
+
+def write_release_manifest(out_dir: Path, version: str) -> Path:
+    """Write the asset manifest: per-variant asset size and hash, layers, and every entry's path, size, hash and mode."""
+    import zipfile
+
+    pattern = re.compile(rf"^spec-kit-(?P<kind>template|overlay|base)-(?:(?P<agent>.+)-)?(?P<script>sh|ps)-{re.escape(version)}\.zip$")
+    manifest = {"version": 1, "release": version, "variants": {}, "layers": {}, "assets": {}}
+    for path in sorted(out_dir.glob(f"spec-kit-*-{version}.zip")):
+        match = pattern.match(path.name)
+        if not match or (match["kind"] == "base") != (match["agent"] is None):
+            continue
+        entries = []
+        with zipfile.ZipFile(path) as zf:
+            for info in zf.infolist():
+                if info.is_dir():
+                    continue
+                entries.append({
+                    "path": info.filename,
+                    "size": info.file_size,
+                    "sha256": hashlib.sha256(zf.read(info)).hexdigest(),
+                    "mode": (info.external_attr >> 16) & 0o7777,
+                })
+        if match["kind"] == "template":
+            manifest["variants"][f"{match['agent']}-{match['script']}"] = path.name
+        elif match["kind"] == "overlay":
+            manifest["layers"][f"{match['agent']}-{match['script']}"] = [f"{LAYER_BASE_PREFIX}{match['script']}-{version}.zip", path.name]
+        manifest["assets"][path.name] = {
+            "kind": match["kind"],
+            "agent": match["agent"],
+            "script": match["script"],
+            "size": path.stat().st_size,
+            "sha256": hashlib.sha256(path.read_bytes()).hexdigest(),
+            "entries": entries,
+        }
+    out_path = out_dir / f"{MANIFEST_ASSET_PREFIX}{version}.json"
+    out_path.write_text(json.dumps(manifest, indent=1, sort_keys=True) + "\n")
+    return out_path
+
+def build_template_packages(source: Path, out_dir: Path, version: str, agents: list[str], scripts: list[str], *, jobs: int | None = None, on_built=None) -> list[Path]:
+    """Build the full, overlay and base template archives for every agent/script pair in parallel.
+
+    Command templates are parsed once and each .specify tree is read once per script
+    type; variants are then rendered and compressed on a thread pool (zlib releases the
+    GIL). Archives are written to temporary files and renamed into ``out_dir``.
+    ``on_built(path)`` is called as each archive lands. Returns the archive paths.
+    Entry timestamps come from SOURCE_DATE_EPOCH when set, for reproducible archives.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    umask = _current_umask()
+    epoch = os.getenv("SOURCE_DATE_EPOCH", "").strip()
+    stamp = datetime.fromtimestamp(int(epoch), timezone.utc) if epoch.isdigit() else datetime.now()
+    date_time = tuple(max(stamp, stamp.replace(year=1980, month=1, day=1)).timetuple()[:6])
+
+    command_dir = source / "templates" / "commands"
+    commands = [parse_command_template(path) for path in sorted(command_dir.glob("*.md"))] if command_dir.is_dir() else []
+    for command in commands:
+        for script in scripts:
+            if not command["scripts"][script]:
+                console.print(f"[yellow]Warning:[/yellow] no {script} script command in {command['name']}.md; rendered with a placeholder")
+    specify_files = {script: _specify_package_files(source, script, umask) for script in scripts}
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    def build(name: str, files: dict[str, Tuple[bytes, int]]) -> Path:
+        path = out_dir / name
+        _write_package_zip(path, files, date_time, umask)
+        if on_built:
+            on_built(path)
+        return path
+
+    def build_variant(agent: str, script: str) -> list[Path]:
+        overlay = _agent_package_files(source, agent, script, commands, umask)
+        return [
+            build(f"spec-kit-template-{agent}-{script}-{version}.zip", {**specify_files[script], **overlay}),
+            build(f"{LAYER_OVERLAY_PREFIX}{agent}-{script}-{version}.zip", overlay),
+        ]
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs or os.cpu_count() or 1)) as pool:
+        futures = [pool.submit(build, f"{LAYER_BASE_PREFIX}{script}-{version}.zip", specify_files[script]) for script in scripts]
+        variant_futures = [pool.submit(build_variant, agent, script) for agent in agents for script in scripts]
+        built = [future.result() for future in futures]
+        for future in variant_futures:
+            built.extend(future.result())
+    return built
+
+@app.command("build-templates")
+def build_templates(
+    version: str = typer.Argument(..., help="Release version with a leading 'v' (e.g. v0.2.0)"),
+    agents: str = typer.Option(None, "--agents", help=f"Comma-separated agents to build (default: all). Choices: {', '.join(TEMPLATE_COMMAND_LAYOUT)}"),
+    scripts: str = typer.Option(None, "--scripts", help="Comma-separated script types to build: sh, ps (default: both)"),
+    source: Path = typer.Option(Path("."), "--source", help="Spec Kit checkout containing templates/, scripts/ and memory/"),
+    output: Path = typer.Option(Path(".genreleases"), "--output", "-o", help="Directory for the archives, checksums and manifest"),
+    jobs: int = typer.Option(None, "--jobs", "-j", help="Number of archives built concurrently (default: CPU count)"),
+):
+    """
+    Build the template release archives from a Spec Kit checkout.
+
+    Produces the same archives, checksum file and asset manifest as
+    .github/workflows/scripts/create-release-packages.sh, rendering the command
+    templates in-process and building the variants in parallel.
+
+    Examples:
+        specify build-templates v0.2.0
+        specify build-templates v0.2.0 --agents claude,copilot --scripts sh
+    """
+    if not re.fullmatch(r"v\d+\.\d+\.\d+", version):
+        console.print("[red]Error:[/red] Version must look like v0.0.0")
+        raise typer.Exit(1)
+    agent_list = _split_choices(agents) if agents else list(TEMPLATE_COMMAND_LAYOUT)
+    script_list = _split_choices(scripts) if scripts else list(SCRIPT_TYPE_CHOICES)
+    for kind, items, allowed in (("agent", agent_list, TEMPLATE_COMMAND_LAYOUT), ("script", script_list, SCRIPT_TYPE_CHOICES)):
+        invalid = [item for item in items if item not in allowed]
+        if invalid:
+            console.print(f"[red]Error:[/red] unknown {kind} {', '.join(repr(i) for i in invalid)} (allowed: {', '.join(allowed)})")
+            raise typer.Exit(1)
+    if not (source / "templates" / "commands").is_dir():
+        console.print(f"[red]Error:[/red] {source.resolve()} has no templates/commands directory (pass --source)")
+        raise typer.Exit(1)
+
+    for stale in output.glob(f"spec-kit-*-{version}.*"):
+        stale.unlink()
+
+    console.print(f"[cyan]Building release packages for {version}[/cyan]")
+    console.print(f"[cyan]Agents:[/cyan] {' '.join(agent_list)}")
+    console.print(f"[cyan]Scripts:[/cyan] {' '.join(script_list)}")
+    started = time.monotonic()
+    archives = build_template_packages(source, output, version, agent_list, script_list, jobs=jobs, on_built=lambda path: console.print(f"Created {path}"))
+    console.print(f"Created {write_release_checksums(output, version)}")
+    console.print(f"Created {write_release_manifest(output, version)}")
+    console.print(f"[green]Built {len(archives)} archives in {time.monotonic() - started:.2f}s[/green]")
+
+cache_app = typer.Typer(
+    name="cache",
+    help="Inspect and manage the local template cache",
+    add_completion=False,
+)
+app.add_typer(cache_app, name="cache")
+
+@cache_app.command("ls")
+def cache_ls():
+    """List cached template archives (most recently used first) and the unpacked store."""
+    cache = TemplateCache()
+    entries = cache.entries()
+    trees, objects, store_size = TemplateStore(cache.root).usage()
+    if not entries and not store_size:
+        console.print(f"[dim]Template cache is empty ({cache.root})[/dim]")
+        return
+
+    from rich.table import Table
+
+    table = Table(title=f"Template cache ({cache.root})", title_justify="left")
+    table.add_column("Release", style="cyan")
+    table.add_column("Asset", style="white")
+    table.add_column("Size", justify="right")
+    table.add_column("SHA-256", style="bright_black")
+    table.add_column("Last used", style="bright_black")
+
+    seen_blobs: set[str] = set()
+    total = 0
+    for entry in entries:
+        if entry["sha256"] not in seen_blobs:
+            seen_blobs.add(entry["sha256"])
+            total += entry.get("size", 0)
+        last_used = datetime.fromtimestamp(entry.get("last_used", 0)).strftime("%Y-%m-%d %H:%M")
+        table.add_row(entry["tag"], entry["asset"], _format_size(entry.get("size", 0)), entry["sha256"][:12], last_used)
+
+    if entries:
+        console.print(table)
+    if store_size:
+        console.print(f"[cyan]Unpacked store:[/cyan] {trees} tree{'' if trees == 1 else 's'}, {objects} file{'' if objects == 1 else 's'}, {_format_size(store_size)}")
+    console.print(f"[cyan]Total:[/cyan] {_format_size(total + store_size)} of {_format_size(cache.max_size)} cap")
+
+@cache_app.command("prune")
+def cache_prune(
+    max_size: str = typer.Option(None, "--max-size", help="Evict least-recently-used archives until the cache fits in this size (e.g. 200M, 1G). Defaults to SPECIFY_CACHE_MAX_SIZE or 512M"),
+):
+    """Evict least-recently-used archives until the cache fits under its size cap."""
+    limit = None
+    if max_size:
+        try:
+            limit = _parse_size(max_size)
+        except ValueError:
+            console.print(f"[red]Error:[/red] Invalid size '{max_size}'. Use a byte count or a K/M/G suffix")
+            raise typer.Exit(1)
+
+    removed = TemplateCache().prune(max_size=limit)
+    for entry in removed:
+        console.print(f"[yellow]Removed:[/yellow] {entry['key']} ({_format_size(entry.get('size', 0))})")
+    console.print(f"[green]Pruned {len(removed)} cache entr{'y' if len(removed) == 1 else 'ies'}[/green]")
+
+@cache_app.command("clear")
+def cache_clear():
+    """Remove every cached template archive."""
+    removed = TemplateCache().clear()
+    console.print(f"[green]Cleared {removed} cache entr{'y' if removed == 1 else 'ies'}[/green]")
 
 def main():
-    app()
+    try:
+        app()
+    finally:
+        http_session.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,144 @@
+"""Shared fixtures: an isolated cache and in-process HTTP servers."""
+
+import re
+import sys
+import threading
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import specify_cli
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    headers: dict[str, str]
+
+
+@dataclass
+class Response:
+    status: int = 200
+    body: bytes = b""
+    headers: dict[str, str] = field(default_factory=dict)
+    # Send only this many body bytes, then drop the connection
+    truncate: int | None = None
+
+
+def serve_bytes(request: Request, body: bytes, *, etag: str | None = None, ranges: bool = True) -> Response:
+    """Answer ``request`` for ``body`` the way a static file server does (Range and If-Range aware)."""
+    headers = {"Accept-Ranges": "bytes"} if ranges else {}
+    if etag:
+        headers["ETag"] = etag
+    match = re.fullmatch(r"bytes=(\d+)-(\d*)", request.headers.get("range", ""))
+    if_range = request.headers.get("if-range")
+    if ranges and match and (if_range is None or if_range == etag):
+        start = int(match[1])
+        end = min(int(match[2]) if match[2] else len(body) - 1, len(body) - 1)
+        if start >= len(body):
+            return Response(416, headers={**headers, "Content-Range": f"bytes */{len(body)}"})
+        headers["Content-Range"] = f"bytes {start}-{end}/{len(body)}"
+        return Response(206, body[start:end + 1], headers)
+    return Response(200, body, headers)
+
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients drop connections on purpose (aborted ranges, closed pools); anything else is a bug
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class LocalServer:
+    """HTTP/1.1 server on 127.0.0.1 that answers every request with ``handler(request)``."""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.requests: list[Request] = []
+        server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _respond(self):
+                request = Request(self.command, self.path, {k.lower(): v for k, v in self.headers.items()})
+                server.requests.append(request)
+                response = server.handler(request)
+                self.send_response(response.status)
+                for name, value in response.headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(response.body)))
+                self.end_headers()
+                if self.command == "HEAD":
+                    return
+                if response.truncate is not None:
+                    self.wfile.write(response.body[:response.truncate])
+                    self.wfile.flush()
+                    self.close_connection = True
+                    return
+                self.wfile.write(response.body)
+
+            do_GET = do_HEAD = _respond
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = _QuietServer(("127.0.0.1", 0), _Handler)
+        self.host = f"127.0.0.1:{self._httpd.server_port}"
+        self.url = f"http://{self.host}"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def local_server():
+    """Factory for LocalServer instances, shut down after the test."""
+    servers = []
+
+    def start(handler) -> LocalServer:
+        server = LocalServer(handler)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+@pytest.fixture
+def http_client():
+    import httpx
+
+    with httpx.Client() as client:
+        yield client
+
+
+@pytest.fixture(autouse=True)
+def isolated_env(tmp_path, monkeypatch):
+    """Point the cache at a temporary directory and clear tokens and release-source overrides."""
+    monkeypatch.setenv("SPECIFY_CACHE_DIR", str(tmp_path / "cache"))
+    for name in ("GH_TOKEN", "GITHUB_TOKEN", "SPEC_KIT_MIRRORS", "SPEC_KIT_API_BASE", "SPEC_KIT_DOWNLOAD_BASE"):
+        monkeypatch.delenv(name, raising=False)
+    return tmp_path
+
+
+@pytest.fixture(autouse=True)
+def retry_delays(monkeypatch):
+    """Retry without sleeping; returns the backoff delays the downloader asked for."""
+    delays: list[float] = []
+    compute = specify_cli._retry_delay
+
+    def record(attempt, headers=None):
+        delays.append(compute(attempt, headers))
+        return 0
+
+    monkeypatch.setattr(specify_cli, "_retry_delay", record)
+    return delays
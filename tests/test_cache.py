@@ -0,0 +1,100 @@
+"""TemplateCache: LRU eviction under the size cap and index/blob consistency."""
+
+import hashlib
+import io
+import json
+
+import pytest
+import typer
+
+import specify_cli
+
+TAG = "v1.0.0"
+
+
+def _store(cache, name: str, size: int = 1000) -> str:
+    data = name.encode().ljust(size, b"\0")
+    sha256 = hashlib.sha256(data).hexdigest()
+    cache.store(TAG, name, io.BytesIO(data), sha256)
+    return sha256
+
+
+def _index(cache) -> dict:
+    return json.loads(cache.index_path.read_text())["entries"]
+
+
+def _blobs(cache) -> set[str]:
+    return {path.stem for path in cache.blobs_dir.glob("*.zip")}
+
+
+def test_prune_evicts_least_recently_used_first(tmp_path):
+    cache = specify_cli.TemplateCache(max_size=10 ** 9)
+    _store(cache, "a.zip")
+    _store(cache, "b.zip")
+    _store(cache, "c.zip")
+    cache.lookup(TAG, "a.zip")  # a is now the most recently used
+
+    removed = cache.prune(max_size=2000)
+    assert [entry["key"] for entry in removed] == [f"{TAG}/b.zip"]
+
+    removed = cache.prune(max_size=1000)
+    assert [entry["key"] for entry in removed] == [f"{TAG}/c.zip"]
+    assert list(_index(cache)) == [f"{TAG}/a.zip"]
+
+
+def test_lookup_refreshes_the_access_time(tmp_path):
+    cache = specify_cli.TemplateCache(max_size=10 ** 9)
+    _store(cache, "a.zip")
+    before = _index(cache)[f"{TAG}/a.zip"]["last_used"]
+
+    assert cache.lookup(TAG, "a.zip") is not None
+    assert _index(cache)[f"{TAG}/a.zip"]["last_used"] > before
+
+
+def test_prune_keeps_index_and_blobs_consistent(tmp_path):
+    cache = specify_cli.TemplateCache(max_size=10 ** 9)
+    digests = {name: _store(cache, name) for name in ("a.zip", "b.zip", "c.zip")}
+    # Identical content under a second tag shares the blob
+    cache.link("v1.0.1", "a.zip", digests["a.zip"])
+    cache.blob_path(digests["b.zip"]).unlink()  # Deleted behind the cache's back
+
+    cache.prune(max_size=1000)
+
+    index = _index(cache)
+    assert _blobs(cache) == {entry["sha256"] for entry in index.values()}
+    assert len(_blobs(cache)) == 1
+
+
+def test_lookup_drops_an_entry_whose_blob_is_missing(tmp_path):
+    cache = specify_cli.TemplateCache(max_size=10 ** 9)
+    sha256 = _store(cache, "a.zip")
+    cache.blob_path(sha256).unlink()
+
+    assert cache.lookup(TAG, "a.zip") is None
+    assert _index(cache) == {}
+    assert cache.latest("a") is None
+
+
+def test_storing_past_the_cap_evicts_older_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr(specify_cli, "CACHE_PRUNE_GRACE", 0.0)
+    cache = specify_cli.TemplateCache(max_size=2500)
+    _store(cache, "a.zip")
+    _store(cache, "b.zip")
+    newest = _store(cache, "c.zip")
+
+    assert list(_index(cache)) == [f"{TAG}/b.zip", f"{TAG}/c.zip"]
+    assert newest in _blobs(cache) and len(_blobs(cache)) == 2
+
+
+def test_offline_resolution_fails_cleanly_when_the_blob_vanishes(tmp_path, monkeypatch):
+    cache = specify_cli.TemplateCache(max_size=10 ** 9)
+    sha256 = _store(cache, "spec-kit-template-claude-sh-v1.0.0.zip")
+    lookup = specify_cli.TemplateCache.lookup
+
+    def pruned_meanwhile(self, *args, **kwargs):
+        self.blob_path(sha256).unlink(missing_ok=True)  # Another process pruned it after latest()
+        return lookup(self, *args, **kwargs)
+
+    monkeypatch.setattr(specify_cli.TemplateCache, "lookup", pruned_meanwhile)
+    with pytest.raises(typer.Exit):
+        specify_cli.resolve_local_template("claude", "sh", verbose=False)
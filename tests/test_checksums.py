@@ -0,0 +1,67 @@
+"""Published SHA-256 checksums: archives that do not match are refused and never cached."""
+
+import hashlib
+import io
+import json
+
+import pytest
+import typer
+
+import specify_cli
+from conftest import serve_bytes
+
+TAG = "v1.0.0"
+ASSET = "spec-kit-template-claude-sh-v1.0.0.zip"
+BODY = b"PK\x05\x06" + b"\x00" * 18
+TAMPERED = b"PK\x05\x06" + b"\x01" * 18
+
+
+def _sha(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _fetch(client, server, published: str):
+    release = {"tag_name": TAG}
+    asset = {"name": ASSET, "size": len(BODY), "browser_download_url": f"{server.url}/{ASSET}"}
+    return specify_cli.fetch_template_asset(client, release, asset, verbose=False, show_progress=False, checksums={ASSET: published})
+
+
+def _blobs(cache):
+    return sorted(path.name for path in cache.blobs_dir.glob("*")) if cache.blobs_dir.exists() else []
+
+
+def test_mismatching_download_is_refused_and_not_cached(local_server, http_client):
+    server = local_server(lambda request: serve_bytes(request, TAMPERED))
+    cache = specify_cli.TemplateCache()
+
+    with pytest.raises(typer.Exit):
+        _fetch(http_client, server, _sha(BODY))
+
+    assert _blobs(cache) == []
+    assert not cache.index_path.exists()
+
+
+def test_cached_entry_with_another_digest_is_not_used(local_server, http_client):
+    cache = specify_cli.TemplateCache()
+    cache.store(TAG, ASSET, io.BytesIO(TAMPERED), _sha(TAMPERED))
+    server = local_server(lambda request: serve_bytes(request, TAMPERED))
+
+    with pytest.raises(typer.Exit):
+        _fetch(http_client, server, _sha(BODY))
+
+    assert len(server.requests) == 1  # The cached copy was not trusted
+    assert _blobs(cache) == [f"{_sha(TAMPERED)}.zip"]
+    entries = json.loads(cache.index_path.read_text())["entries"]
+    assert [entry["sha256"] for entry in entries.values()] == [_sha(TAMPERED)]
+
+
+def test_matching_download_is_verified_and_cached(local_server, http_client):
+    cache = specify_cli.TemplateCache()
+    cache.store(TAG, ASSET, io.BytesIO(TAMPERED), _sha(TAMPERED))
+    server = local_server(lambda request: serve_bytes(request, BODY))
+
+    archive, meta = _fetch(http_client, server, _sha(BODY))
+    archive.close()
+
+    assert meta["verified"] and meta["sha256"] == _sha(BODY)
+    assert cache.lookup(TAG, ASSET) == cache.blob_path(_sha(BODY))
@@ -0,0 +1,125 @@
+"""Resumable template downloads (_download_asset) against a local HTTP server."""
+
+import hashlib
+import io
+import json
+
+import pytest
+
+import specify_cli
+from conftest import Response, serve_bytes
+
+BODY = bytes(range(256)) * 400  # 100 KiB
+ASSET = "spec-kit-template-claude-sh-v1.0.0.zip"
+
+
+def _download(client, url, sink=None, **kwargs):
+    sink = sink if sink is not None else io.BytesIO()
+    digest = specify_cli._download_asset(client, url, sink, asset_name=ASSET, show_progress=False, **kwargs)
+    return digest, sink.getvalue()
+
+
+def _partial_paths():
+    return specify_cli._partial_download_paths(ASSET)
+
+
+def test_resumes_with_range_after_connection_drop(local_server, http_client):
+    def handler(request):
+        response = serve_bytes(request, BODY, etag='"v1"')
+        if len(server.requests) == 1:
+            response.truncate = 30_000
+        return response
+
+    server = local_server(handler)
+    digest, data = _download(http_client, f"{server.url}/asset.zip")
+
+    assert data == BODY
+    assert digest == hashlib.sha256(BODY).hexdigest()
+    # Resumes from the last complete chunk received before the drop
+    resumed_at = int(server.requests[1].headers["range"].removeprefix("bytes=").rstrip("-"))
+    assert 0 < resumed_at <= 30_000
+    assert "range" not in server.requests[0].headers
+    assert server.requests[1].headers["if-range"] == '"v1"'
+    assert not any(path.exists() for path in _partial_paths())
+
+
+def test_full_response_to_range_request_restarts(local_server, http_client):
+    def handler(request):
+        if len(server.requests) == 1:
+            return Response(200, BODY, {"ETag": '"v1"'}, truncate=10_000)
+        # Server without range support: answers the ranged retry with the whole body
+        return serve_bytes(request, BODY, etag='"v1"', ranges=False)
+
+    server = local_server(handler)
+    digest, data = _download(http_client, f"{server.url}/asset.zip")
+
+    assert server.requests[1].headers["range"].startswith("bytes=")
+    assert data == BODY
+    assert digest == hashlib.sha256(BODY).hexdigest()
+
+
+def test_partial_download_persists_and_resumes_next_run(local_server, http_client):
+    server = local_server(lambda request: Response(200, BODY, {"ETag": '"v1"'}, truncate=40_000))
+    with pytest.raises(RuntimeError, match="after 2 attempts"):
+        _download(http_client, f"{server.url}/asset.zip", attempts=2)
+
+    data_path, meta_path = _partial_paths()
+    saved = data_path.read_bytes()
+    assert saved and BODY.startswith(saved)
+    assert json.loads(meta_path.read_text())["validator"] == '"v1"'
+
+    server.handler = lambda request: serve_bytes(request, BODY, etag='"v1"')
+    digest, data = _download(http_client, f"{server.url}/asset.zip")
+
+    assert server.requests[-1].headers["range"] == f"bytes={len(saved)}-"
+    assert server.requests[-1].headers["if-range"] == '"v1"'
+    assert data == BODY
+    assert digest == hashlib.sha256(BODY).hexdigest()
+    assert not data_path.exists() and not meta_path.exists()
+
+
+def test_changed_etag_between_runs_downloads_new_body(local_server, http_client):
+    server = local_server(lambda request: Response(200, BODY, {"ETag": '"v1"'}, truncate=40_000))
+    with pytest.raises(RuntimeError):
+        _download(http_client, f"{server.url}/asset.zip", attempts=1)
+
+    new_body = BODY[::-1]
+    server.handler = lambda request: serve_bytes(request, new_body, etag='"v2"')
+    digest, data = _download(http_client, f"{server.url}/asset.zip")
+
+    # If-Range carried the old validator, so the server sent the new asset in full
+    assert server.requests[-1].headers["if-range"] == '"v1"'
+    assert data == new_body
+    assert digest == hashlib.sha256(new_body).hexdigest()
+
+
+def test_partial_download_for_another_url_is_ignored(local_server, http_client):
+    server = local_server(lambda request: Response(200, BODY, {"ETag": '"v1"'}, truncate=40_000))
+    with pytest.raises(RuntimeError):
+        _download(http_client, f"{server.url}/old/asset.zip", attempts=1)
+
+    server.handler = lambda request: serve_bytes(request, BODY, etag='"v1"')
+    _, data = _download(http_client, f"{server.url}/new/asset.zip")
+
+    assert "range" not in server.requests[-1].headers
+    assert data == BODY
+
+
+def test_retry_after_is_honoured(local_server, http_client, retry_delays):
+    def handler(request):
+        if len(server.requests) == 1:
+            return Response(503, b"busy", {"Retry-After": "7"})
+        return serve_bytes(request, BODY)
+
+    server = local_server(handler)
+    _, data = _download(http_client, f"{server.url}/asset.zip")
+
+    assert data == BODY
+    assert retry_delays == [7.0]
+
+
+def test_unretryable_status_fails_without_retry(local_server, http_client):
+    server = local_server(lambda request: Response(404, b"not found"))
+    with pytest.raises(RuntimeError, match="404"):
+        _download(http_client, f"{server.url}/asset.zip")
+    assert len(server.requests) == 1
@@ -0,0 +1,42 @@
+"""init-many manifest validation."""
+
+import json
+
+import pytest
+
+import specify_cli
+
+
+def _load(tmp_path, projects):
+    manifest = tmp_path / "projects.json"
+    manifest.write_text(json.dumps({"defaults": {"ai": "claude", "script": "sh"}, "projects": projects}))
+    return specify_cli._load_init_manifest(manifest)
+
+
+def test_jobs_resolve_paths_against_the_manifest(tmp_path):
+    jobs = _load(tmp_path, [{"name": "api"}, {"name": "web", "path": "apps/web", "ai": "claude,gemini"}])
+
+    assert [job["path"] for job in jobs] == [str(tmp_path / "api"), str(tmp_path / "apps" / "web")]
+    assert jobs[1]["variants"] == [("claude", "sh"), ("gemini", "sh")]
+
+
+def test_duplicate_names_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match="api: duplicate project name"):
+        _load(tmp_path, [{"name": "api", "path": "one"}, {"name": "api", "path": "two"}])
+
+
+def test_duplicate_paths_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match="duplicate project path"):
+        _load(tmp_path, [{"name": "api"}, {"name": "other", "path": "api"}])
+
+
+def test_executable_fallback_can_run_quietly(tmp_path, capsys):
+    script = tmp_path / ".specify" / "scripts" / "bash" / "common.sh"
+    script.parent.mkdir(parents=True)
+    script.write_text("#!/bin/sh\n")
+    script.chmod(0o644)
+
+    specify_cli.ensure_executable_scripts(tmp_path, verbose=False)
+
+    assert script.stat().st_mode & 0o111
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,36 @@
+"""Install records written by init, the baseline ``specify upgrade`` compares against."""
+
+import hashlib
+import io
+import zipfile
+
+import specify_cli
+
+FILES = {
+    ".specify/memory/constitution.md": b"# Constitution\n",
+    ".claude/commands/speckit.plan.md": b"plan\n",
+}
+
+
+def test_template_directory_gets_an_install_record(tmp_path):
+    template = tmp_path / "template"
+    for rel_name, data in FILES.items():
+        (template / rel_name).parent.mkdir(parents=True, exist_ok=True)
+        (template / rel_name).write_bytes(data)
+    project = tmp_path / "project"
+
+    specify_cli.download_and_extract_template(project, "claude", "sh", verbose=False, template_archive=template)
+
+    record = specify_cli.load_install_record(project)
+    assert record["release"] == "local"
+    assert record["variants"] == [["claude", "sh"]]
+    assert record["files"] == {rel_name: hashlib.sha256(data).hexdigest() for rel_name, data in FILES.items()}
+
+    # Untouched files upgrade cleanly instead of being flagged as local edits
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        for rel_name, data in FILES.items():
+            zf.writestr(rel_name, data + b"more\n")
+    with zipfile.ZipFile(buffer) as zf:
+        changes, _ = specify_cli.upgrade_template_files([zf], project, record, dry_run=True)
+    assert sorted(action for _, action in changes) == ["updated", "updated"]
@@ -0,0 +1,65 @@
+"""Cross-process FileLock: heartbeats keep slow holders, stale locks are broken."""
+
+import json
+import os
+import threading
+import time
+
+import specify_cli
+from specify_cli import FileLock
+
+
+def test_slow_holder_keeps_its_lock(tmp_path):
+    path = tmp_path / "asset.lock"
+    holder = FileLock(path, stale_after=0.4)
+    holder.acquire()
+    acquired_at = []
+
+    def contender():
+        with FileLock(path, stale_after=0.4):
+            acquired_at.append(time.monotonic())
+
+    started = time.monotonic()
+    thread = threading.Thread(target=contender)
+    thread.start()
+    time.sleep(1.5)  # Several stale_after periods: only the heartbeat keeps the lock alive
+    assert not acquired_at
+    holder.release()
+    thread.join(timeout=5)
+
+    assert acquired_at and acquired_at[0] - started >= 1.5
+
+
+def test_lock_of_exited_process_is_broken_at_once(tmp_path):
+    path = tmp_path / "asset.lock"
+    path.write_text(json.dumps({"pid": 2 ** 22 + 12345, "host": specify_cli._hostname(), "thread": 1, "created": time.time()}))
+
+    lock = FileLock(path, stale_after=600)
+    lock.acquire()
+    try:
+        assert lock.waited < 1
+        assert json.loads(path.read_text())["pid"] == os.getpid()
+    finally:
+        lock.release()
+    assert not path.exists()
+
+
+def test_lock_without_heartbeat_is_broken_after_stale_after(tmp_path):
+    path = tmp_path / "asset.lock"
+    # Held by a process on another host that stopped refreshing the file
+    path.write_text(json.dumps({"pid": 1, "host": "elsewhere", "thread": 1, "created": 0}))
+    old = time.time() - 120
+    os.utime(path, (old, old))
+
+    with FileLock(path, stale_after=60) as lock:
+        assert lock.held
+        assert lock.waited < 1
+
+
+def test_release_leaves_a_lock_taken_over_by_someone_else(tmp_path):
+    path = tmp_path / "asset.lock"
+    lock = FileLock(path)
+    lock.acquire()
+    path.write_text("someone else")
+    lock.release()
+    assert path.read_text() == "someone else"
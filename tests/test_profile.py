@@ -0,0 +1,25 @@
+"""The global --profile / --profile-output options."""
+
+import pstats
+
+from typer.testing import CliRunner
+
+import specify_cli
+
+runner = CliRunner()
+
+
+def test_profile_output_saves_stats_to_the_given_path(tmp_path):
+    stats = tmp_path / "out.prof"
+    result = runner.invoke(specify_cli.app, ["--profile-output", str(stats), "version"])
+
+    assert result.exit_code == 0, result.output
+    assert pstats.Stats(str(stats)).total_calls > 0
+
+
+def test_bare_profile_uses_a_default_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    result = runner.invoke(specify_cli.app, ["--profile", "version"])
+
+    assert result.exit_code == 0, result.output
+    assert len(list(tmp_path.glob("specify-profile-*.pstats"))) == 1
@@ -0,0 +1,111 @@
+"""ReleaseMetadataCache: TTL, conditional revalidation and stale-while-revalidate."""
+
+import json
+
+import httpx
+import pytest
+
+import specify_cli
+from conftest import Response
+
+PATH = "/repos/github/spec-kit/releases/latest"
+
+
+def _handler(state):
+    def handler(request):
+        if request.headers.get("if-none-match") == state["etag"]:
+            return Response(304, headers={"ETag": state["etag"]})
+        return Response(200, json.dumps({"tag_name": state["tag"]}).encode(), {"ETag": state["etag"]})
+    return handler
+
+
+def _age(url: str, seconds: float) -> None:
+    """Pretend the cached entry for ``url`` was fetched ``seconds`` ago."""
+    cache = specify_cli.ReleaseMetadataCache()
+    path = cache._path(url)
+    entry = json.loads(path.read_text())
+    entry["fetched_at"] -= seconds
+    path.write_text(json.dumps(entry))
+
+
+def _fetch(client, url, **kwargs):
+    return specify_cli.fetch_release_metadata(client, url, **kwargs)
+
+
+@pytest.fixture
+def release(local_server):
+    state = {"tag": "v1.0.0", "etag": '"r1"'}
+    server = local_server(_handler(state))
+    return server, f"{server.url}{PATH}", state
+
+
+def test_fresh_entry_is_served_without_a_request(release, http_client):
+    server, url, _ = release
+    assert _fetch(http_client, url) == ({"tag_name": "v1.0.0"}, "network")
+    assert _fetch(http_client, url) == ({"tag_name": "v1.0.0"}, "cache")
+    assert len(server.requests) == 1
+
+
+def test_expired_entry_is_revalidated_with_304(release, http_client):
+    server, url, _ = release
+    _fetch(http_client, url)
+    _age(url, specify_cli.DEFAULT_RELEASE_TTL + 1)
+
+    assert _fetch(http_client, url) == ({"tag_name": "v1.0.0"}, "revalidated")
+    assert server.requests[-1].headers["if-none-match"] == '"r1"'
+    # The 304 restarted the TTL
+    assert _fetch(http_client, url)[1] == "cache"
+    assert len(server.requests) == 2
+
+
+def test_expired_entry_picks_up_a_new_release(release, http_client):
+    server, url, state = release
+    _fetch(http_client, url)
+    state.update(tag="v1.1.0", etag='"r2"')
+    _age(url, specify_cli.DEFAULT_RELEASE_TTL + 1)
+
+    assert _fetch(http_client, url) == ({"tag_name": "v1.1.0"}, "network")
+    assert specify_cli.ReleaseMetadataCache().get(url)["etag"] == '"r2"'
+
+
+def test_ttl_comes_from_the_environment(release, http_client, monkeypatch):
+    server, url, _ = release
+    monkeypatch.setenv("SPECIFY_RELEASE_TTL", "0")
+    _fetch(http_client, url)
+    assert _fetch(http_client, url)[1] == "revalidated"
+
+
+def test_stale_entry_is_served_when_the_network_fails(release, http_client):
+    server, url, _ = release
+    _fetch(http_client, url)
+    _age(url, specify_cli.DEFAULT_RELEASE_TTL + 1)
+
+    server.close()
+    with httpx.Client() as offline_client:  # No pooled keep-alive connection to the old server
+        assert _fetch(offline_client, url, stale_while_revalidate=True) == ({"tag_name": "v1.0.0"}, "stale")
+        specify_cli.wait_for_background_refreshes()
+
+        # The failed background refresh left the entry alone; without the fallback the error surfaces
+        assert specify_cli.ReleaseMetadataCache().get(url)["body"] == {"tag_name": "v1.0.0"}
+        with pytest.raises(httpx.ConnectError):
+            _fetch(offline_client, url)
+
+
+def test_stale_entry_is_refreshed_in_the_background(release, http_client):
+    server, url, state = release
+    _fetch(http_client, url)
+    state.update(tag="v1.1.0", etag='"r2"')
+    _age(url, specify_cli.DEFAULT_RELEASE_TTL + 1)
+
+    assert _fetch(http_client, url, stale_while_revalidate=True) == ({"tag_name": "v1.0.0"}, "stale")
+    specify_cli.wait_for_background_refreshes()
+    assert _fetch(http_client, url) == ({"tag_name": "v1.1.0"}, "cache")
+
+
+def test_entry_past_max_stale_is_not_served(release, http_client):
+    server, url, state = release
+    _fetch(http_client, url)
+    state.update(tag="v1.1.0", etag='"r2"')
+    _age(url, specify_cli.DEFAULT_RELEASE_MAX_STALE + 1)
+
+    assert _fetch(http_client, url, stale_while_revalidate=True) == ({"tag_name": "v1.1.0"}, "network")
@@ -0,0 +1,120 @@
+"""Release mirrors: racing sources and keeping the GitHub token away from mirrors."""
+
+import io
+import json
+import socket
+import time
+
+import pytest
+
+import specify_cli
+from conftest import Response, serve_bytes
+
+TOKEN = "ghp_test_token"
+ASSET = "spec-kit-template-claude-sh-v1.0.0.zip"
+ASSET_BODY = b"PK\x05\x06" + b"\x00" * 18
+
+
+def _release(request):
+    if request.path.endswith("/releases/latest"):
+        release = {
+            "tag_name": "v1.0.0",
+            "assets": [{
+                "name": ASSET,
+                "size": len(ASSET_BODY),
+                "browser_download_url": f"https://github.com/github/spec-kit/releases/download/v1.0.0/{ASSET}",
+            }],
+        }
+        return Response(200, json.dumps(release).encode(), {"Content-Type": "application/json", "ETag": '"r1"'})
+    if request.path.endswith(f"/releases/download/v1.0.0/{ASSET}"):
+        return serve_bytes(request, ASSET_BODY)
+    return Response(404)
+
+
+def _slow(handler, seconds):
+    def slow_handler(request):
+        time.sleep(seconds)
+        return handler(request)
+    return slow_handler
+
+
+@pytest.fixture
+def refusing_url():
+    """URL of a local port nothing listens on, so connections are refused at once."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+@pytest.fixture(autouse=True)
+def fresh_session(monkeypatch):
+    monkeypatch.setattr(specify_cli, "_selected_source", None)
+    monkeypatch.setenv("GH_TOKEN", TOKEN)
+
+
+def _latest(client):
+    return specify_cli.fetch_latest_release_data(client, github_token=None, use_cache=False)
+
+
+def test_dead_mirror_loses_the_race(local_server, http_client, refusing_url, monkeypatch):
+    live = local_server(_release)
+    monkeypatch.setenv("SPEC_KIT_MIRRORS", f"{refusing_url} {live.url}")
+    monkeypatch.setenv("SPEC_KIT_API_BASE", refusing_url)
+
+    release_data, _ = _latest(http_client)
+
+    assert specify_cli._selected_source == (live.url, live.url)
+    assert release_data["assets"][0]["browser_download_url"] == f"{live.url}/github/spec-kit/releases/download/v1.0.0/{ASSET}"
+
+
+def test_slow_mirror_loses_to_a_fast_one(local_server, http_client, monkeypatch):
+    slow = local_server(_slow(_release, 2.0))
+    fast = local_server(_release)
+    monkeypatch.setenv("SPEC_KIT_MIRRORS", f"{slow.url},{fast.url}")
+    monkeypatch.setenv("SPEC_KIT_API_BASE", fast.url)
+
+    started = time.monotonic()
+    _latest(http_client)
+
+    assert specify_cli._selected_source == (fast.url, fast.url)
+    assert time.monotonic() - started < 1.5
+
+
+def test_all_sources_failing_lists_each(http_client, refusing_url, monkeypatch):
+    monkeypatch.setenv("SPEC_KIT_MIRRORS", f"{refusing_url}/mirror")
+    monkeypatch.setenv("SPEC_KIT_API_BASE", refusing_url)
+
+    with pytest.raises(RuntimeError, match="No release source answered") as excinfo:
+        _latest(http_client)
+    assert f"{refusing_url}/mirror:" in str(excinfo.value)
+    assert f"{refusing_url}:" in str(excinfo.value)
+
+
+def test_token_is_withheld_from_mirror(local_server, http_client, monkeypatch):
+    primary = local_server(_slow(_release, 2.0))
+    mirror = local_server(_release)
+    # Same host as the primary, different port: the token must still stay with the primary
+    monkeypatch.setenv("SPEC_KIT_API_BASE", primary.url)
+    monkeypatch.setenv("SPEC_KIT_MIRRORS", mirror.url)
+
+    release_data, _ = _latest(http_client)
+    url = release_data["assets"][0]["browser_download_url"]
+    sink = io.BytesIO()
+    specify_cli._download_asset(http_client, url, sink, asset_name=ASSET, show_progress=False)
+
+    assert sink.getvalue() == ASSET_BODY
+    assert [r.path.rsplit("/", 1)[-1] for r in mirror.requests] == ["latest", ASSET]
+    assert all("authorization" not in r.headers for r in mirror.requests)
+
+
+def test_token_is_sent_to_primary(local_server, http_client, monkeypatch):
+    primary = local_server(_release)
+    monkeypatch.setenv("SPEC_KIT_API_BASE", primary.url)
+    monkeypatch.setenv("SPEC_KIT_DOWNLOAD_BASE", primary.url)
+
+    release_data, _ = _latest(http_client)
+    specify_cli._download_asset(http_client, release_data["assets"][0]["browser_download_url"], io.BytesIO(), asset_name=ASSET, show_progress=False)
+
+    assert len(primary.requests) == 2
+    assert all(r.headers.get("authorization") == f"Bearer {TOKEN}" for r in primary.requests)
@@ -0,0 +1,129 @@
+"""Reading template archives over HTTP Range requests (open_remote_archive / RemoteZipReader)."""
+
+import io
+import random
+import zipfile
+
+import pytest
+
+import specify_cli
+from conftest import serve_bytes
+
+URL_PATH = "/releases/download/v1.0.0/spec-kit-template-claude-sh-v1.0.0.zip"
+
+
+def _archive(files: dict[str, bytes], compression=zipfile.ZIP_STORED) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression) as zf:
+        for name, data in files.items():
+            zf.writestr(name, data)
+    return buffer.getvalue()
+
+
+def _random_files(count: int, size: int, seed: int = 0) -> dict[str, bytes]:
+    rng = random.Random(seed)
+    return {f"sdd-package/.specify/templates/file-{i:04d}.md": rng.randbytes(size) for i in range(count)}
+
+
+def _open(client, server, body: bytes):
+    asset = {"size": len(body), "browser_download_url": f"{server.url}{URL_PATH}"}
+    return specify_cli.open_remote_archive(client, asset)
+
+
+def test_lists_archive_from_the_tail_request(local_server, http_client):
+    files = _random_files(40, 8 * 1024)  # 320 KiB, well past the tail
+    body = _archive(files)
+    server = local_server(lambda request: serve_bytes(request, body, etag='"v1"'))
+
+    reader = _open(http_client, server, body)
+    with zipfile.ZipFile(reader) as zf:
+        assert zf.namelist() == list(files)
+
+    assert reader.requests == 1 == len(server.requests)
+    assert server.requests[0].headers["range"] == f"bytes={len(body) - specify_cli.REMOTE_ZIP_TAIL}-"
+
+
+def test_small_archive_is_read_whole_from_the_tail(local_server, http_client):
+    files = {"README.md": b"# Spec Kit\n", ".specify/memory/constitution.md": b"rules\n" * 50}
+    body = _archive(files, zipfile.ZIP_DEFLATED)
+    server = local_server(lambda request: serve_bytes(request, body))
+
+    reader = _open(http_client, server, body)
+    with zipfile.ZipFile(reader) as zf:
+        assert {name: zf.read(name) for name in zf.namelist()} == files
+    assert server.requests[0].headers["range"] == "bytes=0-"
+    assert len(server.requests) == 1
+
+
+def test_central_directory_larger_than_tail(local_server, http_client):
+    # Long names make the central directory alone exceed REMOTE_ZIP_TAIL
+    files = {f"sdd-package/{'nested/' * 20}{i:05d}.md": b"x" for i in range(600)}
+    body = _archive(files)
+    server = local_server(lambda request: serve_bytes(request, body, etag='"v1"'))
+
+    reader = _open(http_client, server, body)
+    with zipfile.ZipFile(reader) as zf:
+        assert len(zf.infolist()) == len(files)
+        name = next(reversed(files))
+        assert zf.read(name) == b"x"
+    assert all(r.headers["if-range"] == '"v1"' for r in server.requests[1:])
+
+
+def test_prefetch_coalesces_adjacent_entries(local_server, http_client):
+    files = _random_files(40, 8 * 1024)
+    body = _archive(files)
+    server = local_server(lambda request: serve_bytes(request, body, etag='"v1"'))
+
+    reader = _open(http_client, server, body)
+    with zipfile.ZipFile(reader) as zf:
+        infos = zf.infolist()[:10]
+        reader.prefetch(zf, infos)
+        assert len(server.requests) == 2  # tail + one coalesced range
+        assert [zf.read(info) for info in infos] == [files[info.filename] for info in infos]
+    assert len(server.requests) == 2
+
+
+def test_prefetch_splits_distant_entries(local_server, http_client):
+    files = _random_files(40, 8 * 1024)
+    body = _archive(files)
+    server = local_server(lambda request: serve_bytes(request, body, etag='"v1"'))
+
+    reader = _open(http_client, server, body)
+    with zipfile.ZipFile(reader) as zf:
+        infos = zf.infolist()
+        # Three entries about 80 KiB apart, far beyond REMOTE_ZIP_GAP
+        chosen = [infos[0], infos[10], infos[20]]
+        reader.prefetch(zf, chosen)
+        assert len(server.requests) == 4
+        assert [zf.read(info) for info in chosen] == [files[info.filename] for info in chosen]
+    assert len(server.requests) == 4
+    assert reader.fetched < len(body)
+
+
+def test_server_without_range_support_falls_back(local_server, http_client):
+    body = _archive(_random_files(40, 8 * 1024))
+    server = local_server(lambda request: serve_bytes(request, body, ranges=False))
+
+    assert _open(http_client, server, body) is None
+    assert len(server.requests) == 1
+
+
+def test_size_mismatch_falls_back(local_server, http_client):
+    body = _archive(_random_files(4, 1024))
+    server = local_server(lambda request: serve_bytes(request, body))
+
+    asset = {"size": len(body) + 10, "browser_download_url": f"{server.url}{URL_PATH}"}
+    assert specify_cli.open_remote_archive(http_client, asset) is None
+
+
+def test_changed_asset_fails_instead_of_mixing_bytes(local_server, http_client):
+    files = _random_files(40, 8 * 1024)
+    body = _archive(files)
+    server = local_server(lambda request: serve_bytes(request, body, etag='"v1"'))
+
+    reader = _open(http_client, server, body)
+    with zipfile.ZipFile(reader) as zf:
+        # The release asset is replaced after the central directory was read
+        server.handler = lambda request: serve_bytes(request, body, etag='"v2"')
+        with pytest.raises(RuntimeError, match="may have changed"):
+            zf.read(zf.infolist()[0])
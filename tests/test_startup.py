@@ -0,0 +1,54 @@
+"""Startup guard: importing specify_cli must not load the modules it keeps lazy.
+
+Runs in a fresh interpreter, since the test process itself imports httpx and friends.
+This check is deterministic; the wall-clock budget lives in check-import-time.sh and
+is advisory.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+# Keep in sync with the function-level imports in specify_cli
+LAZY_MODULES = [
+    "httpx",
+    "truststore",
+    "readchar",
+    "platformdirs",
+    "rich.live",
+    "rich.progress",
+    "rich.table",
+    "rich.tree",
+]
+
+
+def _modules_after(code: str) -> set[str]:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(SRC), os.environ.get("PYTHONPATH")])))
+    result = subprocess.run(
+        [sys.executable, "-c", f"{code}\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return set(json.loads(result.stdout.splitlines()[-1]))
+
+
+@pytest.mark.parametrize("module", LAZY_MODULES)
+def test_import_keeps_module_lazy(module):
+    assert module not in _modules_after("import specify_cli"), f"'{module}' is imported at startup; import it inside the function that needs it"
+
+
+def test_help_keeps_network_stack_lazy():
+    loaded = _modules_after(
+        "import sys, specify_cli\n"
+        "sys.argv = ['specify', '--help']\n"
+        "try:\n    specify_cli.app()\nexcept SystemExit:\n    pass"
+    )
+    assert not {"httpx", "truststore"} & loaded
@@ -0,0 +1,86 @@
+"""TemplateStore: unpacking archives once and creating projects from it in each link mode."""
+
+import hashlib
+import os
+import zipfile
+
+import pytest
+
+import specify_cli
+
+FILES = {
+    ".specify/scripts/bash/common.sh": (b"#!/bin/sh\necho common\n", 0o755),
+    ".specify/templates/spec-template.md": (b"# Spec\n", 0o644),
+    ".specify/memory/constitution.md": (b"# Constitution\n", 0o644),
+    ".claude/commands/speckit.plan.md": (b"plan\n", 0o644),
+    "CLAUDE.md": (b"context\n", 0o644),
+}
+SCRIPT = ".specify/scripts/bash/common.sh"
+TEMPLATE = ".specify/templates/spec-template.md"
+
+
+@pytest.fixture
+def archive(tmp_path):
+    path = tmp_path / "template.zip"
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, (data, mode) in FILES.items():
+            info = zipfile.ZipInfo(f"sdd-package/{name}")
+            info.create_system = 3
+            info.external_attr = (0o100000 | mode) << 16
+            zf.writestr(info, data)
+    return path, hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+@pytest.fixture
+def store():
+    return specify_cli.TemplateStore()
+
+
+def _materialize(store, archive, project, link_mode):
+    path, digest = archive
+    project.mkdir()
+    return store.materialize([store.tree(digest, path)], project, verbose=False, link_mode=link_mode)
+
+
+@pytest.mark.parametrize("link_mode", specify_cli.LINK_MODES)
+def test_materialize_creates_every_file(store, archive, tmp_path, link_mode):
+    project = tmp_path / "project"
+    summary = _materialize(store, archive, project, link_mode)
+
+    for name, (data, mode) in FILES.items():
+        assert (project / name).read_bytes() == data
+        assert summary["hashes"][name] == hashlib.sha256(data).hexdigest()
+    assert os.access(project / SCRIPT, os.X_OK)
+    assert summary["files"] == len(FILES) and summary["flattened"]
+    if link_mode == "copy":
+        assert summary["linked"] == {"hardlink": 0, "clone": 0, "copy": len(FILES)}
+    assert summary["linked"]["hardlink"] == (1 if link_mode == "hardlink" else 0)
+
+
+def test_hardlink_mode_shares_only_the_scripts(store, archive, tmp_path):
+    project = tmp_path / "project"
+    tree = store.tree(archive[1], archive[0])
+    _materialize(store, archive, project, "hardlink")
+
+    for name, (sha256, _, mode, _) in tree["files"].items():
+        shared = (project / name).stat().st_ino == store.object_path(sha256, bool(mode & 0o111)).stat().st_ino
+        assert shared == (name == SCRIPT)
+    assert os.access(project / TEMPLATE, os.W_OK)
+
+
+def test_editing_a_project_file_leaves_the_store_intact(store, archive, tmp_path):
+    first = tmp_path / "first"
+    _materialize(store, archive, first, "hardlink")
+    (first / TEMPLATE).write_bytes(b"# My spec\n")
+    # A user who forces a write through a hardlinked script corrupts the shared object
+    os.chmod(first / SCRIPT, 0o755)
+    (first / SCRIPT).write_bytes(b"#!/bin/sh\necho mine\n")
+
+    second = tmp_path / "second"
+    _materialize(store, archive, second, "hardlink")
+
+    # The damaged object was detected and replaced by a new inode from the archive
+    assert (second / TEMPLATE).read_bytes() == FILES[TEMPLATE][0]
+    assert (second / SCRIPT).read_bytes() == FILES[SCRIPT][0]
+    assert (first / SCRIPT).stat().st_ino != (second / SCRIPT).stat().st_ino
+    assert (first / TEMPLATE).read_bytes() == b"# My spec\n"
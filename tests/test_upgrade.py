@@ -0,0 +1,145 @@
+"""specify upgrade: the per-file status matrix and finding new releases within the metadata TTL."""
+
+import hashlib
+import io
+import json
+import zipfile
+
+import pytest
+
+import specify_cli
+from conftest import Response
+
+
+def _sha(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _zip(files: dict[str, bytes]) -> zipfile.ZipFile:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        for name, data in files.items():
+            zf.writestr(name, data)
+    return zipfile.ZipFile(buffer)
+
+
+# name: (installed, on disk (None = deleted), new release (None = dropped))
+CASES = {
+    "unchanged.md": (b"v1", b"v1", b"v1"),
+    "updated.md": (b"v1", b"v1", b"v2"),
+    "kept.md": (b"v1", b"edited", b"v1"),
+    "conflict.md": (b"v1", b"edited", b"v2"),
+    "missing.md": (b"v1", None, b"v2"),
+    "added.md": (None, None, b"v2"),
+    "removed.md": (b"v1", b"v1", None),
+    "orphaned.md": (b"v1", b"edited", None),
+    ".vscode/settings.json": (b'{"a": 1}', b'{"a": 1, "mine": true}', b'{"a": 2}'),
+}
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "project"
+    record = {"files": {}}
+    for name, (installed, local, _) in CASES.items():
+        if installed is not None:
+            record["files"][name] = _sha(installed)
+        if local is not None:
+            (root / name).parent.mkdir(parents=True, exist_ok=True)
+            (root / name).write_bytes(local)
+    return root, record
+
+
+def _release():
+    return _zip({name: new for name, (_, _, new) in CASES.items() if new is not None})
+
+
+def test_status_matrix(project):
+    root, record = project
+    changes, hashes = specify_cli.upgrade_template_files([_release()], root, record, dry_run=True)
+
+    assert dict(changes) == {
+        "updated.md": "updated",
+        "kept.md": "kept",
+        "conflict.md": "conflict",
+        "missing.md": "missing",
+        "added.md": "added",
+        "removed.md": "removed",
+        "orphaned.md": "orphaned",
+        ".vscode/settings.json": "merged",
+    }
+    # Files the project does not have in the new version keep their recorded hash
+    assert hashes["unchanged.md"] == _sha(b"v1")
+    assert hashes["updated.md"] == hashes["added.md"] == _sha(b"v2")
+    assert hashes["kept.md"] == hashes["conflict.md"] == hashes["missing.md"] == _sha(b"v1")
+    # Nothing is written in a dry run
+    assert (root / "updated.md").read_bytes() == b"v1"
+    assert (root / "removed.md").exists()
+    assert not (root / "added.md").exists()
+
+
+def test_upgrade_writes_only_untouched_files(project):
+    root, record = project
+    specify_cli.upgrade_template_files([_release()], root, record)
+
+    assert (root / "updated.md").read_bytes() == b"v2"
+    assert (root / "added.md").read_bytes() == b"v2"
+    assert (root / "kept.md").read_bytes() == b"edited"
+    assert (root / "conflict.md").read_bytes() == b"edited"
+    assert (root / "orphaned.md").read_bytes() == b"edited"
+    assert not (root / "missing.md").exists()
+    assert not (root / "removed.md").exists()
+    assert json.loads((root / ".vscode/settings.json").read_text()) == {"a": 2, "mine": True}
+
+
+def test_force_takes_every_differing_file(project):
+    root, record = project
+    changes, hashes = specify_cli.upgrade_template_files([_release()], root, record, force=True)
+
+    statuses = dict(changes)
+    assert statuses["kept.md"] == statuses["conflict.md"] == "overwritten"
+    assert statuses["missing.md"] == "added"
+    assert statuses["orphaned.md"] == "orphaned"  # Dropped files are never deleted when edited
+    for name in ("updated.md", "kept.md", "conflict.md", "missing.md", "added.md"):
+        assert (root / name).read_bytes() == CASES[name][2]
+        assert hashes[name] == _sha(CASES[name][2])
+
+
+def test_second_upgrade_still_sees_local_edits(project):
+    root, record = project
+    _, hashes = specify_cli.upgrade_template_files([_release()], root, record)
+
+    changes, _ = specify_cli.upgrade_template_files([_release()], root, {"files": hashes}, dry_run=True)
+    assert dict(changes) == {
+        "kept.md": "kept",
+        "conflict.md": "conflict",
+        "missing.md": "missing",
+        ".vscode/settings.json": "kept",  # The merged file carries the local keys
+    }
+
+
+def _latest_handler(tags):
+    def handler(request):
+        tag = tags[0]
+        if request.headers.get("if-none-match") == f'"{tag}"':
+            return Response(304, headers={"ETag": f'"{tag}"'})
+        return Response(200, json.dumps({"tag_name": tag, "assets": []}).encode(), {"ETag": f'"{tag}"'})
+    return handler
+
+
+def test_revalidate_finds_a_release_published_within_the_ttl(local_server, http_client, monkeypatch):
+    tags = ["v9.9.9"]
+    server = local_server(_latest_handler(tags))
+    monkeypatch.setenv("SPEC_KIT_API_BASE", server.url)
+    monkeypatch.setattr(specify_cli, "_selected_source", None)
+    monkeypatch.setenv("SPECIFY_RELEASE_TTL", "3600")
+
+    assert specify_cli.fetch_latest_release_data(http_client)[0]["tag_name"] == "v9.9.9"
+    tags[0] = "v9.9.11"
+    assert specify_cli.fetch_latest_release_data(http_client) == ({"tag_name": "v9.9.9", "assets": []}, "cache")
+
+    release_data, source = specify_cli.fetch_latest_release_data(http_client, revalidate=True)
+    assert (release_data["tag_name"], source) == ("v9.9.11", "network")
+    assert server.requests[-1].headers["if-none-match"] == '"v9.9.9"'
+    # The refreshed entry is what the rest of the run reads from the cache
+    assert specify_cli.fetch_latest_release_data(http_client)[0]["tag_name"] == "v9.9.11"